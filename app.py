@@ -6,7 +6,7 @@ Beautiful, user-friendly web UI for political campaign analysis
 import streamlit as st
 import pandas as pd
 import os
-from tvk_campaign_ai import TVKCampaignAI
+from tvk_campaign_ai import TVKCampaignAI, RequestScheduler, QuotaLedger
 from datetime import datetime
 import time
 
@@ -130,7 +130,16 @@ with st.sidebar:
                         consumer_secret=consumer_secret,
                         access_token=access_token,
                         access_token_secret=access_token_secret,
-                        bearer_token=bearer_token if use_preconfigured else None
+                        bearer_token=bearer_token if use_preconfigured else None,
+                        store_path=os.path.join("tvk_campaign_output", "tweets.db"),
+                        cache_path=os.path.join("tvk_campaign_output", "response_cache.db"),
+                        sentiment_cache_path=os.path.join("tvk_campaign_output", "sentiment_cache.db"),
+                        topic_model_path=os.path.join("tvk_campaign_output", "topic_model.npz"),
+                        influence_graph_path=os.path.join("tvk_campaign_output", "influence_graph.npz"),
+                        scheduler=RequestScheduler(ledger=QuotaLedger(
+                            os.path.join("tvk_campaign_output", "quota.json"),
+                            monthly_cap=int(os.getenv("TWITTER_MONTHLY_POST_CAP", "1500"))
+                        ))
                     )
                     st.session_state.agent = agent
                     st.session_state.credentials_set = True
@@ -292,6 +301,14 @@ else:
                 df = agent.fetch_data(query=query, count=count, since_date=None, use_v2=use_v2_api)
                 progress_bar.progress(30)
                 
+                # Rate limits no longer block the session; show what was deferred
+                fetch_status = df.attrs.get('fetch_status', {}) if df is not None else {}
+                if fetch_status and not fetch_status.get('complete', True):
+                    retry_at = datetime.fromtimestamp(fetch_status['retry_at']).strftime('%Y-%m-%d %H:%M')
+                    st.warning(f"⚠️ Fetch stopped early by the {fetch_status['reason']} after "
+                               f"{fetch_status['fetched']} new posts. Analyzing partial results; "
+                               f"run again after {retry_at} to fetch the rest.")
+                
                 if df is not None and not df.empty:
                     # Run complete analysis pipeline (includes all visualizations and insights)
                     status_text.text("📊 Running full analysis pipeline...")
@@ -428,7 +445,7 @@ else:
                     if 'top_keywords' in results:
                         keywords_df = pd.DataFrame(
                             list(results['top_keywords'].items())[:20],
-                            columns=['Keyword', 'Score']
+                            columns=['Keyword', 'Count' if results.get('keyword_metric') == 'count' else 'Score']
                         )
                         st.bar_chart(keywords_df.set_index('Keyword'))
                         st.dataframe(keywords_df, use_container_width=True, hide_index=True)
@@ -475,6 +492,20 @@ else:
                 influencers_df.columns = ['Username', 'Centrality Score']
                 st.dataframe(influencers_df, use_container_width=True, hide_index=True)
                 
+                bridges = results.get('influencer_rankings', {}).get('betweenness')
+                if bridges:
+                    st.markdown("### Bridge Accounts (Betweenness)")
+                    bridges_df = pd.DataFrame(bridges[:20])
+                    bridges_df.columns = ['Username', 'Betweenness']
+                    st.dataframe(bridges_df, use_container_width=True, hide_index=True)
+                
+                rolling = results.get('rolling_influencers')
+                if rolling:
+                    st.markdown("### Rolling Influence (Time-Decayed PageRank)")
+                    rolling_df = pd.DataFrame(rolling[:20])
+                    rolling_df.columns = ['Username', 'PageRank']
+                    st.dataframe(rolling_df, use_container_width=True, hide_index=True)
+                
                 if 'influencer_graph.png' in os.listdir(agent.output_dir):
                     st.markdown("### Network Graph")
                     st.image(os.path.join(agent.output_dir, 'influencer_graph.png'))
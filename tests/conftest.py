@@ -0,0 +1,45 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """Write a replay recording of posts with the given ids and return its path
+
+    Post ``i`` is created ``10 * i`` seconds after a base time three hours
+    ago, so larger ids are newer and ids up to 1000 fall within the recent
+    search window. Each call writes a new file; ``recording.base`` is the
+    base time.
+    """
+    base = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(hours=3)
+    count = [0]
+
+    def write(ids, hashtags=None, mentions=None):
+        count[0] += 1
+        path = tmp_path / f"recording_{count[0]}.jsonl"
+        tweets = []
+        for tweet_id in ids:
+            created_at = base + timedelta(seconds=10 * tweet_id)
+            tags = ' '.join(f"#{tag}" for tag in (hashtags(tweet_id) if hashtags else ['tvk']))
+            users = ' '.join(f"@{user}" for user in (mentions(tweet_id) if mentions else []))
+            tweets.append({
+                "id": str(tweet_id),
+                "text": f"rally vote chennai post {tweet_id} {tags} {users}",
+                "author_id": str(tweet_id % 7),
+                "edit_history_tweet_ids": [str(tweet_id)],
+                "created_at": created_at.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                "public_metrics": {"like_count": 1, "retweet_count": 0, "reply_count": 0}
+            })
+        users = [
+            {"id": str(i), "username": f"user{i}", "name": f"User {i}",
+             "public_metrics": {"followers_count": 10 * i}}
+            for i in range(7)
+        ]
+        line = {"data": tweets, "includes": {"users": users}, "meta": {"result_count": len(tweets)}}
+        path.write_text(json.dumps(line) + "\n", encoding="utf-8")
+        return str(path)
+
+    write.base = base
+    return write
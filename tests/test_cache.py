@@ -0,0 +1,31 @@
+import time
+
+from tvk_campaign_ai import ResponseCache, SentimentCache
+
+
+def test_response_cache_expires_and_evicts(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'responses.db'), ttl=60, max_entries=2)
+    cache.set('a', [{'id': '1'}])
+    cache.set('b', 2)
+    assert cache.get('a') == [{'id': '1'}]
+    # 'b' is now the least recently used entry
+    time.sleep(0.01)
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+    cache.ttl = 0
+    time.sleep(0.01)
+    assert cache.get('a') is None
+    assert cache.stats() == {'hits': 2, 'misses': 2, 'hit_rate': 0.5, 'entries': 1}
+
+
+def test_sentiment_cache_batches(tmp_path):
+    cache = SentimentCache(str(tmp_path / 'scores.db'), max_entries=1500)
+    keys = [SentimentCache.make_key(f"post {i}") for i in range(2000)]
+    cache.set_many({key: i / 2000 for i, key in enumerate(keys)})
+    found = cache.get_many(keys)
+    assert len(found) == 1500
+    assert all(found[key] == i / 2000 for i, key in enumerate(keys) if key in found)
+    cache.clear()
+    assert cache.stats()['entries'] == 0
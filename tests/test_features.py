@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from tvk_campaign_ai import FeatureStore
+
+WORDS = ['rally', 'vote', 'chennai', 'tvk', 'vijay', 'speech', 'crowd', 'youth', 'jobs', 'water',
+         'roads', 'madurai', 'manifesto', 'debate', 'volunteers', 'booth', 'village', 'students',
+         'farmers', 'prices']
+
+
+def corpus(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, len(WORDS) + 1)
+    weights /= weights.sum()
+    return pd.Series([' '.join(rng.choice(WORDS, rng.integers(3, 9), p=weights)) for _ in range(n)])
+
+
+# The max_features cut-offs fall between terms of different frequency;
+# tied terms at the cut-off may be picked differently by scikit-learn
+@pytest.mark.parametrize('max_features, min_df, ngram_range', [
+    (None, 1, (1, 1)), (10, 1, (1, 1)), (None, 3, (1, 2)), (35, 2, (1, 2)), (25, 1, (2, 2))
+])
+def test_views_match_a_standalone_vectorizer(max_features, min_df, ngram_range):
+    texts = corpus()
+    store = FeatureStore().fit(texts)
+    expected = TfidfVectorizer(stop_words='english', max_features=max_features, min_df=min_df,
+                               ngram_range=ngram_range)
+    Y = expected.fit_transform(texts)
+
+    X, terms = store.tfidf(max_features=max_features, min_df=min_df, ngram_range=ngram_range)
+    assert terms.tolist() == expected.get_feature_names_out().tolist()
+    assert abs(X - Y).max() < 1e-12
+
+    new_texts = corpus(20, seed=1)
+    vectorizer = store.vectorizer(max_features=max_features, min_df=min_df, ngram_range=ngram_range)
+    assert abs(vectorizer.transform(new_texts) - expected.transform(new_texts)).max() < 1e-12
+
+
+def test_changed_texts_trigger_a_refit():
+    texts = corpus()
+    store = FeatureStore().fit(texts)
+    counts, view = store.counts, store.tfidf()
+
+    # Same content in a new Series: the fitted corpus and its views are reused
+    store.fit(texts.copy())
+    assert store.counts is counts
+    assert store.tfidf() is view
+
+    changed = texts.copy()
+    changed.iloc[5] = 'brand new words from coimbatore'
+    store.fit(changed)
+    assert store.counts is not counts
+    assert 'coimbatore' in store.tfidf()[1]
+    X, _ = store.tfidf()
+    assert abs(X - TfidfVectorizer(stop_words='english').fit_transform(changed)).max() < 1e-12
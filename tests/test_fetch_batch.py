@@ -0,0 +1,45 @@
+import json
+
+from tvk_campaign_ai import TVKCampaignAI, ReplayBackend, RequestScheduler, QuotaLedger, TrendTracker
+
+POOLS = {'tvk': range(1, 121), 'vijay': range(201, 321), 'chennai rally': range(401, 521)}
+
+
+def batch_recording(recording, tmp_path):
+    """One recording serving a separate pool of posts to each query"""
+    lines = []
+    for query, ids in POOLS.items():
+        with open(recording(ids), encoding='utf-8') as f:
+            page = json.loads(f.readline())
+        lines.append(json.dumps(dict(page, query=query)))
+    path = tmp_path / 'batch.jsonl'
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def test_batch_queries_share_the_monthly_quota(recording, tmp_path):
+    ledger = QuotaLedger(monthly_cap=250)
+    agent = TVKCampaignAI(backend=ReplayBackend(batch_recording(recording, tmp_path), latency=0.05),
+                          scheduler=RequestScheduler(ledger=ledger))
+
+    results = agent.fetch_batch(list(POOLS) + ['tvk'], count=100, max_concurrency=3)
+    assert list(results) == list(POOLS)
+    for query, df in results.items():
+        ids = df['id'].astype(int)
+        assert ids.is_unique
+        assert set(ids) <= set(POOLS[query])
+
+    # 300 posts were wanted; the concurrent fetches stop at the cap together
+    fetched = sum(len(df) for df in results.values())
+    assert fetched == ledger.used() == 250
+    assert [df.attrs['fetch_status']['reason'] for df in results.values()].count('monthly quota') >= 1
+
+
+def test_combined_batch_feeds_the_trend_tracker(recording, tmp_path):
+    tracker = TrendTracker()
+    agent = TVKCampaignAI(backend=ReplayBackend(batch_recording(recording, tmp_path)), trend_tracker=tracker)
+
+    df = agent.fetch_batch(list(POOLS), count=50, combine=True)
+    assert len(df) == 150
+    assert sorted(df['query'].unique()) == sorted(POOLS)
+    assert tracker.top(5)['hashtags'] == {'#tvk': 150}
@@ -0,0 +1,47 @@
+from tvk_campaign_ai import TVKCampaignAI, ReplayBackend
+
+
+def fetch(recording_path, store_path, count):
+    agent = TVKCampaignAI(backend=ReplayBackend(recording_path), store_path=store_path)
+    df = agent.fetch_data('tvk', count=count, use_v2=True)
+    return agent, df
+
+
+def stored_ids(agent):
+    return sorted(int(tweet_id) for tweet_id in agent.store.load('tvk')['id'])
+
+
+def test_fetch_that_stops_at_count_leaves_a_gap(recording, tmp_path):
+    store_path = str(tmp_path / 'posts.db')
+
+    agent, _ = fetch(recording(range(1, 51)), store_path, count=100)
+    assert agent.store.get_fetch_state('tvk') == {'since_id': 50, 'gap_until_id': None, 'pending_since_id': None}
+
+    # 100 new posts arrive but only the newest 40 are fetched
+    later = recording(range(1, 151))
+    agent, df = fetch(later, store_path, count=40)
+    assert df.attrs['fetch_status']['fetched'] == 40
+    assert agent.store.get_fetch_state('tvk') == {'since_id': 50, 'gap_until_id': 111, 'pending_since_id': 150}
+
+    # The next fetch fills ids 51-110 before moving since_id forward
+    agent, df = fetch(later, store_path, count=100)
+    assert df.attrs['fetch_status']['fetched'] == 60
+    assert agent.store.get_fetch_state('tvk') == {'since_id': 150, 'gap_until_id': None, 'pending_since_id': None}
+    assert stored_ids(agent) == list(range(1, 151))
+
+
+def test_gap_is_filled_across_several_fetches(recording, tmp_path):
+    store_path = str(tmp_path / 'posts.db')
+    fetch(recording(range(1, 21)), store_path, count=100)
+
+    later = recording(range(1, 201))
+    agent, _ = fetch(later, store_path, count=30)
+    for _ in range(3):
+        agent, _ = fetch(later, store_path, count=60)
+    assert agent.store.get_fetch_state('tvk')['gap_until_id'] is None
+    assert stored_ids(agent) == list(range(1, 201))
+
+    # Newer posts are fetched once the gap is closed
+    agent, df = fetch(recording(range(1, 221)), store_path, count=100)
+    assert df.attrs['fetch_status']['fetched'] == 20
+    assert stored_ids(agent) == list(range(1, 221))
@@ -0,0 +1,138 @@
+import warnings
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.sparse import SparseEfficiencyWarning
+
+from tvk_campaign_ai import TVKCampaignAI, IncrementalMentionGraph, SparseMentionGraph
+from tvk_campaign_ai.influence import approximate_betweenness
+
+
+def posts(ids, days):
+    return pd.DataFrame({
+        'id': [str(i) for i in ids],
+        'timestamp': pd.Timestamp('2026-10-01') + pd.to_timedelta(days, unit='D'),
+        'author': [f'user{i % 3}' for i in ids],
+        'author_followers': [10] * len(ids),
+        'mentions': [['@hub'] for _ in ids]
+    })
+
+
+def test_out_of_order_posts_match_a_single_batch():
+    newer = posts(range(10, 20), np.linspace(5, 6, 10))
+    older = posts(range(0, 10), np.linspace(0, 1, 10))
+
+    streamed = IncrementalMentionGraph(half_life_days=2.0)
+    assert streamed.update(newer) == 10
+    assert streamed.update(older) == 10
+    assert streamed.update(pd.concat([older, newer])) == 0
+
+    batch = IncrementalMentionGraph(half_life_days=2.0)
+    batch.update(pd.concat([older, newer]))
+
+    def weights(graph):
+        w = graph.current_weights().tocoo()
+        return {(graph.users[i], graph.users[j]): v for i, j, v in zip(w.row, w.col, w.data)}
+
+    expected = weights(batch)
+    got = weights(streamed)
+    assert got.keys() == expected.keys()
+    assert all(np.isclose(got[edge], expected[edge]) for edge in expected)
+
+
+def test_seen_ids_survive_save_and_load(tmp_path):
+    graph = IncrementalMentionGraph()
+    graph.update(posts(range(10), np.arange(10) / 10))
+    path = str(tmp_path / 'graph.npz')
+    graph.save(path)
+
+    loaded = IncrementalMentionGraph.load(path)
+    assert loaded.posts == 10
+    assert loaded.update(posts(range(5, 15), np.arange(10) / 10)) == 5
+
+
+@pytest.mark.parametrize('directed', [True, False])
+def test_sampled_betweenness_matches_networkx(directed):
+    G = nx.gnp_random_graph(60, 0.06, seed=3, directed=directed)
+    for k in (None, 10, 40, 60):
+        scores, used = approximate_betweenness(G, k=k, seed=7)
+        expected = nx.betweenness_centrality(G, k=k, seed=7)
+        assert used == (k or 60)
+        assert max(abs(scores[node] - expected[node]) for node in G) < 1e-15
+
+
+def test_betweenness_time_budget_returns_partial_scores():
+    G = nx.gnp_random_graph(60, 0.06, seed=3, directed=True)
+    scores, used = approximate_betweenness(G, k=40, seed=7, time_budget=0, chunk_size=10)
+    # Only the first chunk runs; the sample of 40 starts with the sample of 10
+    assert used == 10
+    expected = nx.betweenness_centrality(G, k=10, seed=7)
+    assert max(abs(scores[node] - expected[node]) for node in G) < 1e-15
+    assert all(0 <= value <= 1 for value in scores.values())
+
+
+def test_sparse_graph_matches_networkx():
+    rng = np.random.default_rng(1)
+    users = np.array([f'user{i}' for i in range(80)])
+    source, target = rng.integers(0, 50, 300), rng.integers(0, 70, 300)
+    keep = source != target
+    edges = pd.DataFrame({'source': users[source[keep]], 'target': users[target[keep]]})
+    edges = edges.groupby(['source', 'target']).size().rename('weight').reset_index()
+    # Users 50-69 are only mentioned (dangling); 70-79 post without mentions
+    authors = pd.DataFrame({'author': np.r_[users[:50], users[70:]], 'author_followers': np.arange(60)})
+
+    S = SparseMentionGraph.from_edges(edges, authors)
+    G = nx.DiGraph()
+    G.add_nodes_from(authors['author'])
+    G.add_weighted_edges_from(edges.itertuples(index=False))
+    assert sorted(S.nodes) == sorted(G.nodes)
+    assert any(G.degree(node) == 0 for node in G)
+
+    def error(scores, expected):
+        scores = S.series(scores)
+        return max(abs(scores[node] - expected[node]) for node in G)
+
+    assert error(S.degree(), nx.degree_centrality(G)) < 1e-15
+    assert error(S.in_degree(), nx.in_degree_centrality(G)) < 1e-15
+    assert error(S.pagerank(), nx.pagerank(G, weight='weight')) < 1e-12
+    hubs, authorities = S.hits()
+    expected_hubs, expected_authorities = nx.hits(G)
+    # Both stop at the same 1e-8 tolerance from the same start
+    assert error(hubs, expected_hubs) < 1e-8
+    assert error(authorities, expected_authorities) < 1e-8
+
+
+def test_authors_without_mentions_are_nodes():
+    df = posts(range(12), np.arange(12) / 10)
+    df['author'] = [f'user{i % 4}' for i in range(12)]
+    # user3 never mentions anyone
+    df['mentions'] = [[] if i % 4 == 3 else ['@hub'] for i in range(12)]
+    df['likes'] = df['retweets'] = 0
+    graph = IncrementalMentionGraph()
+    graph.update(df)
+    assert set(graph.users) == set(TVKCampaignAI._build_mention_graph(df).nodes)
+    assert graph.followers[graph._index['user3']] == 10
+    assert graph.pagerank().idxmax() == 'hub'
+
+
+def test_window_prunes_edges_and_inactive_authors():
+    # Timestamps near the epoch put the window cutoff below zero
+    early = posts(range(4), [0.0] * 4)
+    early['timestamp'] = pd.Timestamp(0) + pd.to_timedelta([0, 1, 2, 3], unit='D')
+    early['mentions'] = [['@hub']] * 3 + [[]]
+    graph = IncrementalMentionGraph(window_days=10.0)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', SparseEfficiencyWarning)
+        graph.update(early)
+        assert len(graph) == 4
+
+        later = posts([10], [0.0])
+        later['timestamp'] = pd.Timestamp(0) + pd.Timedelta(days=12)
+        later['author'] = 'user9'
+        later['mentions'] = [[]]
+        graph.update(later)
+    # Edges from days 0-1 expired; user0 still posted on day 3
+    assert sorted(graph.users) == ['hub', 'user0', 'user2', 'user9']
+    assert graph.weights.nnz == 1
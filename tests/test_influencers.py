@@ -0,0 +1,51 @@
+import pandas as pd
+
+from tvk_campaign_ai import TVKCampaignAI, ReplayBackend, SparseMentionGraph
+
+
+def posts():
+    return pd.DataFrame({
+        'author': ['a', 'b', 'c', 'd'],
+        'author_followers': [1, 2, 3, 4],
+        'likes': [0] * 4,
+        'retweets': [0] * 4,
+        'mentions': [['@b'], ['@a', '@c'], ['@d'], ['@a']]
+    })
+
+
+def test_auto_backend_counts_mentioned_users_once(recording):
+    agent = TVKCampaignAI(backend=ReplayBackend(recording([1])))
+    agent.df = posts()
+    # Four users; counting '@a' and 'a' separately would make it eight
+    agent.sparse_graph_threshold = 5
+    assert not isinstance(agent.map_influencers(), SparseMentionGraph)
+    agent.sparse_graph_threshold = 4
+    assert isinstance(agent.map_influencers(refresh=True), SparseMentionGraph)
+
+
+def test_influencer_cache_follows_data_and_backend(recording):
+    agent = TVKCampaignAI(backend=ReplayBackend(recording([1])))
+    agent.df = posts()
+    G = agent.map_influencers(centralities=['degree', 'pagerank'])
+    scores = agent._influencer_cache['scores']['pagerank']
+
+    # Unchanged data, even in a new frame, reuses the graph and its scores
+    agent.df = posts()
+    assert agent.map_influencers(centralities=['degree', 'pagerank']) is G
+    assert agent._influencer_cache['scores']['pagerank'] is scores
+
+    # Any change to the graph columns rebuilds it
+    agent.df.loc[3, 'mentions'] = ['@b']
+    changed = agent.map_influencers()
+    assert changed is not G
+    assert set(changed.edges) == {('a', 'b'), ('b', 'a'), ('b', 'c'), ('c', 'd'), ('d', 'b')}
+    assert agent.map_influencers() is changed
+    agent.df.loc[0, 'likes'] = 5
+    assert agent.map_influencers() is not changed
+
+    # So does switching backends, in both directions
+    graph = agent.map_influencers()
+    sparse_graph = agent.map_influencers(backend='sparse')
+    assert isinstance(sparse_graph, SparseMentionGraph)
+    assert agent.map_influencers(backend='sparse') is sparse_graph
+    assert agent.map_influencers(backend='networkx') is not graph
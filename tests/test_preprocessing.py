@@ -0,0 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from tvk_campaign_ai import TextPreprocessor
+
+TEXTS = [f"Rally #TVK{i % 5} with @User{i % 3} at http://x.co/{i}  today!" for i in range(200)] + [None]
+
+
+def test_process_pool_matches_single_process():
+    expected = TextPreprocessor.process_batch(TEXTS, workers=1)
+    # fetch_batch calls it from thread-pool workers
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        result = executor.submit(
+            TextPreprocessor.process_batch, TEXTS, workers=2, pool_threshold=1, chunk_size=50
+        ).result()
+    assert result == expected
+    assert expected[1][0] == ['#tvk0'] and expected[2][0] == ['@user0']
+
+
+def test_unicode_tags_match_the_single_text_helpers():
+    texts = ["#İstanbul rally with @ΟΔΟΣ", "#ΣΟΦΟΣ and #KΣ", "@İİ! #straße http://x.co/İ"]
+    cleaned, hashtags, mentions = TextPreprocessor.process_batch(texts, workers=1)
+    assert cleaned == [TextPreprocessor.clean_text(text) for text in texts]
+    assert hashtags == [TextPreprocessor.extract_hashtags(text) for text in texts]
+    assert mentions == [TextPreprocessor.extract_mentions(text) for text in texts]
+    # Final sigma is decided per tag, not by the text around it
+    assert hashtags[1] == ['#σοφος', '#kς']
@@ -0,0 +1,174 @@
+"""Replay-driven regression tests for incremental and resumable fetching"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import numpy as np
+import pytest
+import tweepy
+
+from tvk_campaign_ai import (TVKCampaignAI, ReplayBackend, RequestScheduler, TrendTracker,
+                             IncrementalMentionGraph)
+
+
+def test_v1_incremental_fetch_fills_its_gap(recording, tmp_path):
+    store_path = str(tmp_path / 'posts.db')
+    agent = TVKCampaignAI(backend=ReplayBackend(recording(range(1, 31))), store_path=store_path)
+    agent.fetch_data('tvk', count=100)
+    assert agent.store.get_fetch_state('tvk')['since_id'] == 30
+
+    later = recording(range(1, 131))
+    agent = TVKCampaignAI(backend=ReplayBackend(later), store_path=store_path)
+    agent.fetch_data('tvk', count=50)
+    assert agent.store.get_fetch_state('tvk') == {'since_id': 30, 'gap_until_id': 81, 'pending_since_id': 130}
+
+    # The gap is paged with max_id, then nothing newer is left
+    agent = TVKCampaignAI(backend=ReplayBackend(later), store_path=store_path)
+    df = agent.fetch_data('tvk', count=100)
+    assert len(df) == 130
+    assert agent.store.get_fetch_state('tvk')['since_id'] == 130
+
+
+def test_up_to_date_store_costs_one_request(recording, tmp_path):
+    path = recording(range(1, 51))
+    store_path = str(tmp_path / 'posts.db')
+    TVKCampaignAI(backend=ReplayBackend(path), store_path=store_path).fetch_data('tvk', count=100, use_v2=True)
+
+    backend = ReplayBackend(path)
+    agent = TVKCampaignAI(backend=backend, store_path=store_path)
+    df = agent.fetch_data('tvk', count=100, use_v2=True)
+    assert df.attrs['fetch_status'] == {'complete': True, 'fetched': 0, 'retry_at': None, 'reason': None}
+    assert len(df) == 50
+    assert backend.session.request_count == 1
+
+
+def test_deferred_fetch_resumes_from_checkpoint(recording, tmp_path):
+    path = recording(range(1, 301))
+    checkpoints = str(tmp_path / 'checkpoints')
+
+    # Budget for two of the three pages
+    scheduler = RequestScheduler(limits={'search_recent_tweets': (2, 900)})
+    agent = TVKCampaignAI(backend=ReplayBackend(path), checkpoint_dir=checkpoints, scheduler=scheduler)
+    df = agent.fetch_data('tvk', count=300, use_v2=True)
+    assert df.attrs['fetch_status']['complete'] is False
+    assert df.attrs['fetch_status']['reason'] == 'rate limit'
+    assert len(df) == 200
+    assert len(os.listdir(checkpoints)) == 1
+
+    backend = ReplayBackend(path)
+    agent = TVKCampaignAI(backend=backend, checkpoint_dir=checkpoints)
+    df = agent.fetch_data('tvk', count=300, use_v2=True)
+    assert df.attrs['fetch_status']['complete'] is True
+    assert sorted(df['id'].astype(int)) == list(range(1, 301))
+    assert backend.session.request_count == 1
+    assert os.listdir(checkpoints) == []
+
+
+def test_gap_fill_resumes_a_deferred_incremental_fetch(recording, tmp_path):
+    store_path = str(tmp_path / 'posts.db')
+    checkpoints = str(tmp_path / 'checkpoints')
+    agent = TVKCampaignAI(backend=ReplayBackend(recording(range(1, 51))), store_path=store_path)
+    agent.fetch_data('tvk', count=100, use_v2=True)
+
+    # 300 new posts; the rate limit stops the incremental fetch after two pages
+    later = recording(range(1, 351))
+    scheduler = RequestScheduler(limits={'search_recent_tweets': (2, 900)})
+    agent = TVKCampaignAI(backend=ReplayBackend(later), store_path=store_path, checkpoint_dir=checkpoints,
+                          scheduler=scheduler)
+    df = agent.fetch_data('tvk', count=400, use_v2=True)
+    assert df.attrs['fetch_status']['reason'] == 'rate limit'
+    assert agent.store.get_fetch_state('tvk') == {'since_id': 50, 'gap_until_id': 151, 'pending_since_id': 350}
+    assert len(os.listdir(checkpoints)) == 1
+
+    # Filling the gap continues the checkpointed pagination and consumes it
+    backend = ReplayBackend(later)
+    agent = TVKCampaignAI(backend=backend, store_path=store_path, checkpoint_dir=checkpoints)
+    df = agent.fetch_data('tvk', count=400, use_v2=True)
+    assert df.attrs['fetch_status']['complete'] is True
+    assert sorted(df['id'].astype(int)) == list(range(1, 351))
+    assert agent.store.get_fetch_state('tvk') == {'since_id': 350, 'gap_until_id': None, 'pending_since_id': None}
+    assert os.listdir(checkpoints) == []
+    # One page for the rest of the gap, one to find nothing newer
+    assert backend.session.request_count == 2
+
+
+def test_streaming_trackers_count_backfilled_posts(recording, tmp_path):
+    def tags(i):
+        return ['tvk', f'day{i % 2}']
+
+    def mentions(i):
+        return [f'user{i % 5}']
+
+    early = recording(range(1, 21), hashtags=tags, mentions=mentions)
+    later = recording(range(1, 101), hashtags=tags, mentions=mentions)
+    store_path = str(tmp_path / 'posts.db')
+    graph_path = str(tmp_path / 'graph.npz')
+    tracker = TrendTracker()
+
+    # Posts 1-20, then the newest 40 (61-100), then the older 21-60 as the
+    # gap is filled
+    for path, count in ((early, 100), (later, 40), (later, 100)):
+        agent = TVKCampaignAI(backend=ReplayBackend(path), store_path=store_path, trend_tracker=tracker,
+                              influence_graph_path=graph_path)
+        df = agent.fetch_data('tvk', count=count, use_v2=True)
+        agent.update_influence_graph()
+    assert len(df) == 100
+
+    assert tracker.posts == 100
+    assert tracker.top(3)['hashtags'] == {'#tvk': 100, '#day0': 50, '#day1': 50}
+
+    graph = IncrementalMentionGraph.load(graph_path)
+    assert graph.posts == 100
+    batch = IncrementalMentionGraph()
+    batch.update(df)
+    order = np.argsort(graph.users)
+    expected_order = np.argsort(batch.users)
+    assert list(graph.users[order]) == list(batch.users[expected_order])
+    got = graph.current_weights()[order][:, order].toarray()
+    expected = batch.current_weights()[expected_order][:, expected_order].toarray()
+    assert np.allclose(got, expected)
+
+
+def test_v1_and_v2_pages_build_the_same_frame(recording, tmp_path):
+    path = recording(range(1, 121), mentions=lambda i: [f'user{i % 5}'])
+    frames = {}
+    for use_v2 in (True, False):
+        backend = ReplayBackend(path)
+        agent = TVKCampaignAI(backend=backend, cache_path=str(tmp_path / f'cache_{use_v2}.db'))
+        df = agent.fetch_data('tvk', count=120, use_v2=use_v2)
+        requests = backend.session.request_count
+        # Cached pages rebuild the same frame without requests
+        cached = agent.fetch_data('tvk', count=120, use_v2=use_v2)
+        assert backend.session.request_count == requests
+        assert cached.equals(df)
+        frames[use_v2] = df
+
+    v2, v1 = frames[True], frames[False]
+    assert v2['id'].tolist() == list(range(120, 0, -1))
+    assert v2['author'].iloc[0] == 'user1' and v2['author_followers'].iloc[0] == 10
+    assert v2['engagement'].tolist() == (v2['likes'] + v2['retweets']).tolist()
+    assert v2['mentions'].iloc[0] == ['@user0']
+    assert v1.drop(columns='location').equals(v2.drop(columns='location'))
+
+
+def test_v1_search_applies_since_and_until(recording):
+    backend = ReplayBackend(recording(range(1, 101)))
+    api, _ = backend.create_clients()
+    since = recording.base + timedelta(seconds=10 * 40)
+    until = recording.base + timedelta(seconds=10 * 60)
+    statuses = api.search_tweets(q='tvk', count=100, since=since.isoformat(), until=until.isoformat())
+    assert sorted(status.id for status in statuses) == list(range(40, 60))
+
+    # A plain date is midnight UTC; every post is earlier
+    later_day = (recording.base + timedelta(days=2)).strftime('%Y-%m-%d')
+    assert api.search_tweets(q='tvk', since=later_day) == []
+    with pytest.raises(tweepy.BadRequest):
+        api.search_tweets(q='tvk', since='last week')
+
+
+def test_concurrent_requests_are_all_counted(recording):
+    backend = ReplayBackend(recording(range(1, 11)))
+    _, client = backend.create_clients()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: client.search_recent_tweets('tvk'), range(200)))
+    assert backend.session.request_count == 200
@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from tvk_campaign_ai import TVKCampaignAI, ReplayBackend
+from tvk_campaign_ai.sentiment import LexiconSentimentEngine, score_vader_parallel, sentiment_labels
+
+TEXTS = ["great rally today", "terrible traffic after the speech", "vote on monday"] * 20
+
+# Exercises negation, boosters and dampeners, ALL-CAPS, contrastive "but",
+# "least" and ! / ? emphasis
+CORPUS = [
+    "great rally today in chennai",
+    "terrible traffic after the speech",
+    "vote on monday",
+    "the speech was not good",
+    "the speech was not bad at all",
+    "the crowd was very happy",
+    "the crowd was slightly happy",
+    "the manifesto is AMAZING",
+    "i love this campaign!!!",
+    "is this really the best plan??",
+    "the promises sound nice but the plan is weak",
+    "the least convincing speech so far",
+    "never seen such a huge and joyful crowd",
+    "corruption and lies everywhere",
+    "hopeful about the future of the state",
+    "the event was cancelled due to rain",
+    "worst organisation ever, angry voters",
+    "thank you for the warm welcome",
+    "nothing special, just another meeting",
+    "proud of our volunteers",
+    "disappointed with the turnout",
+    "extremely good response from the youth",
+    "the debate was boring",
+    "support is growing fast",
+    "they did not fail us",
+    "such a sad and painful day",
+    "fantastic energy, brilliant speech",
+    "we won't accept this injustice",
+    "the rally starts at 5 pm",
+    "kind of ok i guess",
+]
+
+
+def test_parallel_vader_matches_serial_scores():
+    analyzer = SentimentIntensityAnalyzer()
+    expected = np.array([analyzer.polarity_scores(text)['compound'] for text in TEXTS], dtype=np.float32)
+    # The agent can call it from thread-pool workers
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        scores = executor.submit(score_vader_parallel, TEXTS, 2, chunk_size=25).result()
+    assert np.array_equal(scores, expected)
+
+
+def test_lexicon_engine_agrees_with_vader():
+    analyzer = SentimentIntensityAnalyzer()
+    reference = np.array([analyzer.polarity_scores(text)['compound'] for text in CORPUS])
+    scores = LexiconSentimentEngine(analyzer).score(CORPUS)
+    assert sentiment_labels(scores).tolist() == sentiment_labels(reference).tolist()
+    assert np.abs(scores - reference).max() < 1e-3
+
+
+def test_lexicon_validation_report(recording):
+    agent = TVKCampaignAI(backend=ReplayBackend(recording([1])))
+    agent.df = pd.DataFrame({'cleaned_text': CORPUS * 3})
+    counts = agent.analyze_sentiment(engine='lexicon', validate=True)
+
+    report = agent.results['sentiment_validation']
+    assert report['sample_size'] == len(CORPUS)
+    assert report['label_agreement'] == 1.0
+    assert report['mean_abs_error'] < 1e-3
+    assert report['correlation'] > 0.999
+
+    analyzer = SentimentIntensityAnalyzer()
+    labels = sentiment_labels([analyzer.polarity_scores(text)['compound'] for text in CORPUS * 3])
+    assert counts.to_dict() == pd.Series(labels).value_counts().to_dict()
@@ -0,0 +1,67 @@
+import os
+import time
+from datetime import timedelta
+
+from tvk_campaign_ai import TVKCampaignAI, ReplayBackend, RequestScheduler, CheckpointStore
+
+
+def test_open_ended_shards_are_stable(recording):
+    agent = TVKCampaignAI(backend=ReplayBackend(recording([1])))
+    plans = [agent.plan_time_shards(shards=4) for _ in range(2)]
+    if plans[0] != plans[1]:
+        # The calls straddled a grid line
+        plans = [agent.plan_time_shards(shards=4) for _ in range(2)]
+    assert plans[0] == plans[1]
+    start, end = plans[0][0][0], plans[0][-1][1]
+    assert start.minute % 15 == 0 and end.minute % 15 == 0
+    assert start.second == end.second == 0
+
+
+def test_sharded_fetch_is_trimmed_to_count(recording, tmp_path):
+    path = recording(range(1, 301))
+    agent = TVKCampaignAI(backend=ReplayBackend(path), store_path=str(tmp_path / 'posts.db'))
+    since, until = recording.base, recording.base + timedelta(seconds=10 * 301)
+
+    df = agent.fetch_data('tvk', count=25, use_v2=True, shards=4, since_date=since, until_date=until)
+    # Four shards of at least 10 posts each return 40, trimmed to the newest 25
+    assert len(df) == 25
+    assert df['id'].astype(int).max() == 300
+    assert agent.store.get_fetch_state('tvk')['since_id'] == 300
+
+
+def test_deferred_shards_resume_from_their_checkpoints(recording, tmp_path):
+    path = recording(range(1, 801))
+    checkpoints = str(tmp_path / 'checkpoints')
+    since, until = recording.base, recording.base + timedelta(seconds=10 * 801)
+
+    # Four shards of 200 posts take two pages each; the budget runs out
+    # after the first page of the third shard
+    scheduler = RequestScheduler(limits={'search_recent_tweets': (5, 900)})
+    agent = TVKCampaignAI(backend=ReplayBackend(path), checkpoint_dir=checkpoints, scheduler=scheduler)
+    df = agent.fetch_data('tvk', count=800, use_v2=True, shards=4, since_date=since, until_date=until,
+                          shard_concurrency=1)
+    assert not df.attrs['fetch_status']['complete']
+    assert len(df) == 500
+    assert len(os.listdir(checkpoints)) == 1
+
+    # A later call plans the same shards and resumes the saved cursor
+    backend = ReplayBackend(path)
+    agent = TVKCampaignAI(backend=backend, checkpoint_dir=checkpoints)
+    df = agent.fetch_data('tvk', count=800, use_v2=True, shards=4, since_date=since, until_date=until)
+    assert df.attrs['fetch_status']['complete']
+    assert len(df) == 800
+    assert os.listdir(checkpoints) == []
+    # The third shard continues at its second page: 2 + 2 + 1 + 2 requests
+    assert backend.session.request_count == 7
+
+
+def test_stale_checkpoints_are_pruned(tmp_path):
+    directory = tmp_path / 'checkpoints'
+    store = CheckpointStore(str(directory), max_age=3600)
+    store.save('fresh', 'token', [])
+    store.save('orphan', 'token', [])
+    old = time.time() - 7200
+    os.utime(directory / 'orphan.json', (old, old))
+
+    CheckpointStore(str(directory), max_age=3600)
+    assert os.listdir(directory) == ['fresh.json']
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from tvk_campaign_ai import TVKCampaignAI, ReplayBackend, StreamingTopicModel
+from tvk_campaign_ai.topics import cluster_top_terms
+
+TOPICS = [
+    ['rally', 'crowd', 'speech', 'stage'],
+    ['vote', 'booth', 'ballot', 'poll'],
+    ['water', 'drought', 'farmers', 'crops']
+]
+NEW_TOPIC = ['cricket', 'match', 'stadium', 'wicket']
+
+
+def posts(ids, topics, seed=0):
+    rng = np.random.default_rng(seed)
+    texts = [' '.join(rng.choice(topics[i % len(topics)], size=6)) for i in ids]
+    return pd.DataFrame({'id': [str(i) for i in ids], 'cleaned_text': texts})
+
+
+def topic_of(cluster_terms, word):
+    return next(topic_id for topic_id, terms in cluster_terms.items() if word in terms)
+
+
+def agent_for(recording, df):
+    agent = TVKCampaignAI(backend=ReplayBackend(recording([1])))
+    agent.df = df
+    return agent
+
+
+def test_update_keeps_the_vocabulary_without_drift(recording):
+    agent = agent_for(recording, posts(range(300), TOPICS))
+    agent.cluster_topics(num_clusters=3, method='minibatch')
+    model = agent.topic_model
+
+    agent.df = posts(range(600), TOPICS, seed=1)
+    agent.cluster_topics(num_clusters=3)
+    assert agent.topic_model is model
+    assert len(model.seen_ids) == 600
+
+
+def test_drift_refits_and_keeps_topic_ids(recording):
+    agent = agent_for(recording, posts(range(300), TOPICS))
+    agent.cluster_topics(num_clusters=3, method='minibatch')
+    previous = agent.topic_model
+    before = agent.results['clusters']['cluster_terms']
+
+    # New posts mostly about a topic the frozen vocabulary has never seen
+    drifted = posts(range(300, 600), [NEW_TOPIC, NEW_TOPIC, TOPICS[0], TOPICS[1]], seed=2)
+    agent.df = pd.concat([posts(range(300), TOPICS), drifted], ignore_index=True)
+    agent.cluster_topics(num_clusters=3)
+    after = agent.results['clusters']['cluster_terms']
+
+    assert agent.topic_model is not previous
+    assert 'cricket' in agent.topic_model.terms
+    for word in ('rally', 'vote'):
+        assert topic_of(before, word) == topic_of(after, word)
+
+
+def test_seen_ids_are_bounded_and_saved(tmp_path):
+    df = posts(range(200), TOPICS)
+    vectorizer = TfidfVectorizer(stop_words='english')
+    X = vectorizer.fit_transform(df['cleaned_text'])
+    model = StreamingTopicModel(num_clusters=3, max_seen_ids=50).fit(X, vectorizer, texts=df['cleaned_text'])
+    model.seen_ids.add(df['id'])
+    assert len(model.seen_ids) == 50
+
+    path = str(tmp_path / 'topics.npz')
+    model.save(path)
+    loaded = StreamingTopicModel.load(path)
+    assert loaded.seen_ids.to_array().tolist() == list(range(150, 200))
+    assert loaded.baseline == model.baseline
+
+
+def test_cluster_top_terms_match_dense_per_cluster_sums():
+    rng = np.random.default_rng(0)
+    # Multiples of 0.25 sum exactly, so ties rank the same either way
+    dense = rng.integers(0, 4, size=(12, 6)) * 0.25 * (rng.random((12, 6)) < 0.5)
+    X = sparse.csr_matrix(dense)
+    terms = np.array(['rally', 'vote', 'water', 'jobs', 'roads', 'crowd'])
+    # Cluster 2 is empty and top_n exceeds the vocabulary
+    labels = np.array([0, 1, 3, 0, 1, 3, 3, 0, 1, 0, 3, 1])
+
+    cluster_terms, term_weights, sizes = cluster_top_terms(X, labels, terms, num_clusters=4, top_n=10)
+    assert sizes.tolist() == [4, 4, 0, 4]
+    for k in range(4):
+        summed = dense[labels == k].sum(0)
+        ranked = [j for j in np.argsort(-summed, kind='stable') if summed[j] > 0]
+        assert cluster_terms[k] == terms[ranked].tolist()
+        assert term_weights[k] == {terms[j]: summed[j] / max(sizes[k], 1) for j in ranked}
+    assert cluster_terms[2] == [] and term_weights[2] == {}
+
+    top_two, _, _ = cluster_top_terms(X, labels, terms, num_clusters=4, top_n=2)
+    assert all(top_two[k] == cluster_terms[k][:2] for k in range(4))
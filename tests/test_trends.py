@@ -0,0 +1,44 @@
+import pandas as pd
+
+from tvk_campaign_ai import TrendTracker, SeenIds
+
+
+def posts(ids, hashtag='tvk'):
+    return pd.DataFrame({
+        'id': [str(i) for i in ids],
+        'timestamp': pd.Timestamp('2026-10-01') + pd.to_timedelta(list(ids), unit='min'),
+        'hashtags': [[f'#{hashtag}'] for _ in ids],
+        'cleaned_text': ['rally chennai vote' for _ in ids]
+    })
+
+
+def test_older_posts_are_counted_once():
+    tracker = TrendTracker()
+    assert tracker.update(posts(range(50, 100))) == 50
+    # A backfill of older posts, overlapping the first batch
+    assert tracker.update(posts(range(1, 60))) == 49
+    assert tracker.update(posts(range(1, 100))) == 0
+    assert tracker.top(5)['hashtags'] == {'#tvk': 99}
+
+
+def test_seen_ids_are_bounded():
+    seen = SeenIds(capacity=10).add(range(25))
+    assert len(seen) == 10
+    assert seen.to_array().tolist() == list(range(15, 25))
+    assert seen.new_mask(['14', '15', '30', '30']).tolist() == [True, False, True, False]
+
+
+def test_seen_ids_keep_snowflake_precision():
+    ids = ['1850000000000000001', None, '1850000000000000003', 'n/a', 1850000000000000005]
+    seen = SeenIds().add(ids)
+    assert seen.to_array().tolist() == [1850000000000000001, 1850000000000000003, 1850000000000000005]
+    mask = seen.new_mask([None, '1850000000000000000', '1850000000000000001', '1850000000000000002',
+                          '1850000000000000002', 1850000000000000005])
+    assert mask.tolist() == [True, True, False, True, False, False]
+
+    tracker = TrendTracker()
+    frame = posts([1])
+    frame['id'] = ['1850000000000000001']
+    backfill = pd.concat([posts([2]).assign(id=[None]), frame.assign(id=['1850000000000000002'])])
+    assert tracker.update(frame) == 1
+    assert tracker.update(pd.concat([backfill, frame])) == 2
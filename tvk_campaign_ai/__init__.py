@@ -4,10 +4,27 @@ MIT License - Free to use, modify, distribute
 """
 
 from .tvk_agent import TVKCampaignAI, TextPreprocessor
+from .store import TweetStore
+from .cache import ResponseCache
+from .replay import ReplayBackend, record_response
+from .scheduler import RequestScheduler, QuotaLedger, RateLimitDeferred
+from .checkpoint import CheckpointStore
+from .features import FeatureStore
+from .topics import StreamingTopicModel
+from .dedupe import SeenIds
+from .trends import TrendTracker, SpaceSaving, CountMinSketch
+from .influence import SparseMentionGraph, IncrementalMentionGraph
+from .sentiment import SentimentCache, LexiconSentimentEngine, TransformerSentimentBackend
 
 __version__ = "1.0.0"
 __author__ = "TVKCampaignAI Contributors"
 __license__ = "MIT"
 
-__all__ = ['TVKCampaignAI', 'TextPreprocessor']
+__all__ = ['TVKCampaignAI', 'TextPreprocessor', 'TweetStore', 'ResponseCache',
+           'ReplayBackend', 'record_response', 'RequestScheduler', 'QuotaLedger',
+           'RateLimitDeferred', 'CheckpointStore', 'SentimentCache',
+           'LexiconSentimentEngine', 'TransformerSentimentBackend',
+           'FeatureStore', 'StreamingTopicModel', 'TrendTracker',
+           'SpaceSaving', 'CountMinSketch', 'SeenIds', 'SparseMentionGraph',
+           'IncrementalMentionGraph']
 
@@ -0,0 +1,195 @@
+# TVKCampaignAI: Open-Source AI Agent for TVK Political Campaigning Analysis
+# MIT License - Free to use, modify, distribute
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import closing
+
+from .store import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+# SQLite limits the number of bound parameters per statement
+_SQL_BATCH = 900
+
+
+class SQLiteLRUCache:
+    """Size-bounded, on-disk key-value table with least-recently-used eviction
+
+    Subclasses set ``table`` and ``value_columns`` (name, SQL type pairs)
+    and expose typed accessors over ``_get_many`` / ``_set_many``. With
+    ``expires`` set, rows also record their creation time and are treated
+    as misses once older than ``ttl``. Every operation opens its own short
+    SQLite connection, so one cache can be shared between threads.
+    """
+
+    table = None
+    value_columns = ()
+    expires = False
+
+    def __init__(self, path, max_entries, ttl=None):
+        """Open (or create) the cache
+
+        Args:
+            path: Path to the SQLite cache file
+            max_entries: Maximum number of entries kept on disk
+            ttl: Seconds an entry stays valid (only with ``expires``)
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        columns = [f"{name} {kind} NOT NULL" for name, kind in self.value_columns]
+        if self.expires:
+            columns.append("created_at REAL NOT NULL")
+        columns.append("accessed_at REAL NOT NULL")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, {', '.join(columns)})")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_accessed ON {self.table} (accessed_at)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _get_many(self, keys):
+        """Return a dict of key -> tuple of value columns for the cached keys
+
+        Hits are marked as recently used; expired rows are deleted and
+        counted as misses.
+        """
+        found = {}
+        now = time.time()
+        names = [name for name, _ in self.value_columns]
+        if self.expires:
+            names.append("created_at")
+        with self._lock, closing(self._connect()) as conn, conn:
+            for start in range(0, len(keys), _SQL_BATCH):
+                batch = keys[start:start + _SQL_BATCH]
+                placeholders = ", ".join("?" for _ in batch)
+                rows = conn.execute(
+                    f"SELECT key, {', '.join(names)} FROM {self.table} WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                expired = []
+                for key, *values in rows:
+                    if self.expires and now - values.pop() > self.ttl:
+                        expired.append(key)
+                    else:
+                        found[key] = tuple(values)
+                if expired:
+                    conn.execute(
+                        f"DELETE FROM {self.table} WHERE key IN ({', '.join('?' for _ in expired)})", expired
+                    )
+                conn.execute(
+                    f"UPDATE {self.table} SET accessed_at = ? WHERE key IN ({placeholders})", [now, *batch]
+                )
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def _set_many(self, rows):
+        """Store a dict of key -> tuple of value columns and evict least recently used entries"""
+        if not rows:
+            return
+        now = time.time()
+        names = [name for name, _ in self.value_columns]
+        stamps = (now, now) if self.expires else (now,)
+        if self.expires:
+            names.append("created_at")
+        names.append("accessed_at")
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, {', '.join(names)}) "
+                f"VALUES ({', '.join('?' for _ in range(len(names) + 1))})",
+                [(key, *values, *stamps) for key, values in rows.items()]
+            )
+            conn.execute(
+                f"""
+                DELETE FROM {self.table} WHERE key IN (
+                    SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        """Remove every entry and reset the counters"""
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(f"DELETE FROM {self.table}")
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Return hit/miss counters and the current number of entries"""
+        with closing(self._connect()) as conn:
+            entries = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries
+        }
+
+
+class ResponseCache(SQLiteLRUCache):
+    """Size-bounded, on-disk LRU cache with a TTL for search API results
+
+    Entries are keyed on the endpoint, the normalized query and every other
+    request parameter (time window, field set, pagination token), and hold
+    JSON-serializable values such as parsed post records. Expired entries are
+    treated as misses; once ``max_entries`` is exceeded the least recently
+    used entries are evicted.
+    """
+
+    table = "responses"
+    value_columns = (("value", "TEXT"),)
+    expires = True
+
+    def __init__(self, path, ttl=300, max_entries=512):
+        """Open (or create) the cache
+
+        Args:
+            path: Path to the SQLite cache file
+            ttl: Seconds an entry stays valid
+            max_entries: Maximum number of entries kept on disk
+        """
+        super().__init__(path, max_entries, ttl=ttl)
+
+    @staticmethod
+    def make_key(endpoint, query, **params):
+        """Build a cache key from an endpoint, a query and request parameters
+
+        List-valued parameters (field sets, expansions) are sorted so that
+        the same request always maps to the same key.
+        """
+        normalized = {}
+        for name, value in params.items():
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                value = sorted(str(v) for v in value)
+            normalized[name] = value
+        payload = json.dumps(
+            {"endpoint": endpoint, "query": normalize_query(query), "params": normalized},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the cached value for a key, or None on a miss or expiry"""
+        row = self._get_many([key]).get(key)
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key, value):
+        """Store a value and evict least recently used entries over the limit"""
+        self._set_many({key: (json.dumps(value, default=str),)})
@@ -0,0 +1,113 @@
+# TVKCampaignAI: Open-Source AI Agent for TVK Political Campaigning Analysis
+# MIT License - Free to use, modify, distribute
+
+import os
+import json
+import time
+import hashlib
+import logging
+
+from .store import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """On-disk checkpoints for long paginated fetches
+
+    Each in-progress fetch is saved as one JSON file holding its pagination
+    cursor (v2 ``next_token`` or v1.1 ``max_id``), the request bounds the
+    cursor belongs to and the records collected so far, so a later call
+    with the same key can resume instead of starting from zero.
+    """
+
+    def __init__(self, directory, max_age=86400):
+        """
+        Stale checkpoints left by fetches that were never resumed are
+        removed on start-up.
+
+        Args:
+            directory: Directory for checkpoint files
+            max_age: Seconds after which a checkpoint is considered stale and
+                ignored (pagination tokens do not stay valid forever)
+        """
+        self.directory = directory
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+        self.prune()
+
+    @staticmethod
+    def make_key(api_version, query, **params):
+        """Build a checkpoint key from the API version, query and fetch parameters"""
+        payload = json.dumps(
+            {"api": api_version, "query": normalize_query(query), "params": params},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key):
+        """Return the saved state ({'cursor', 'records', 'bounds', 'updated_at'}) or None"""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return None
+        if time.time() - state.get("updated_at", 0) > self.max_age:
+            logger.info(f"Discarding stale checkpoint {path}")
+            self.clear(key)
+            return None
+        return state
+
+    def save(self, key, cursor, records, bounds=None):
+        """Atomically write the cursor and collected records for a fetch
+
+        Args:
+            key: Checkpoint key (see ``make_key``)
+            cursor: Pagination cursor for the next page
+            records: Records collected so far
+            bounds: Optional request parameters the cursor is only valid
+                with, restored when the fetch is resumed
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        state = {"cursor": cursor, "records": records, "bounds": bounds or {}, "updated_at": time.time()}
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, default=str)
+        os.replace(tmp_path, path)
+
+    def prune(self):
+        """Remove checkpoint files older than ``max_age``
+
+        Returns:
+            int: Number of files removed
+        """
+        removed = 0
+        cutoff = time.time() - self.max_age
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not name.endswith(".json"):
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+        if removed:
+            logger.info(f"Removed {removed} stale checkpoints from {self.directory}")
+        return removed
+
+    def clear(self, key):
+        """Remove the checkpoint for a finished fetch"""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
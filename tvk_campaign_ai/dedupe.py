@@ -0,0 +1,79 @@
+# TVKCampaignAI: Open-Source AI Agent for TVK Political Campaigning Analysis
+# MIT License - Free to use, modify, distribute
+
+from collections import deque
+
+import numpy as np
+
+
+class SeenIds:
+    """Bounded set of the most recently ingested post ids
+
+    Streaming consumers use it to count each post once, whatever order posts
+    arrive in (backfills, time shards and batch fetches all deliver posts
+    older than ones already seen). Only the last ``capacity`` ids are kept;
+    the oldest are forgotten first, so a post that comes back after more
+    than ``capacity`` newer ones is counted again.
+    """
+
+    def __init__(self, capacity=100000, ids=()):
+        """
+        Args:
+            capacity: Maximum number of remembered ids
+            ids: Initial ids, oldest first (e.g. from ``to_array``)
+        """
+        self.capacity = capacity
+        self._order = deque()
+        self._ids = set()
+        self.add(ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    @staticmethod
+    def _as_ids(ids):
+        """Ids as Python ints, or None where an id is missing or not numeric
+
+        Ids are converted one by one: snowflake ids exceed 2 ** 53, so a
+        column that went through float (as pandas does once one value is
+        missing) would no longer hold the exact ids.
+        """
+        values = []
+        for tweet_id in ids:
+            try:
+                values.append(int(tweet_id))
+            except (TypeError, ValueError):
+                values.append(None)
+        return values
+
+    def new_mask(self, ids):
+        """Boolean array marking ids not seen before
+
+        Repeats within ``ids`` are marked only at their first occurrence;
+        ids that are not numeric are always treated as new.
+        """
+        ids = self._as_ids(ids)
+        mask = np.ones(len(ids), dtype=bool)
+        batch = set()
+        for i, tweet_id in enumerate(ids):
+            if tweet_id is None:
+                continue
+            if tweet_id in self._ids or tweet_id in batch:
+                mask[i] = False
+            else:
+                batch.add(tweet_id)
+        return mask
+
+    def add(self, ids):
+        """Remember ids, forgetting the oldest beyond ``capacity``"""
+        for tweet_id in self._as_ids(ids):
+            if tweet_id is not None and tweet_id not in self._ids:
+                self._ids.add(tweet_id)
+                self._order.append(tweet_id)
+        while len(self._order) > self.capacity:
+            self._ids.discard(self._order.popleft())
+        return self
+
+    def to_array(self):
+        """Remembered ids, oldest first, for saving alongside a model"""
+        return np.fromiter(self._order, dtype=np.int64, count=len(self._order))
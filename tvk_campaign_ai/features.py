@@ -0,0 +1,130 @@
+# TVKCampaignAI: Open-Source AI Agent for TVK Political Campaigning Analysis
+# MIT License - Free to use, modify, distribute
+
+import hashlib
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
+
+logger = logging.getLogger(__name__)
+
+
+class FeatureStore:
+    """Tokenize a corpus once and serve TF-IDF views of it
+
+    The corpus is counted once with the widest n-gram range any consumer
+    needs; the vocabulary, sparse count matrix and document frequencies are
+    kept. ``tfidf`` then selects the columns a consumer asks for (n-gram
+    orders, ``min_df``, top ``max_features`` by corpus frequency) and
+    weights them, giving the same result as fitting a separate
+    ``TfidfVectorizer`` with those settings. The store refits only when the
+    texts change.
+    """
+
+    def __init__(self, stop_words='english', ngram_range=(1, 2)):
+        """
+        Args:
+            stop_words: Stop word list passed to the tokenizer
+            ngram_range: Widest n-gram range any view may request
+        """
+        self.stop_words = stop_words
+        self.ngram_range = ngram_range
+        self.fingerprint = None
+        self.counts = None
+        self.terms = None
+        self.doc_freq = None
+        self.term_freq = None
+        self.ngram_order = None
+        self._views = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def make_fingerprint(texts):
+        """Hash a Series of texts (content and order)"""
+        hashed = pd.util.hash_pandas_object(texts.fillna(''), index=False).to_numpy()
+        return hashlib.sha1(hashed.tobytes()).hexdigest()
+
+    def fit(self, texts):
+        """Tokenize ``texts`` unless the store already holds this exact corpus
+
+        Args:
+            texts: Series of cleaned texts
+
+        Returns:
+            FeatureStore: self
+        """
+        fingerprint = self.make_fingerprint(texts)
+        with self._lock:
+            if fingerprint == self.fingerprint:
+                return self
+
+            vectorizer = CountVectorizer(stop_words=self.stop_words, ngram_range=self.ngram_range)
+            counts = vectorizer.fit_transform(texts.fillna('')).tocsc()
+            self.terms = vectorizer.get_feature_names_out()
+            self.counts = counts
+            self.doc_freq = np.diff(counts.indptr)
+            self.term_freq = np.asarray(counts.sum(axis=0)).ravel()
+            self.ngram_order = np.char.count(self.terms.astype(str), ' ') + 1
+            self._views = {}
+            self.fingerprint = fingerprint
+            logger.info(f"Feature store: {counts.shape[0]} posts, {len(self.terms)} terms")
+        return self
+
+    def _columns(self, max_features, min_df, ngram_range):
+        low, high = ngram_range
+        mask = (self.ngram_order >= low) & (self.ngram_order <= high) & (self.doc_freq >= min_df)
+        columns = np.flatnonzero(mask)
+        if max_features is not None and len(columns) > max_features:
+            # Most frequent first, ties broken by term order
+            order = np.lexsort((columns, -self.term_freq[columns]))
+            columns = np.sort(columns[order[:max_features]])
+        if len(columns) == 0:
+            raise ValueError("After pruning, no terms remain")
+        return columns
+
+    def tfidf(self, max_features=None, min_df=1, ngram_range=(1, 1)):
+        """Return a TF-IDF matrix and its terms for a column subset
+
+        Args:
+            max_features: Keep only the most frequent terms across the corpus
+            min_df: Minimum number of posts a term must appear in
+            ngram_range: N-gram orders to include (within the store's range)
+
+        Returns:
+            tuple: (CSR matrix of posts x terms, array of term strings)
+        """
+        key = (max_features, min_df, tuple(ngram_range))
+        with self._lock:
+            if self.counts is None:
+                raise ValueError("FeatureStore.fit must be called first")
+            if key in self._views:
+                return self._views[key]
+
+            columns = self._columns(max_features, min_df, ngram_range)
+            X = TfidfTransformer().fit_transform(self.counts[:, columns]).tocsr()
+            view = (X, self.terms[columns])
+            self._views[key] = view
+            return view
+
+    def vectorizer(self, max_features=None, min_df=1, ngram_range=(1, 1)):
+        """Return a TfidfVectorizer frozen to a view's vocabulary and IDF weights
+
+        Transforming new texts with it places them in the same feature space
+        as ``tfidf(...)`` with the same arguments, without refitting.
+        """
+        with self._lock:
+            if self.counts is None:
+                raise ValueError("FeatureStore.fit must be called first")
+            columns = self._columns(max_features, min_df, ngram_range)
+            n_docs = self.counts.shape[0]
+            vectorizer = TfidfVectorizer(
+                stop_words=self.stop_words,
+                ngram_range=tuple(ngram_range),
+                vocabulary=self.terms[columns].tolist()
+            )
+            # Smoothed IDF, as computed by TfidfTransformer
+            vectorizer.idf_ = np.log((1 + n_docs) / (1 + self.doc_freq[columns])) + 1
+            return vectorizer
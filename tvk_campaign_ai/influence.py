@@ -0,0 +1,493 @@
+# TVKCampaignAI: Open-Source AI Agent for TVK Political Campaigning Analysis
+# MIT License - Free to use, modify, distribute
+
+import os
+import time
+import random
+import logging
+
+import numpy as np
+import pandas as pd
+import networkx as nx
+from scipy import sparse
+
+from .dedupe import SeenIds
+
+logger = logging.getLogger(__name__)
+
+
+def approximate_betweenness(G, k=None, seed=42, time_budget=None, chunk_size=16):
+    """Normalized betweenness centrality from a sample of source nodes
+
+    Shortest paths are accumulated from ``k`` randomly chosen sources (all
+    nodes when ``k`` is None or at least the node count), as in
+    ``nx.betweenness_centrality(G, k=k, seed=seed)``, which picks the same
+    sources for the same seed. Sources are processed in chunks; once
+    ``time_budget`` seconds have passed no further chunks start and the
+    scores are rescaled to the sources actually used.
+
+    Args:
+        G: networkx graph
+        k: Number of sample sources (None for exact betweenness)
+        seed: Seed for choosing the sources
+        time_budget: Optional seconds after which sampling stops early
+        chunk_size: Sources per chunk between time checks
+
+    Returns:
+        tuple: (dict of node -> betweenness, number of sources used)
+    """
+    nodes = list(G.nodes())
+    n = len(nodes)
+    exact = k is None or k >= n
+    sources = nodes if exact else random.Random(seed).sample(nodes, k)
+
+    scores = dict.fromkeys(G, 0.0)
+    # networkx halves unnormalized subset scores of undirected graphs
+    raw = 1 if G.is_directed() else 2
+    used = []
+    started = time.monotonic()
+    for i in range(0, len(sources), chunk_size):
+        if time_budget is not None and used and time.monotonic() - started > time_budget:
+            logger.warning(f"Betweenness time budget of {time_budget}s reached after "
+                           f"{len(used)} of {len(sources)} sources")
+            break
+        chunk = sources[i:i + chunk_size]
+        # Unnormalized subset betweenness over all targets is the raw Brandes
+        # accumulation from these sources
+        partial = nx.betweenness_centrality_subset(G, chunk, nodes, normalized=False)
+        for node, value in partial.items():
+            scores[node] += value * raw
+        used.extend(chunk)
+
+    if n < 3:
+        return scores, len(used)
+    # Normalize by the number of ordered (source, target) pairs that were
+    # counted; a source cannot lie between itself and a target
+    pairs = n - 2
+    if len(used) == n:
+        scale = 1 / ((n - 1) * pairs)
+        return {node: value * scale for node, value in scores.items()}, len(used)
+    sampled = set(used)
+    source_scale = 1 / ((len(used) - 1) * pairs) if len(used) > 1 else 0.0
+    other_scale = 1 / (len(used) * pairs)
+    return {
+        node: value * (source_scale if node in sampled else other_scale)
+        for node, value in scores.items()
+    }, len(used)
+
+
+def pagerank(adjacency, alpha=0.85, personalization=None, start=None, tol=1e-6, max_iter=100):
+    """Weighted PageRank by vectorized power iteration
+
+    Follows ``nx.pagerank``: rows of the adjacency matrix are normalized to
+    transition probabilities, dangling users redistribute their rank by the
+    personalization vector, and iteration stops when the L1 change is below
+    ``n * tol``.
+
+    Args:
+        adjacency: Sparse users x users matrix of edge weights (row -> column)
+        alpha: Damping factor
+        personalization: Optional teleport weights per user (default uniform)
+        start: Optional starting vector, e.g. the previous scores for a warm
+            start (default uniform)
+        tol: Convergence tolerance
+        max_iter: Maximum number of iterations
+
+    Returns:
+        tuple: (array of scores summing to 1, iterations run)
+    """
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0), 0
+    out_weight = np.asarray(adjacency.sum(axis=1)).ravel()
+    inverse = np.divide(1.0, out_weight, out=np.zeros(n), where=out_weight != 0)
+    # x @ (D^-1 A) computed as (D^-1 A)^T @ x on a CSR matrix
+    transition = (sparse.diags(inverse) @ adjacency).T.tocsr()
+    dangling = out_weight == 0
+
+    uniform = np.full(n, 1.0 / n)
+    p = uniform if personalization is None else np.asarray(personalization, dtype=float) / np.sum(personalization)
+    x = uniform
+    if start is not None and np.sum(start) > 0:
+        x = np.asarray(start, dtype=float) / np.sum(start)
+
+    for iteration in range(1, max_iter + 1):
+        last = x
+        x = alpha * (transition @ x + x[dangling].sum() * p) + (1 - alpha) * p
+        if np.abs(x - last).sum() < n * tol:
+            return x, iteration
+    logger.warning(f"PageRank did not converge in {max_iter} iterations")
+    return x, max_iter
+
+
+def hits(adjacency, tol=1e-8, max_iter=100):
+    """Hub and authority scores by vectorized power iteration
+
+    Scores are normalized to sum to 1, as in ``nx.hits``.
+
+    Returns:
+        tuple: (hub scores, authority scores)
+    """
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0), np.zeros(0)
+    transposed = adjacency.T.tocsr()
+    h = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        a = transposed @ h
+        a /= a.max() or 1.0
+        last = h
+        h = adjacency @ a
+        h /= h.max() or 1.0
+        if np.abs(h - last).sum() < n * tol:
+            break
+    else:
+        logger.warning(f"HITS did not converge in {max_iter} iterations")
+    a = transposed @ h
+    return h / (h.sum() or 1.0), a / (a.sum() or 1.0)
+
+
+class SparseMentionGraph:
+    """Mention graph held as a SciPy CSR adjacency matrix
+
+    A lighter alternative to an ``nx.DiGraph`` for large corpora: users are
+    rows/columns of one weighted sparse matrix (author -> mentioned user),
+    and in-degree, degree, PageRank and HITS are computed with vectorized
+    sparse products instead of per-node Python dicts. Scores follow the
+    networkx definitions.
+    """
+
+    def __init__(self, users, adjacency, followers=None):
+        """
+        Args:
+            users: Array of user names, in matrix row order
+            adjacency: users x users CSR matrix of mention counts
+            followers: Optional follower count per user (0 if unknown)
+        """
+        self.users = np.asarray(users, dtype=object)
+        self.adjacency = adjacency.tocsr()
+        self.followers = np.zeros(len(self.users)) if followers is None else np.asarray(followers, dtype=float)
+
+    @classmethod
+    def from_edges(cls, edges, authors=None):
+        """Build the matrix from aggregated edges
+
+        Args:
+            edges: DataFrame with ``source``, ``target`` and ``weight``
+            authors: Optional DataFrame with ``author`` and ``author_followers``
+                (one row per author); authors come first in the user order
+        """
+        names = [edges['source'], edges['target']]
+        if authors is not None:
+            names.insert(0, authors['author'])
+        users = pd.Index(pd.unique(pd.concat(names, ignore_index=True)))
+        n = len(users)
+        adjacency = sparse.csr_matrix(
+            (edges['weight'].to_numpy(dtype=float),
+             (users.get_indexer(edges['source']), users.get_indexer(edges['target']))),
+            shape=(n, n)
+        )
+        followers = np.zeros(n)
+        if authors is not None:
+            followers[users.get_indexer(authors['author'])] = authors['author_followers'].fillna(0).to_numpy(dtype=float)
+        return cls(users.to_numpy(), adjacency, followers)
+
+    def __len__(self):
+        return len(self.users)
+
+    @property
+    def nodes(self):
+        """User names (mirrors ``DiGraph.nodes`` for size checks)"""
+        return self.users
+
+    def _scale(self):
+        return 1.0 / (len(self) - 1) if len(self) > 1 else 1.0
+
+    def in_degree(self):
+        """In-degree centrality (distinct mentioning users / (n - 1))"""
+        return np.bincount(self.adjacency.indices, minlength=len(self)) * self._scale()
+
+    def degree(self):
+        """Degree centrality ((in + out edges) / (n - 1))"""
+        out_degree = np.diff(self.adjacency.indptr)
+        in_degree = np.bincount(self.adjacency.indices, minlength=len(self))
+        return (out_degree + in_degree) * self._scale()
+
+    def pagerank(self, **kwargs):
+        """Weighted PageRank scores (see ``pagerank``)"""
+        return pagerank(self.adjacency, **kwargs)[0]
+
+    def hits(self, **kwargs):
+        """(hub, authority) scores (see ``hits``)"""
+        return hits(self.adjacency, **kwargs)
+
+    def series(self, scores):
+        """Wrap a score array as a Series indexed by user"""
+        return pd.Series(scores, index=pd.Index(self.users, dtype=object))
+
+    def to_networkx(self, max_nodes=None):
+        """Convert to an ``nx.DiGraph``, optionally only the top users by degree
+
+        Args:
+            max_nodes: Keep only this many users with the highest degree
+        """
+        keep = np.arange(len(self))
+        if max_nodes is not None and len(self) > max_nodes:
+            keep = np.sort(np.argsort(-self.degree(), kind='stable')[:max_nodes])
+        sub = self.adjacency[keep][:, keep].tocoo()
+        G = nx.DiGraph()
+        G.add_nodes_from((self.users[i], {'followers': self.followers[i]}) for i in keep)
+        G.add_weighted_edges_from(zip(self.users[keep[sub.row]], self.users[keep[sub.col]], sub.data))
+        return G
+
+
+class IncrementalMentionGraph:
+    """Mention graph maintained across fetches with time-decayed edge weights
+
+    New posts add their mentions to a persistent CSR adjacency matrix, so
+    each fetch only processes its own posts. Edge weights decay with a
+    half-life using forward decay: a mention at time ``t`` adds
+    ``2 ** ((t - landmark) / half_life)``, which leaves the relative weights
+    exactly as if every edge had been decayed to the present without ever
+    rescaling old edges. PageRank only depends on relative weights, and it
+    is warm-started from the previous scores, so a refresh usually converges
+    in a few iterations. Edges not mentioned within ``window_days`` of the
+    newest post are dropped, keeping a rolling window; users stay while they
+    have an edge or posted or were mentioned within the window, so authors
+    who mention nobody are nodes, as in the batch graph.
+
+    Posts are deduplicated on a bounded set of recently ingested post ids,
+    so posts arriving out of order (backfills, time shards) are added with
+    their own event-time weight instead of being skipped. The graph can be
+    saved to and loaded from an ``.npz`` file.
+    """
+
+    # Rebase the landmark before forward-decay factors grow past 2 ** 512
+    MAX_EXPONENT = 512
+
+    def __init__(self, half_life_days=7.0, window_days=30.0, alpha=0.85, max_seen_ids=100000):
+        """
+        Args:
+            half_life_days: Days after which a mention counts half as much
+            window_days: Drop edges not mentioned for this many days (None
+                keeps every edge)
+            alpha: PageRank damping factor
+            max_seen_ids: Post ids remembered for deduplication
+        """
+        self.half_life_days = half_life_days
+        self.window_days = window_days
+        self.alpha = alpha
+        self.users = np.zeros(0, dtype=object)
+        self.followers = np.zeros(0)
+        self.last_active = np.zeros(0)
+        self.weights = sparse.csr_matrix((0, 0))
+        self.last_seen = sparse.csr_matrix((0, 0))
+        self.scores = np.zeros(0)
+        self.landmark = None
+        self.now = None
+        self.seen_ids = SeenIds(max_seen_ids)
+        self.posts = 0
+        self.last_iterations = 0
+        self._index = {}
+
+    def __len__(self):
+        return len(self.users)
+
+    @property
+    def _half_life(self):
+        return self.half_life_days * 86400.0
+
+    def _user_ids(self, names):
+        """Matrix rows of ``names``, adding users seen for the first time"""
+        ids = pd.Series(names).map(self._index)
+        new = pd.unique(np.asarray(names, dtype=object)[ids.isna().to_numpy()])
+        if len(new):
+            start = len(self.users)
+            self._index.update(zip(new, range(start, start + len(new))))
+            self.users = np.concatenate([self.users, np.asarray(new, dtype=object)])
+            self.followers = np.concatenate([self.followers, np.zeros(len(new))])
+            self.last_active = np.concatenate([self.last_active, np.full(len(new), -np.inf)])
+            self.scores = np.concatenate([self.scores, np.full(len(new), np.nan)])
+            ids = pd.Series(names).map(self._index)
+        return ids.to_numpy(dtype=np.int64)
+
+    def update(self, df):
+        """Add the mentions of posts not seen yet
+
+        Args:
+            df: Frame with ``id``, ``timestamp``, ``author``, ``author_followers``
+                and ``mentions``
+
+        Returns:
+            int: Number of new posts applied
+        """
+        batch = df[self.seen_ids.new_mask(df['id'])]
+        if batch.empty:
+            return 0
+
+        times = pd.to_datetime(batch['timestamp'])
+        seconds = (times - pd.Timestamp(0)).dt.total_seconds()
+        seconds = seconds.fillna(seconds.max() if seconds.notna().any() else self.now or 0.0)
+        newest = float(seconds.max())
+        self.now = newest if self.now is None else max(self.now, newest)
+        if self.landmark is None:
+            self.landmark = float(seconds.min())
+
+        # Every author is a node, whether or not the post mentions anyone
+        posted = pd.DataFrame({
+            'author': batch['author'],
+            'followers': batch['author_followers'],
+            'time': seconds
+        }).dropna(subset=['author'])
+        authors = posted.groupby('author', sort=False).agg(followers=('followers', 'last'), time=('time', 'max'))
+        ids = self._user_ids(authors.index)
+        np.maximum.at(self.last_active, ids, authors['time'].to_numpy(dtype=float))
+        followers = authors['followers'].to_numpy(dtype=float)
+        known = ~np.isnan(followers)
+        self.followers[ids[known]] = followers[known]
+
+        mentions = pd.DataFrame({
+            'source': batch['author'],
+            'target': batch['mentions'],
+            'time': seconds
+        }).explode('target').dropna()
+        if not mentions.empty:
+            mentions['target'] = mentions['target'].str.lstrip('@')
+            mentions['weight'] = np.exp2((mentions['time'].to_numpy(dtype=float) - self.landmark) / self._half_life)
+            edges = mentions.groupby(['source', 'target'], sort=False).agg(weight=('weight', 'sum'), time=('time', 'max'))
+            sources = self._user_ids(edges.index.get_level_values(0))
+            targets = self._user_ids(edges.index.get_level_values(1))
+            np.maximum.at(self.last_active, targets, edges['time'].to_numpy(dtype=float))
+
+        n = len(self.users)
+        self.weights.resize((n, n))
+        self.last_seen.resize((n, n))
+        if not mentions.empty:
+            self.weights = (self.weights + sparse.csr_matrix(
+                (edges['weight'].to_numpy(), (sources, targets)), shape=(n, n))).tocsr()
+            self.last_seen = self.last_seen.maximum(sparse.csr_matrix(
+                (edges['time'].to_numpy(dtype=float), (sources, targets)), shape=(n, n))).tocsr()
+
+        self._prune()
+        self._rebase()
+
+        self.seen_ids.add(batch['id'])
+        self.posts += len(batch)
+        logger.info(f"Influence graph: {len(batch)} new posts, {len(self)} users, {self.weights.nnz} edges")
+        return len(batch)
+
+    def _prune(self):
+        """Drop edges older than the window and users inactive since then"""
+        if self.window_days is None or self.now is None:
+            return
+        cutoff = self.now - self.window_days * 86400.0
+        # Compare the stored times only: a sparse ``>=`` against a cutoff <= 0
+        # would also be true for every empty cell and build a dense result
+        stale = self.last_seen.data < cutoff
+        if stale.any():
+            fresh = self.last_seen.copy()
+            fresh.data = (~stale).astype(float)
+            self.weights = self.weights.multiply(fresh).tocsr()
+            self.last_seen = self.last_seen.multiply(fresh).tocsr()
+            self.weights.eliminate_zeros()
+            self.last_seen.eliminate_zeros()
+
+        degree = np.diff(self.weights.indptr) + np.bincount(self.weights.indices, minlength=len(self))
+        keep = np.flatnonzero((degree > 0) | (self.last_active >= cutoff))
+        if len(keep) < len(self):
+            self.weights = self.weights[keep][:, keep].tocsr()
+            self.last_seen = self.last_seen[keep][:, keep].tocsr()
+            self.users = self.users[keep]
+            self.followers = self.followers[keep]
+            self.last_active = self.last_active[keep]
+            self.scores = self.scores[keep]
+            self._index = dict(zip(self.users, range(len(keep))))
+
+    def _rebase(self):
+        """Move the decay landmark forward before the weights overflow"""
+        exponent = (self.now - self.landmark) / self._half_life
+        if exponent > self.MAX_EXPONENT:
+            self.weights = self.weights * np.exp2(-exponent)
+            self.landmark = self.now
+
+    def current_weights(self):
+        """Edge weights decayed to the newest post (mentions-equivalent)"""
+        if self.now is None:
+            return self.weights
+        return self.weights * np.exp2(-(self.now - self.landmark) / self._half_life)
+
+    def pagerank(self, tol=1e-6, max_iter=100):
+        """Warm-started weighted PageRank over the decayed graph
+
+        Returns:
+            Series of user -> score
+        """
+        n = len(self)
+        start = None
+        if n and not np.isnan(self.scores).all():
+            # New users start at the uniform share
+            start = np.where(np.isnan(self.scores), 1.0 / n, self.scores)
+        scores, self.last_iterations = pagerank(self.weights, alpha=self.alpha, start=start,
+                                                tol=tol, max_iter=max_iter)
+        self.scores = scores
+        logger.info(f"PageRank converged in {self.last_iterations} iterations")
+        return pd.Series(scores, index=pd.Index(self.users, dtype=object))
+
+    def top(self, n=10):
+        """Top users by the last PageRank scores as {'user', 'centrality'} records"""
+        scores = pd.Series(np.nan_to_num(self.scores), index=pd.Index(self.users, dtype=object))
+        return [{'user': user, 'centrality': float(score)} for user, score in scores.nlargest(n).items()]
+
+    def save(self, path):
+        """Write users, weights, scores, stream position and seen ids to ``path``"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        weights = self.weights.tocsr()
+        last_seen = self.last_seen.tocsr()
+        np.savez_compressed(
+            tmp_path,
+            users=self.users.astype(str),
+            followers=self.followers,
+            last_active=self.last_active,
+            weights_data=weights.data, weights_indices=weights.indices, weights_indptr=weights.indptr,
+            seen_data=last_seen.data, seen_indices=last_seen.indices, seen_indptr=last_seen.indptr,
+            scores=self.scores,
+            params=np.array([self.half_life_days, np.nan if self.window_days is None else self.window_days, self.alpha]),
+            stream=np.array([
+                np.nan if self.landmark is None else self.landmark,
+                np.nan if self.now is None else self.now
+            ]),
+            counters=np.array([self.posts], dtype=np.int64),
+            seen_ids=self.seen_ids.to_array(),
+            seen_capacity=np.array([self.seen_ids.capacity], dtype=np.int64)
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load a graph written by ``save``"""
+        with np.load(path, allow_pickle=False) as data:
+            half_life_days, window_days, alpha = (float(v) for v in data['params'])
+            graph = cls(half_life_days=half_life_days,
+                        window_days=None if np.isnan(window_days) else window_days,
+                        alpha=alpha,
+                        max_seen_ids=int(data['seen_capacity'][0]))
+            graph.users = data['users'].astype(object)
+            n = len(graph.users)
+            graph.followers = data['followers']
+            # Graphs saved before users were tracked on their own held only
+            # users with edges
+            graph.last_active = data['last_active'] if 'last_active' in data.files else np.full(n, -np.inf)
+            graph.weights = sparse.csr_matrix(
+                (data['weights_data'], data['weights_indices'], data['weights_indptr']), shape=(n, n))
+            graph.last_seen = sparse.csr_matrix(
+                (data['seen_data'], data['seen_indices'], data['seen_indptr']), shape=(n, n))
+            graph.scores = data['scores']
+            landmark, now = (float(v) for v in data['stream'])
+            graph.landmark = None if np.isnan(landmark) else landmark
+            graph.now = None if np.isnan(now) else now
+            graph.posts = int(data['counters'][0])
+            graph.seen_ids.add(data['seen_ids'])
+            graph._index = dict(zip(graph.users, range(n)))
+        logger.info(f"Loaded influence graph from {path} ({n} users, {graph.posts} posts)")
+        return graph
@@ -0,0 +1,271 @@
+# TVKCampaignAI: Open-Source AI Agent for TVK Political Campaigning Analysis
+# MIT License - Free to use, modify, distribute
+
+import json
+import time
+import logging
+import threading
+from http import HTTPStatus
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+import requests
+import tweepy
+
+from .store import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+V2_SEARCH_PATH = "/2/tweets/search/recent"
+V1_SEARCH_PATH = "/1.1/search/tweets.json"
+
+
+def _parse_v2_time(value):
+    """Parse a v2 ISO 8601 timestamp (e.g. 2026-01-01T00:00:00.000Z)"""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _parse_v1_date(value):
+    """Parse a v1.1 ``since`` / ``until`` bound (YYYY-MM-DD or ISO 8601, UTC if naive)"""
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def record_response(path, response, query=None):
+    """Append a v2 search response to a JSONL recording
+
+    Args:
+        path: JSONL file to append to
+        response: tweepy.Response returned by Client.search_recent_tweets
+        query: Optional query to tag the page with, so replays only serve it
+            for the same (normalized) query
+    """
+    includes = response.includes or {}
+    line = {
+        "data": [tweet.data for tweet in (response.data or [])],
+        "includes": {"users": [user.data for user in includes.get("users", [])]},
+        "meta": response.meta or {}
+    }
+    if query is not None:
+        line["query"] = normalize_query(query)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(line, default=str) + "\n")
+
+
+class ReplaySession(requests.Session):
+    """Offline stand-in for the X API that serves recorded v2 responses
+
+    Installed as the ``session`` of a real ``tweepy.API`` / ``tweepy.Client``
+    so tweepy's own pagination, error and rate-limit handling run unchanged.
+    Every recorded page is pooled and re-paginated on demand for both the
+    v2 recent search and the v1.1 search endpoints, honoring ``max_results``
+    / ``count``, ``next_token`` / ``max_id``, ``since_id``, time windows
+    (``start_time`` / ``end_time``, ``since`` / ``until``) and the
+    ``author_id`` users expansion; malformed bounds get a 400 response. Each endpoint keeps its own simulated
+    rate-limit window reported through ``x-rate-limit-*`` headers.
+    """
+
+    def __init__(self, path, latency=0.0, rate_limit=450, window=900):
+        """Load a JSONL recording
+
+        Args:
+            path: JSONL file with one v2 search response body per line
+                (``data``, ``includes.users``, ``meta`` and optional ``query``)
+            latency: Seconds to sleep per request, to simulate network time
+            rate_limit: Requests allowed per endpoint per window
+            window: Rate-limit window length in seconds
+        """
+        super().__init__()
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.window = window
+        self.request_count = 0
+        self._limits = {}
+        self._lock = threading.Lock()
+
+        # Pool tweets per query tag (None = serve for any query)
+        self.tweets = {}
+        self.users = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                page = json.loads(line)
+                pool = self.tweets.setdefault(page.get("query"), {})
+                for tweet in page.get("data") or []:
+                    pool[str(tweet["id"])] = tweet
+                for user in (page.get("includes") or {}).get("users", []):
+                    self.users[str(user["id"])] = user
+
+        total = sum(len(pool) for pool in self.tweets.values())
+        logger.info(f"Replay backend loaded {total} posts and {len(self.users)} users from {path}")
+
+    def request(self, method, url, params=None, **kwargs):
+        path = urlparse(url).path
+        params = {k: str(v) for k, v in (params or {}).items()}
+        with self._lock:
+            self.request_count += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        allowed, headers = self._consume_rate_limit(path)
+        if not allowed:
+            return self._make_response(url, 429, {"title": "Too Many Requests", "detail": "Too Many Requests"}, headers)
+
+        try:
+            if path == V2_SEARCH_PATH:
+                return self._make_response(url, 200, self._search_v2(params), headers)
+            if path == V1_SEARCH_PATH:
+                return self._make_response(url, 200, self._search_v1(params), headers)
+        except ValueError as e:
+            return self._make_response(url, 400, {"errors": [{"message": f"Invalid parameter: {e}"}]}, headers)
+        return self._make_response(url, 404, {"errors": [{"message": f"Replay backend does not serve {path}"}]}, headers)
+
+    def _consume_rate_limit(self, path):
+        """Count a request against the endpoint's window
+
+        Returns:
+            tuple: (whether the request is within the limit, rate-limit headers)
+        """
+        now = time.time()
+        with self._lock:
+            reset, used = self._limits.get(path, (now + self.window, 0))
+            if now >= reset:
+                reset, used = now + self.window, 0
+            used += 1
+            self._limits[path] = (reset, used)
+        headers = {
+            "x-rate-limit-limit": str(self.rate_limit),
+            "x-rate-limit-remaining": str(max(self.rate_limit - used, 0)),
+            "x-rate-limit-reset": str(int(reset))
+        }
+        return used <= self.rate_limit, headers
+
+    @staticmethod
+    def _make_response(url, status_code, payload, headers):
+        response = requests.Response()
+        response.status_code = status_code
+        response.reason = HTTPStatus(status_code).phrase
+        response.url = url
+        response.headers.update(headers)
+        response.headers["content-type"] = "application/json"
+        response._content = json.dumps(payload).encode("utf-8")
+        return response
+
+    def _matching_tweets(self, query, since_id=None, max_id=None, start_time=None, end_time=None):
+        """Return recorded tweets for a query, newest first, within the bounds"""
+        pool = dict(self.tweets.get(None, {}))
+        pool.update(self.tweets.get(normalize_query(query), {}))
+
+        tweets = []
+        for tweet in pool.values():
+            tweet_id = int(tweet["id"])
+            if since_id is not None and tweet_id <= since_id:
+                continue
+            if max_id is not None and tweet_id > max_id:
+                continue
+            if start_time is not None or end_time is not None:
+                created_at = _parse_v2_time(tweet["created_at"])
+                if start_time is not None and created_at < start_time:
+                    continue
+                if end_time is not None and created_at >= end_time:
+                    continue
+            tweets.append(tweet)
+        return sorted(tweets, key=lambda t: int(t["id"]), reverse=True)
+
+    def _search_v2(self, params):
+        max_results = min(max(int(params.get("max_results", 10)), 10), 100)
+        offset = int(params.get("next_token", 0))
+        tweets = self._matching_tweets(
+            params.get("query", ""),
+            since_id=int(params["since_id"]) if "since_id" in params else None,
+            max_id=int(params["until_id"]) - 1 if "until_id" in params else None,
+            start_time=_parse_v2_time(params["start_time"]) if "start_time" in params else None,
+            end_time=_parse_v2_time(params["end_time"]) if "end_time" in params else None
+        )
+        page = tweets[offset:offset + max_results]
+
+        meta = {"result_count": len(page)}
+        if page:
+            meta["newest_id"] = str(page[0]["id"])
+            meta["oldest_id"] = str(page[-1]["id"])
+        if offset + max_results < len(tweets):
+            meta["next_token"] = str(offset + max_results)
+
+        body = {"meta": meta}
+        if page:
+            body["data"] = page
+            if "author_id" in params.get("expansions", "").split(","):
+                author_ids = {str(t.get("author_id")) for t in page}
+                body["includes"] = {
+                    "users": [self.users[a] for a in sorted(author_ids) if a in self.users]
+                }
+        return body
+
+    def _search_v1(self, params):
+        count = min(max(int(params.get("count", 15)), 1), 100)
+        tweets = self._matching_tweets(
+            params.get("q", ""),
+            since_id=int(params["since_id"]) if "since_id" in params else None,
+            max_id=int(params["max_id"]) if "max_id" in params else None,
+            start_time=_parse_v1_date(params["since"]) if "since" in params else None,
+            end_time=_parse_v1_date(params["until"]) if "until" in params else None
+        )[:count]
+
+        return {
+            "statuses": [self._to_v1_status(tweet) for tweet in tweets],
+            "search_metadata": {"count": count, "query": params.get("q", "")}
+        }
+
+    def _to_v1_status(self, tweet):
+        """Convert a recorded v2 tweet (plus its author) to a v1.1 status"""
+        user = self.users.get(str(tweet.get("author_id")), {})
+        user_metrics = user.get("public_metrics") or {}
+        metrics = tweet.get("public_metrics") or {}
+        created_at = _parse_v2_time(tweet["created_at"])
+        return {
+            "id": int(tweet["id"]),
+            "id_str": str(tweet["id"]),
+            "full_text": tweet.get("text", ""),
+            "created_at": created_at.strftime("%a %b %d %H:%M:%S +0000 %Y"),
+            "favorite_count": metrics.get("like_count", 0),
+            "retweet_count": metrics.get("retweet_count", 0),
+            "reply_count": metrics.get("reply_count", 0),
+            "user": {
+                "id": int(user.get("id", 0)),
+                "id_str": str(user.get("id", "0")),
+                "screen_name": user.get("username", "unknown"),
+                "name": user.get("name", "unknown"),
+                "followers_count": user_metrics.get("followers_count", 0),
+                "location": user.get("location")
+            }
+        }
+
+
+class ReplayBackend:
+    """Fetch backend that builds offline tweepy clients over a recording
+
+    Pass an instance as ``TVKCampaignAI(backend=...)`` to run ``fetch_data``
+    without credentials or network access, e.g. for benchmarks and
+    regression tests.
+    """
+
+    def __init__(self, path, latency=0.0, rate_limit=450, window=900):
+        """
+        Args:
+            path: JSONL recording (see ``record_response``)
+            latency: Seconds of simulated latency per request
+            rate_limit: Requests allowed per endpoint per window
+            window: Rate-limit window length in seconds
+        """
+        self.session = ReplaySession(path, latency=latency, rate_limit=rate_limit, window=window)
+
+    def create_clients(self, wait_on_rate_limit=False):
+        """Return a (tweepy.API, tweepy.Client) pair wired to the replay session"""
+        api = tweepy.API(tweepy.OAuth2BearerHandler("replay"), wait_on_rate_limit=wait_on_rate_limit)
+        api.session = self.session
+        client = tweepy.Client(bearer_token="replay", wait_on_rate_limit=wait_on_rate_limit)
+        client.session = self.session
+        return api, client
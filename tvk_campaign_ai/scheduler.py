@@ -0,0 +1,350 @@
+# TVKCampaignAI: Open-Source AI Agent for TVK Political Campaigning Analysis
+# MIT License - Free to use, modify, distribute
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+# Requests allowed per rate-limit window (seconds) for each search endpoint.
+# These match the app-auth limits of the paid tiers; pass your own limits
+# to RequestScheduler for the free tier (1 request / 15 min).
+DEFAULT_LIMITS = {
+    'search_recent_tweets': (450, 900),
+    'search_tweets': (180, 900),
+}
+
+
+class RateLimitDeferred(Exception):
+    """Raised instead of sleeping when a request cannot start yet
+
+    Attributes:
+        endpoint: Endpoint name the request was for
+        retry_at: Unix timestamp at which the request can start
+        reason: 'rate limit' or 'monthly quota'
+    """
+
+    def __init__(self, endpoint, retry_at, reason='rate limit'):
+        self.endpoint = endpoint
+        self.retry_at = retry_at
+        self.reason = reason
+        when = datetime.fromtimestamp(retry_at).strftime("%Y-%m-%d %H:%M:%S")
+        super().__init__(f"{endpoint} deferred by {reason} until {when}")
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``capacity`` tokens per ``window`` seconds"""
+
+    def __init__(self, capacity, window):
+        self.capacity = capacity
+        self.window = window
+        self.rate = capacity / window
+        self.tokens = float(capacity)
+        self.updated = time.time()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        if self.blocked_until:
+            if now < self.blocked_until:
+                self.updated = now
+                return
+            # The server's window has reset, so the full budget is back
+            self.tokens = float(self.capacity)
+            self.blocked_until = 0.0
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, n=1):
+        """Take ``n`` tokens if available; return False without waiting otherwise"""
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            if not self.blocked_until and self.tokens >= n:
+                self.tokens -= n
+                return True
+            return False
+
+    def time_until_available(self, n=1):
+        """Seconds until ``n`` tokens will be available (0 if available now)"""
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            if self.blocked_until:
+                wait = self.blocked_until - now
+                missing = n - self.capacity
+            else:
+                wait = 0.0
+                missing = n - self.tokens
+            if missing > 0:
+                wait += missing / self.rate
+            return wait
+
+    def block_until(self, reset_time):
+        """Empty the bucket until ``reset_time`` (e.g. after a 429 from the server)
+
+        Once the reset time passes the bucket starts again at full capacity,
+        matching the server's fixed rate-limit window.
+        """
+        with self._lock:
+            self.tokens = 0.0
+            self.blocked_until = max(self.blocked_until, float(reset_time))
+            self.updated = time.time()
+
+
+class QuotaLedger:
+    """Monthly post-consumption ledger for the X API tweet cap
+
+    Counts are kept per calendar month and persisted to a small JSON file
+    when ``path`` is given, so the budget survives restarts.
+    """
+
+    def __init__(self, path=None, monthly_cap=1500):
+        """
+        Args:
+            path: Optional JSON file for persisting the ledger
+            monthly_cap: Posts that may be pulled per calendar month
+        """
+        self.path = path
+        self.monthly_cap = monthly_cap
+        self.usage = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.usage = json.load(f)
+
+    @staticmethod
+    def _month(now=None):
+        return (now or datetime.now()).strftime("%Y-%m")
+
+    def used(self):
+        """Posts consumed in the current month"""
+        return self.usage.get(self._month(), 0)
+
+    def remaining(self):
+        """Posts left in the current month's cap"""
+        return max(0, self.monthly_cap - self.used())
+
+    def _save(self):
+        # Callers hold self._lock
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.usage, f)
+
+    def record(self, n):
+        """Add ``n`` consumed posts to the current month"""
+        if n <= 0:
+            return
+        with self._lock:
+            month = self._month()
+            self.usage[month] = self.usage.get(month, 0) + n
+            self._save()
+
+    def reserve(self, n):
+        """Charge up to ``n`` posts to the current month before they are pulled
+
+        The check and the charge happen under one lock, so concurrent
+        fetches cannot both spend the same remaining budget. Posts that a
+        request does not return are handed back with ``refund``.
+
+        Returns:
+            int: Posts granted, 0 once the cap is reached
+        """
+        if n <= 0:
+            return 0
+        with self._lock:
+            month = self._month()
+            used = self.usage.get(month, 0)
+            granted = max(0, min(n, self.monthly_cap - used))
+            if granted:
+                self.usage[month] = used + granted
+                self._save()
+        return granted
+
+    def refund(self, n):
+        """Return ``n`` reserved but unused posts to the current month"""
+        if n <= 0:
+            return
+        with self._lock:
+            month = self._month()
+            self.usage[month] = max(0, self.usage.get(month, 0) - n)
+            self._save()
+
+    @staticmethod
+    def next_reset():
+        """Unix timestamp of the start of next month"""
+        now = datetime.now()
+        year, month = (now.year + 1, 1) if now.month == 12 else (now.year, now.month + 1)
+        return datetime(year, month, 1).timestamp()
+
+
+class ScheduledRequest(Future):
+    """Future for a queued request, annotated with its estimated start time"""
+
+    def __init__(self, endpoint, cost, estimated_start):
+        super().__init__()
+        self.endpoint = endpoint
+        self.cost = cost
+        self.estimated_start = estimated_start
+
+
+class RequestScheduler:
+    """Quota-aware scheduler for X API requests
+
+    Keeps one token bucket per endpoint and an optional monthly quota
+    ledger. Request paths call ``acquire`` before each API call; instead of
+    sleeping inside the calling thread, it raises ``RateLimitDeferred`` with
+    the time the request can start, so callers can keep partial results.
+    Longer jobs can be queued with ``submit``; a background worker starts
+    them in order once their endpoint has budget for them.
+    """
+
+    def __init__(self, limits=None, ledger=None):
+        """
+        Args:
+            limits: Optional dict of endpoint -> (requests, window seconds),
+                merged over DEFAULT_LIMITS
+            ledger: Optional QuotaLedger enforcing a monthly post cap
+        """
+        merged = dict(DEFAULT_LIMITS)
+        merged.update(limits or {})
+        self.buckets = {
+            endpoint: TokenBucket(capacity, window)
+            for endpoint, (capacity, window) in merged.items()
+        }
+        self.ledger = ledger
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._worker = None
+
+    def _bucket(self, endpoint):
+        if endpoint not in self.buckets:
+            self.buckets[endpoint] = TokenBucket(*DEFAULT_LIMITS['search_recent_tweets'])
+        return self.buckets[endpoint]
+
+    def acquire(self, endpoint):
+        """Reserve budget for one request or raise RateLimitDeferred"""
+        if self.ledger is not None and self.ledger.remaining() <= 0:
+            raise RateLimitDeferred(endpoint, QuotaLedger.next_reset(), reason='monthly quota')
+
+        bucket = self._bucket(endpoint)
+        if not bucket.try_acquire():
+            raise RateLimitDeferred(endpoint, time.time() + bucket.time_until_available())
+
+    def quota_remaining(self):
+        """Posts left this month, or None when no ledger is configured"""
+        return self.ledger.remaining() if self.ledger is not None else None
+
+    def record_posts(self, n):
+        """Charge ``n`` fetched posts against the monthly quota"""
+        if self.ledger is not None:
+            self.ledger.record(n)
+
+    def reserve_posts(self, endpoint, n):
+        """Reserve up to ``n`` posts of monthly quota ahead of a request
+
+        Returns:
+            int: Posts granted (``n`` when no ledger is configured)
+
+        Raises:
+            RateLimitDeferred: When the monthly quota is used up
+        """
+        if self.ledger is None:
+            return n
+        granted = self.ledger.reserve(n)
+        if granted <= 0:
+            raise RateLimitDeferred(endpoint, QuotaLedger.next_reset(), reason='monthly quota')
+        return granted
+
+    def settle_posts(self, reserved, pulled):
+        """Settle a reservation against the posts the request returned"""
+        if self.ledger is None:
+            return
+        if pulled > reserved:
+            self.ledger.record(pulled - reserved)
+        else:
+            self.ledger.refund(reserved - pulled)
+
+    def rate_limited(self, endpoint, reset_time=None):
+        """Note a server-side 429 so no further requests start before reset"""
+        bucket = self._bucket(endpoint)
+        # One extra second of margin, as tweepy does, for clock skew
+        bucket.block_until(reset_time + 1 if reset_time else time.time() + bucket.window)
+        return bucket.blocked_until
+
+    def estimate_start(self, endpoint, cost=1):
+        """Estimate when ``cost`` more requests to ``endpoint`` could start
+
+        Requests already waiting in the queue for the same endpoint are
+        counted ahead of this one.
+
+        Returns:
+            float: Unix timestamp
+        """
+        if self.ledger is not None and self.ledger.remaining() <= 0:
+            return QuotaLedger.next_reset()
+
+        with self._condition:
+            queued = sum(job.cost for job, _, _ in self._queue if job.endpoint == endpoint)
+        return time.time() + self._bucket(endpoint).time_until_available(queued + cost)
+
+    def submit(self, endpoint, fn, *args, cost=1, **kwargs):
+        """Queue ``fn(*args, **kwargs)`` to start once ``endpoint`` has budget
+
+        Args:
+            endpoint: Endpoint the job will call
+            fn: Callable performing the requests (it should still call
+                ``acquire`` per request)
+            cost: Number of requests the job is expected to make
+
+        Returns:
+            ScheduledRequest: Future with an ``estimated_start`` timestamp
+        """
+        job = ScheduledRequest(endpoint, cost, self.estimate_start(endpoint, cost))
+        with self._condition:
+            self._queue.append((job, fn, (args, kwargs)))
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_queue, name="tvk-request-scheduler", daemon=True)
+                self._worker.start()
+            self._condition.notify()
+        return job
+
+    def pending(self):
+        """Number of queued requests that have not started"""
+        with self._condition:
+            return len(self._queue)
+
+    def _run_queue(self):
+        while True:
+            with self._condition:
+                if not self._queue:
+                    return
+                job, fn, (args, kwargs) = self._queue[0]
+
+            # Wait in the scheduler thread, not in the caller's
+            bucket = self._bucket(job.endpoint)
+            wait = bucket.time_until_available(min(job.cost, bucket.capacity))
+            if self.ledger is not None and self.ledger.remaining() <= 0:
+                wait = max(wait, QuotaLedger.next_reset() - time.time())
+            if wait > 0:
+                time.sleep(min(wait, 60))
+                continue
+
+            with self._condition:
+                self._queue.popleft()
+            if not job.set_running_or_notify_cancel():
+                continue
+            try:
+                job.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                logger.error(f"Scheduled {job.endpoint} request failed: {e}")
+                job.set_exception(e)
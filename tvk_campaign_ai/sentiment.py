@@ -0,0 +1,420 @@
+# TVKCampaignAI: Open-Source AI Agent for TVK Political Campaigning Analysis
+# MIT License - Free to use, modify, distribute
+
+import os
+import string
+import hashlib
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from vaderSentiment import vaderSentiment as vader
+
+from .cache import SQLiteLRUCache
+
+logger = logging.getLogger(__name__)
+
+
+# Compound-score thresholds used by VADER's reference implementation
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+
+
+def sentiment_labels(scores):
+    """Map compound scores to 'positive' / 'negative' / 'neutral' labels"""
+    scores = np.asarray(scores, dtype=float)
+    return np.where(
+        scores > POSITIVE_THRESHOLD, 'positive',
+        np.where(scores < NEGATIVE_THRESHOLD, 'negative', 'neutral')
+    )
+
+
+# Per-process analyzer for pool workers, loaded once by _init_vader_worker
+_worker_analyzer = None
+
+
+def _init_vader_worker():
+    global _worker_analyzer
+    _worker_analyzer = vader.SentimentIntensityAnalyzer()
+
+
+def _score_vader_chunk(texts):
+    scores = (_worker_analyzer.polarity_scores(text)['compound'] for text in texts)
+    return np.fromiter(scores, dtype=np.float32, count=len(texts))
+
+
+def score_vader_parallel(texts, workers, chunk_size=5000):
+    """Score texts with stock VADER in a process pool
+
+    Each worker loads the VADER lexicon once; chunks of texts go out and
+    compact float32 score arrays come back.
+
+    Args:
+        texts: List of texts
+        workers: Number of worker processes
+        chunk_size: Texts per task
+
+    Returns:
+        numpy.ndarray: float32 compound scores aligned with ``texts``
+    """
+    if not texts:
+        return np.zeros(0, dtype=np.float32)
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    # Callers may run inside thread-pool workers, and forking a
+    # multi-threaded process can deadlock, so never use 'fork'
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_init_vader_worker,
+                             mp_context=multiprocessing.get_context(method)) as executor:
+        return np.concatenate(list(executor.map(_score_vader_chunk, chunks)))
+
+
+class SentimentCache(SQLiteLRUCache):
+    """Size-bounded, on-disk cache of compound sentiment scores by text hash
+
+    Scores are keyed on a hash of the scoring engine name and the cleaned
+    text, so retweets and copy-pasted posts are scored once and reused
+    across runs. Once ``max_entries`` is exceeded the least recently used
+    scores are evicted.
+    """
+
+    table = "scores"
+    value_columns = (("score", "REAL"),)
+
+    def __init__(self, path, max_entries=200000):
+        """Open (or create) the cache
+
+        Args:
+            path: Path to the SQLite cache file
+            max_entries: Maximum number of scores kept on disk
+        """
+        super().__init__(path, max_entries)
+
+    @staticmethod
+    def make_key(text, engine='vader'):
+        """Build a cache key from the scoring engine name and a text"""
+        return hashlib.sha1(f"{engine}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys):
+        """Return a dict of key -> score for the keys that are cached"""
+        return {key: values[0] for key, values in self._get_many(keys).items()}
+
+    def set_many(self, scores):
+        """Store a dict of key -> score and evict least recently used entries"""
+        self._set_many({key: (float(score),) for key, score in scores.items()})
+
+
+class LexiconSentimentEngine:
+    """Corpus-level, vectorized approximation of VADER compound scores
+
+    The whole batch is tokenized once into a flat token array. Base valence
+    for every post comes from one sparse document-term matrix product with
+    the VADER lexicon vector. VADER's heuristics (ALL-CAPS emphasis, booster
+    and dampener words, negation within three tokens, "least", contrastive
+    "but", and ! / ? emphasis) are then applied as vectorized per-token
+    corrections. Emoji descriptions and the rare multi-word idiom rules are
+    not modelled, so scores can differ slightly from stock VADER; use
+    ``validate`` to measure the agreement on a sample.
+    """
+
+    def __init__(self, analyzer=None):
+        """
+        Args:
+            analyzer: Optional SentimentIntensityAnalyzer whose lexicon to use
+        """
+        analyzer = analyzer or vader.SentimentIntensityAnalyzer()
+        self.analyzer = analyzer
+        self.terms = pd.Index(list(analyzer.lexicon.keys()))
+        self.valences = np.fromiter(analyzer.lexicon.values(), dtype=np.float64, count=len(self.terms))
+
+    def _tokenize(self, texts):
+        """Split texts into a flat token array and the owning document index
+
+        Returns the factorized token codes and the distinct raw tokens, so
+        string work is done once per distinct token rather than per token.
+        """
+        split = [text.split() if isinstance(text, str) else [] for text in texts]
+        lengths = np.fromiter(map(len, split), dtype=np.int64, count=len(split))
+        codes, vocabulary = pd.factorize(np.fromiter(chain.from_iterable(split), dtype=object, count=lengths.sum()))
+        doc = np.repeat(np.arange(len(split)), lengths)
+        starts = np.cumsum(lengths) - lengths
+        position = np.arange(len(codes)) - starts[doc]
+        return codes, pd.Series(vocabulary, dtype=object), doc, position, lengths
+
+    def score(self, texts):
+        """Return compound scores (float64 array) for a list of texts"""
+        n_docs = len(texts)
+        codes, vocabulary, doc, position, lengths = self._tokenize(texts)
+        if len(codes) == 0:
+            return np.zeros(n_docs)
+
+        # Per distinct token: strip surrounding punctuation unless that leaves
+        # an emoticon-sized stub, then look up lexicon, booster and negation
+        stripped = vocabulary.str.strip(string.punctuation)
+        vocabulary = stripped.where(stripped.str.len() > 2, vocabulary)
+        lower = vocabulary.str.lower()
+
+        def flag(values):
+            """Per-token boolean array from a per-distinct-token condition"""
+            return np.asarray(values, dtype=bool)[codes]
+
+        def word_is(*words):
+            return flag(lower.isin(words))
+
+        upper = flag(vocabulary.str.isupper())
+        term = self.terms.get_indexer(lower)[codes]
+        in_lexicon = term >= 0
+        booster = lower.map(vader.BOOSTER_DICT).fillna(0.0).to_numpy(dtype=np.float64)[codes]
+        is_booster = word_is(*vader.BOOSTER_DICT.keys())
+        negation = flag(lower.isin(vader.NEGATE) | lower.str.contains("n't", regex=False))
+
+        def previous(values, k, fill=False):
+            """values shifted so index i holds values[i - k] (fill at document starts)"""
+            shifted = np.empty_like(values)
+            shifted[:k] = fill
+            shifted[k:] = values[:-k]
+            shifted[position < k] = fill
+            return shifted
+
+        def following(values, k, fill=False):
+            """values shifted so index i holds values[i + k] (fill past document ends)"""
+            shifted = np.empty_like(values)
+            shifted[-k:] = fill
+            shifted[:-k] = values[k:]
+            shifted[position >= lengths[doc] - k] = fill
+            return shifted
+
+        is_no = word_is("no")
+        is_or_nor = word_is("or", "nor")
+        is_so_this = word_is("so", "this")
+        is_never = word_is("never")
+        is_without = word_is("without")
+        is_doubt = word_is("doubt")
+        is_least = word_is("least")
+        is_at_very = word_is("at", "very")
+        is_but = word_is("but")
+
+        # ALL CAPS only counts as emphasis when some, but not all, tokens are capitalized
+        caps_per_doc = np.bincount(doc, weights=upper, minlength=n_docs)
+        cap_diff = ((caps_per_doc > 0) & (caps_per_doc < lengths))[doc]
+
+        # Booster words and "kind of" carry no valence of their own
+        scored = in_lexicon & ~is_booster & ~(word_is("kind") & following(word_is("of"), 1))
+
+        # Base valence: sparse document-term matrix times the lexicon vector
+        dtm = sparse.csr_matrix(
+            (np.ones(int(scored.sum())), (doc[scored], term[scored])),
+            shape=(n_docs, len(self.terms))
+        )
+        base = dtm @ self.valences
+
+        lexicon_valence = np.where(scored, self.valences[np.maximum(term, 0)], 0.0)
+        valence = lexicon_valence.copy()
+
+        prev_in_lexicon = {k: previous(in_lexicon, k) for k in (1, 2, 3)}
+
+        # "no" directly before another lexicon word negates that word instead
+        valence[scored & is_no & following(in_lexicon, 1)] = 0.0
+        no_before = (
+            previous(is_no, 1) | previous(is_no, 2)
+            | (previous(is_no, 3) & previous(is_or_nor, 1))
+        )
+        valence = np.where(scored & no_before, lexicon_valence * vader.N_SCALAR, valence)
+
+        # Capitalized sentiment words
+        caps = scored & upper & cap_diff
+        valence = np.where(caps, valence + np.where(valence > 0, vader.C_INCR, -vader.C_INCR), valence)
+
+        # Boosters/dampeners and negations up to three tokens back
+        for k, decay in ((1, 1.0), (2, 0.95), (3, 0.9)):
+            applies = scored & (position >= k) & ~prev_in_lexicon[k]
+            prev_boost = previous(booster, k, 0.0)
+            prev_caps_boost = previous(is_booster & upper, k) & cap_diff
+            sign = np.where(valence < 0, -1.0, 1.0)
+            scalar = prev_boost * sign + np.where(prev_caps_boost, np.where(valence > 0, vader.C_INCR, -vader.C_INCR), 0.0)
+            valence = np.where(applies, valence + scalar * decay, valence)
+
+            negated = previous(negation, k)
+            if k == 1:
+                factor = np.where(negated, vader.N_SCALAR, 1.0)
+            elif k == 2:
+                never_so = previous(is_never, 2) & previous(is_so_this, 1)
+                without_doubt = previous(is_without, 2) & previous(is_doubt, 1)
+                factor = np.where(never_so, 1.25, np.where(~without_doubt & negated, vader.N_SCALAR, 1.0))
+            else:
+                # VADER's operator precedence makes "so"/"this" just before
+                # the word enough on its own at this distance
+                never_so = (previous(is_never, 3) & previous(is_so_this, 2)) | previous(is_so_this, 1)
+                without_doubt = previous(is_without, 3) & (previous(is_doubt, 2) | previous(is_doubt, 1))
+                factor = np.where(never_so, 1.25, np.where(~without_doubt & negated, vader.N_SCALAR, 1.0))
+            valence = np.where(applies, valence * factor, valence)
+
+        # "least" negates the next word, except in "at least" / "very least"
+        least = (
+            scored & previous(is_least, 1) & ~prev_in_lexicon[1]
+            & ((position == 1) | ~previous(is_at_very, 2))
+        )
+        valence = np.where(least, valence * vader.N_SCALAR, valence)
+
+        # Contrastive "but": halve what comes before it, boost what follows
+        no_but = np.iinfo(np.int64).max
+        but_position = np.full(n_docs, no_but)
+        np.minimum.at(but_position, doc[is_but], position[is_but])
+        first_but = but_position[doc]
+        has_but = first_but != no_but
+        valence = np.where(has_but & (position < first_but), valence * 0.5, valence)
+        valence = np.where(has_but & (position > first_but), valence * 1.5, valence)
+
+        total = base + np.bincount(doc, weights=valence - lexicon_valence, minlength=n_docs)
+
+        # Exclamation / question mark emphasis pushes away from zero
+        texts = [text if isinstance(text, str) else "" for text in texts]
+        exclamations = np.minimum(np.fromiter((text.count("!") for text in texts), dtype=np.int64, count=n_docs), 4) * 0.292
+        questions = np.fromiter((text.count("?") for text in texts), dtype=np.int64, count=n_docs)
+        emphasis = exclamations + np.where(questions > 3, 0.96, np.where(questions > 1, questions * 0.18, 0.0))
+        total = total + np.sign(total) * emphasis
+
+        return np.clip(total / np.sqrt(total * total + 15), -1.0, 1.0)
+
+    def validate(self, texts, sample_size=2000, random_state=42):
+        """Compare this engine with stock VADER on a sample of texts
+
+        Returns:
+            dict: sample_size, label_agreement, mean_abs_error and correlation
+        """
+        texts = list(texts)
+        if len(texts) > sample_size:
+            rng = np.random.default_rng(random_state)
+            texts = [texts[i] for i in rng.choice(len(texts), sample_size, replace=False)]
+        if not texts:
+            return {'sample_size': 0, 'label_agreement': None, 'mean_abs_error': None, 'correlation': None}
+
+        fast = self.score(texts)
+        reference = np.array([self.analyzer.polarity_scores(text)['compound'] for text in texts])
+        correlation = None
+        if len(texts) > 1 and fast.std() > 0 and reference.std() > 0:
+            correlation = float(np.corrcoef(fast, reference)[0, 1])
+        return {
+            'sample_size': len(texts),
+            'label_agreement': float((sentiment_labels(fast) == sentiment_labels(reference)).mean()),
+            'mean_abs_error': float(np.abs(fast - reference).mean()),
+            'correlation': correlation
+        }
+
+
+class TransformerSentimentBackend:
+    """Batched CPU sentiment scoring with a local transformer classifier
+
+    Texts are tokenized once, sorted by length and grouped into dynamic
+    batches capped by both ``batch_size`` and ``max_batch_tokens``, so short
+    posts are not padded to the longest post in the corpus. The model can be
+    quantized to int8 with dynamic quantization of its Linear layers, and
+    results are memoized per text hash. The compound score is
+    P(positive) - P(negative), on the same -1..1 scale as VADER.
+
+    Requires ``torch`` and ``transformers`` (optional dependencies).
+    """
+
+    def __init__(self, model_path, batch_size=64, max_batch_tokens=8192, max_length=128,
+                 quantize=True, num_threads=None, cache_size=100000):
+        """Load the model from a local directory
+
+        Args:
+            model_path: Local directory of a sequence-classification model
+                (no downloads are attempted)
+            batch_size: Maximum texts per batch
+            max_batch_tokens: Maximum padded tokens per batch
+            max_length: Texts are truncated to this many tokens
+            quantize: Apply int8 dynamic quantization to Linear layers
+            num_threads: Intra-op CPU threads for torch (default: torch's own)
+            cache_size: Number of per-text scores memoized in memory
+        """
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+        self.torch = torch
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        self.model_path = model_path
+        self.name = f"transformer:{os.path.basename(os.path.normpath(model_path))}"
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_length = max_length
+        self.cache_size = cache_size
+        self._memo = OrderedDict()
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=True)
+        model = AutoModelForSequenceClassification.from_pretrained(model_path, local_files_only=True)
+        model.eval()
+        if quantize:
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.model = model
+        self.positive, self.negative = self._polarity_labels(model.config)
+        logger.info(f"Loaded sentiment model from {model_path} (quantized={quantize}, "
+                    f"threads={torch.get_num_threads()})")
+
+    @staticmethod
+    def _polarity_labels(config):
+        """Find the positive and negative class indices from the model config"""
+        labels = {int(i): str(label).lower() for i, label in config.id2label.items()}
+        positive = [i for i, label in labels.items() if label.startswith('pos')]
+        negative = [i for i, label in labels.items() if label.startswith('neg')]
+        if positive and negative:
+            return positive[0], negative[0]
+        # Generic LABEL_n names: assume (negative, positive) or (negative, neutral, positive)
+        return len(labels) - 1, 0
+
+    def _batches(self, lengths):
+        """Yield index batches of similar length within the size and token caps"""
+        order = np.argsort(lengths, kind='stable')
+        batch = []
+        for i in order:
+            # Sorted ascending, so the current text is the longest in the batch
+            if batch and (len(batch) >= self.batch_size
+                          or (len(batch) + 1) * lengths[i] > self.max_batch_tokens):
+                yield batch
+                batch = []
+            batch.append(i)
+        if batch:
+            yield batch
+
+    def _infer(self, texts):
+        torch = self.torch
+        encoded = self.tokenizer(list(texts), truncation=True, max_length=self.max_length)
+        input_ids = encoded['input_ids']
+        lengths = np.fromiter(map(len, input_ids), dtype=np.int64, count=len(input_ids))
+        scores = np.zeros(len(texts), dtype=np.float32)
+
+        with torch.inference_mode():
+            for batch in self._batches(lengths):
+                features = [{name: values[i] for name, values in encoded.items()} for i in batch]
+                inputs = self.tokenizer.pad(features, return_tensors='pt')
+                probabilities = torch.softmax(self.model(**inputs).logits, dim=-1)
+                compound = probabilities[:, self.positive] - probabilities[:, self.negative]
+                scores[batch] = compound.numpy()
+        return scores
+
+    def score(self, texts):
+        """Return compound scores (float32 array) for a list of texts"""
+        keys = [hashlib.sha1(text.encode("utf-8")).hexdigest() for text in texts]
+        scores = np.zeros(len(texts), dtype=np.float32)
+        pending = []
+        for i, key in enumerate(keys):
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                scores[i] = self._memo[key]
+            else:
+                pending.append(i)
+
+        if pending:
+            scores[pending] = self._infer([texts[i] for i in pending])
+            for i in pending:
+                self._memo[keys[i]] = scores[i]
+            while len(self._memo) > self.cache_size:
+                self._memo.popitem(last=False)
+        return scores
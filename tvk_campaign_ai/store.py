@@ -0,0 +1,260 @@
+# TVKCampaignAI: Open-Source AI Agent for TVK Political Campaigning Analysis
+# MIT License - Free to use, modify, distribute
+
+import os
+import sqlite3
+import logging
+from contextlib import closing
+from datetime import datetime, timezone
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# Raw post record columns, in the order TVKCampaignAI builds them. Derived
+# columns (hashtags, mentions, cleaned text) are computed when a frame is
+# built, and timestamps are stored as ISO 8601 UTC strings.
+RECORD_COLUMNS = [
+    "id", "text", "author", "author_name", "author_followers", "likes",
+    "retweets", "replies", "engagement", "timestamp", "location"
+]
+
+
+def normalize_query(query):
+    """Collapse whitespace so equivalent queries share one store entry"""
+    return " ".join(str(query).split())
+
+
+def _time_bound(value):
+    """Format a date bound to compare with stored ISO 8601 UTC timestamps"""
+    if isinstance(value, datetime):
+        # Naive datetimes are taken as UTC, as in the v2 search parameters
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat()
+    return str(value)
+
+
+class TweetStore:
+    """Persistent SQLite store of fetched posts, keyed on tweet id
+
+    Posts are stored once regardless of how many queries matched them; a
+    separate table links queries to tweet ids so each query keeps its own
+    ``since_id`` high-water mark for incremental fetching.
+
+    An incremental fetch that stops before pagination runs out (it reached
+    ``count`` or was deferred) leaves a gap between the old ``since_id`` and
+    the oldest post it collected. The gap is recorded as a low-water mark
+    (``gap_until_id``) plus the newest id of that fetch (``pending_since_id``);
+    ``since_id`` only moves to ``pending_since_id`` once the gap is filled.
+    """
+
+    def __init__(self, path):
+        """Open (or create) the store
+
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tweets (
+                    id INTEGER PRIMARY KEY,
+                    text TEXT,
+                    author TEXT,
+                    author_name TEXT,
+                    author_followers INTEGER,
+                    likes INTEGER,
+                    retweets INTEGER,
+                    replies INTEGER,
+                    engagement INTEGER,
+                    timestamp TEXT,
+                    location TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tweets_timestamp ON tweets (timestamp)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS query_tweets (
+                    query TEXT NOT NULL,
+                    tweet_id INTEGER NOT NULL,
+                    PRIMARY KEY (query, tweet_id)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS query_state (
+                    query TEXT PRIMARY KEY,
+                    since_id INTEGER,
+                    updated_at TEXT,
+                    gap_until_id INTEGER,
+                    pending_since_id INTEGER
+                )
+            """)
+            # Stores created before gaps were tracked
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(query_state)")}
+            for column in ("gap_until_id", "pending_since_id"):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE query_state ADD COLUMN {column} INTEGER")
+
+    def _connect(self):
+        # One short-lived connection per operation keeps the store safe to
+        # use from the analysis thread pool and Streamlit worker threads
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_since_id(self, query):
+        """Return the newest stored tweet id for a query, or None"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT since_id FROM query_state WHERE query = ?",
+                (normalize_query(query),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_fetch_state(self, query):
+        """Return the query's incremental fetch state
+
+        Returns:
+            dict: ``since_id`` (posts up to it are stored), ``gap_until_id``
+            (posts between ``since_id`` and it are still missing, or None) and
+            ``pending_since_id`` (the since_id to use once the gap is filled)
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT since_id, gap_until_id, pending_since_id FROM query_state WHERE query = ?",
+                (normalize_query(query),)
+            ).fetchone()
+        since_id, gap_until_id, pending_since_id = row if row else (None, None, None)
+        return {'since_id': since_id, 'gap_until_id': gap_until_id, 'pending_since_id': pending_since_id}
+
+    def update_fetch_state(self, query, ids, exhausted, filling_gap=False, low_water_id=None):
+        """Record how far a fetch segment got
+
+        Args:
+            query: Search query
+            ids: Tweet ids the segment returned
+            exhausted: True if pagination ran out (no posts are left between
+                the segment's lower bound and its newest post)
+            filling_gap: True if the segment fetched the recorded gap
+                (posts between ``since_id`` and ``gap_until_id``) rather
+                than posts newer than ``since_id``
+            low_water_id: Id below which an unexhausted segment may have
+                missed posts; defaults to the oldest id it returned
+
+        Returns:
+            dict: The new fetch state (see ``get_fetch_state``)
+        """
+        state = self.get_fetch_state(query)
+        ids = [int(tweet_id) for tweet_id in ids]
+        low_water_id = int(low_water_id) if low_water_id else (min(ids) if ids else None)
+        since_id = state['since_id']
+        gap_until_id = state['gap_until_id']
+        pending_since_id = state['pending_since_id']
+
+        if filling_gap:
+            if exhausted:
+                since_id = max(since_id or 0, pending_since_id or 0) or None
+                gap_until_id = pending_since_id = None
+            elif ids:
+                gap_until_id = low_water_id
+        elif ids:
+            if exhausted or since_id is None:
+                # Without an earlier since_id there is nothing older to
+                # fill: the fetch returned the newest posts in its window
+                since_id = max(since_id or 0, max(ids))
+            else:
+                gap_until_id = low_water_id
+                pending_since_id = max(ids)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                INSERT INTO query_state (query, since_id, updated_at, gap_until_id, pending_since_id)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(query) DO UPDATE SET
+                    since_id = excluded.since_id,
+                    updated_at = excluded.updated_at,
+                    gap_until_id = excluded.gap_until_id,
+                    pending_since_id = excluded.pending_since_id
+                """,
+                (normalize_query(query), since_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                 gap_until_id, pending_since_id)
+            )
+        if gap_until_id is not None:
+            logger.info(f"Posts between ids {since_id} and {gap_until_id} for '{query}' will be fetched next time")
+        return {'since_id': since_id, 'gap_until_id': gap_until_id, 'pending_since_id': pending_since_id}
+
+    def upsert(self, query, records):
+        """Merge fetched records into the store
+
+        Existing posts are updated in place (engagement counts change over
+        time); new posts are inserted. The query's fetch state is updated
+        separately with ``update_fetch_state``.
+
+        Args:
+            query: Search query the records were fetched for
+            records: DataFrame of record columns (RECORD_COLUMNS), or a list
+                of post record dicts
+
+        Returns:
+            int: Number of posts that were not already linked to the query
+        """
+        if len(records) == 0:
+            return 0
+
+        query = normalize_query(query)
+        if isinstance(records, pd.DataFrame):
+            frame = records.reindex(columns=RECORD_COLUMNS).astype(object)
+            # Python scalars (and None for missing values) for sqlite3
+            rows = frame.where(frame.notna(), None).to_numpy().tolist()
+            ids = [int(tweet_id) for tweet_id in frame["id"]]
+        else:
+            rows = [[record.get(column) for column in RECORD_COLUMNS] for record in records]
+            ids = [int(record["id"]) for record in records]
+
+        placeholders = ", ".join("?" for _ in RECORD_COLUMNS)
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO tweets ({', '.join(RECORD_COLUMNS)}) VALUES ({placeholders})",
+                rows
+            )
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO query_tweets (query, tweet_id) VALUES (?, ?)",
+                [(query, tweet_id) for tweet_id in ids]
+            )
+            added = conn.total_changes - before
+
+        logger.info(f"Stored {len(records)} posts for '{query}' ({added} new)")
+        return added
+
+    def load(self, query, since_date=None, until_date=None):
+        """Load stored posts for a query as a DataFrame
+
+        Args:
+            query: Search query
+            since_date: Optional start date (YYYY-MM-DD or datetime), inclusive
+            until_date: Optional end date (YYYY-MM-DD or datetime), exclusive
+
+        Returns:
+            DataFrame of raw record columns (RECORD_COLUMNS), newest first
+        """
+        sql = (
+            f"SELECT {', '.join('t.' + c for c in RECORD_COLUMNS)} FROM tweets t "
+            "JOIN query_tweets q ON q.tweet_id = t.id WHERE q.query = ?"
+        )
+        params = [normalize_query(query)]
+        if since_date:
+            sql += " AND t.timestamp >= ?"
+            params.append(_time_bound(since_date))
+        if until_date:
+            sql += " AND t.timestamp < ?"
+            params.append(_time_bound(until_date))
+        sql += " ORDER BY t.id DESC"
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        return pd.DataFrame(rows, columns=RECORD_COLUMNS)
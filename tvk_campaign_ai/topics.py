@@ -0,0 +1,265 @@
+# TVKCampaignAI: Open-Source AI Agent for TVK Political Campaigning Analysis
+# MIT License - Free to use, modify, distribute
+
+import os
+import logging
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linear_sum_assignment
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from .dedupe import SeenIds
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingTopicModel:
+    """Persistent MiniBatchKMeans topic model over a fixed TF-IDF vocabulary
+
+    The vocabulary and IDF weights are frozen when the model is first fit,
+    so later batches of posts land in the same feature space. The initial
+    fit consumes the corpus in shuffled MiniBatchKMeans chunks; afterwards
+    new posts warm-start the existing centroids with the same per-centroid
+    running-mean update, so refreshes do not refit from scratch.
+
+    Every centroid carries a stable topic id. When a model is refit (new
+    vocabulary or cluster count), its centroids are matched to the previous
+    model's and inherit their ids, so topic volumes can be compared across
+    runs. ``drift`` measures how much of a new batch the frozen vocabulary
+    misses compared with the posts it was fit on (``baseline``), so callers
+    can refit once the conversation has moved on. The
+    whole state can be saved to and loaded from an ``.npz`` file.
+    """
+
+    def __init__(self, num_clusters=3, batch_size=1024, random_state=42, max_seen_ids=100000):
+        """
+        Args:
+            num_clusters: Number of topics
+            batch_size: Posts per update chunk
+            random_state: Seed for initialization and chunk order
+            max_seen_ids: Post ids remembered to tell new posts from seen ones
+        """
+        self.num_clusters = num_clusters
+        self.batch_size = batch_size
+        self.random_state = random_state
+        self.vectorizer = None
+        self.centers = None
+        self.counts = None
+        self.topic_ids = None
+        self.next_topic_id = 0
+        self.seen_ids = SeenIds(max_seen_ids)
+        self.baseline = {'oov_share': 0.0, 'empty_share': 0.0}
+        self._rng = np.random.default_rng(random_state)
+
+    @property
+    def terms(self):
+        """Vocabulary of the feature space, aligned with the centroid columns"""
+        return self.vectorizer.get_feature_names_out()
+
+    def transform(self, texts):
+        """Project texts into the model's TF-IDF space"""
+        return self.vectorizer.transform(texts)
+
+    def drift(self, texts):
+        """Measure how poorly the frozen vocabulary covers new posts
+
+        Args:
+            texts: Cleaned texts of the new posts
+
+        Returns:
+            dict: ``oov_share`` (share of tokens outside the vocabulary) and
+            ``empty_share`` (share of posts with no vocabulary term, i.e.
+            all-zero rows)
+        """
+        analyzer = self.vectorizer.build_analyzer()
+        vocabulary = set(self.terms)
+        tokens = known = empty = 0
+        for text in texts:
+            terms = analyzer(text)
+            hits = sum(term in vocabulary for term in terms)
+            tokens += len(terms)
+            known += hits
+            empty += hits == 0
+        return {
+            'oov_share': (tokens - known) / tokens if tokens else 0.0,
+            'empty_share': empty / len(texts) if len(texts) else 0.0
+        }
+
+    def fit(self, X, vectorizer, previous=None, min_similarity=0.3, texts=None):
+        """Fit new centroids on a TF-IDF matrix
+
+        Args:
+            X: TF-IDF matrix of the initial posts
+            vectorizer: Fitted vectorizer that produced ``X`` (kept for new posts)
+            previous: Optional earlier StreamingTopicModel whose topic ids
+                should carry over to matching centroids
+            min_similarity: Minimum centroid cosine similarity for a match
+            texts: Optional cleaned texts behind ``X``, recorded as the
+                ``drift`` baseline
+        """
+        self.vectorizer = vectorizer
+        if texts is not None:
+            self.baseline = self.drift(texts)
+        model = MiniBatchKMeans(
+            n_clusters=self.num_clusters,
+            batch_size=self.batch_size,
+            random_state=self.random_state,
+            n_init=3
+        )
+        order = self._rng.permutation(X.shape[0])
+        # The first chunk initializes the centroids, so it must hold at
+        # least num_clusters posts
+        chunk = max(self.batch_size, self.num_clusters)
+        for start in range(0, X.shape[0], chunk):
+            model.partial_fit(X[order[start:start + chunk]])
+
+        self.centers = model.cluster_centers_.astype(np.float64)
+        self.counts = np.bincount(self.predict_index(X), minlength=self.num_clusters).astype(np.float64)
+        self.topic_ids = np.arange(self.num_clusters)
+        self.next_topic_id = self.num_clusters
+        if previous is not None and previous.centers is not None:
+            self._inherit_topic_ids(previous, min_similarity)
+        return self
+
+    def _inherit_topic_ids(self, previous, min_similarity):
+        """Give centroids the topic ids of their best-matching predecessors"""
+        # Compare centroids on the terms both vocabularies share
+        shared, mine, theirs = np.intersect1d(self.terms, previous.terms, return_indices=True)
+        self.next_topic_id = previous.next_topic_id
+        ids = np.full(self.num_clusters, -1)
+        if len(shared):
+            a = self.centers[:, mine]
+            b = previous.centers[:, theirs]
+            norms = np.linalg.norm(a, axis=1)[:, None] * np.linalg.norm(b, axis=1)[None, :]
+            similarity = (a @ b.T) / np.where(norms > 0, norms, 1)
+            rows, cols = linear_sum_assignment(-similarity)
+            for row, col in zip(rows, cols):
+                if similarity[row, col] >= min_similarity:
+                    ids[row] = previous.topic_ids[col]
+        for row in np.flatnonzero(ids < 0):
+            ids[row] = self.next_topic_id
+            self.next_topic_id += 1
+        logger.info(f"Topic ids after refit: {ids.tolist()} "
+                    f"({int((ids < previous.next_topic_id).sum())} carried over)")
+        self.topic_ids = ids
+
+    def partial_fit(self, X):
+        """Warm-start the centroids with new posts, one chunk at a time
+
+        Each centroid moves to the running mean of every post assigned to
+        it so far (the MiniBatchKMeans update), so a refresh costs one pass
+        over the new posts only.
+        """
+        n_rows = X.shape[0]
+        if n_rows == 0:
+            return self
+        order = self._rng.permutation(n_rows)
+        for start in range(0, n_rows, self.batch_size):
+            chunk = X[order[start:start + self.batch_size]]
+            labels = self.predict_index(chunk)
+            indicator = sparse.csr_matrix(
+                (np.ones(len(labels)), (labels, np.arange(len(labels)))),
+                shape=(self.num_clusters, len(labels))
+            )
+            sums = np.asarray((indicator @ chunk).todense())
+            assigned = np.bincount(labels, minlength=self.num_clusters)
+            totals = self.counts + assigned
+            moved = assigned > 0
+            self.centers[moved] = (
+                self.centers[moved] * self.counts[moved, None] + sums[moved]
+            ) / totals[moved, None]
+            self.counts = totals
+        return self
+
+    def predict_index(self, X):
+        """Nearest centroid row (0..num_clusters-1) for each post"""
+        # argmin ||x - c||^2 = argmin (||c||^2 - 2 x.c); ||x||^2 is constant per post
+        scores = np.asarray(X @ self.centers.T)
+        return np.argmin((self.centers ** 2).sum(axis=1)[None, :] - 2 * scores, axis=1)
+
+    def predict(self, X):
+        """Assign posts (as a TF-IDF matrix) to the stable id of their nearest topic"""
+        return self.topic_ids[self.predict_index(X)]
+
+    def save(self, path):
+        """Write vocabulary, IDF weights, centroids, counts and topic ids to ``path``"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            terms=self.terms.astype(str),
+            idf=self.vectorizer.idf_,
+            stop_words=np.array([self.vectorizer.stop_words or '']),
+            centers=self.centers,
+            counts=self.counts,
+            topic_ids=self.topic_ids,
+            next_topic_id=np.array([self.next_topic_id]),
+            seen_ids=self.seen_ids.to_array(),
+            baseline=np.array([self.baseline['oov_share'], self.baseline['empty_share']]),
+            params=np.array([self.num_clusters, self.batch_size, self.random_state, self.seen_ids.capacity])
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load a model written by ``save``"""
+        with np.load(path, allow_pickle=False) as data:
+            num_clusters, batch_size, random_state, *capacity = (int(v) for v in data['params'])
+            model = cls(num_clusters=num_clusters, batch_size=batch_size, random_state=random_state,
+                        max_seen_ids=capacity[0] if capacity else 100000)
+            vectorizer = TfidfVectorizer(
+                stop_words=str(data['stop_words'][0]) or None,
+                vocabulary=data['terms'].tolist()
+            )
+            vectorizer.idf_ = data['idf']
+            model.vectorizer = vectorizer
+            model.centers = data['centers']
+            model.counts = data['counts']
+            model.topic_ids = data['topic_ids']
+            model.next_topic_id = int(data['next_topic_id'][0])
+            model.seen_ids.add(data['seen_ids'])
+            if 'baseline' in data.files:
+                oov_share, empty_share = (float(v) for v in data['baseline'])
+                model.baseline = {'oov_share': oov_share, 'empty_share': empty_share}
+        logger.info(f"Loaded topic model from {path} ({num_clusters} topics, {len(model.seen_ids)} posts seen)")
+        return model
+
+
+def cluster_top_terms(X, labels, terms, num_clusters, top_n=5):
+    """Label clusters from a sparse per-cluster sum over the feature matrix
+
+    One sparse product of a cluster indicator matrix with ``X`` gives the
+    summed TF-IDF weight of every term in every cluster, so the cost does not
+    grow with the number of clusters the way refitting a vectorizer per
+    cluster does, and the terms come from the clustering vocabulary.
+
+    Args:
+        X: Posts x terms TF-IDF matrix used for clustering
+        labels: Cluster id of each post
+        terms: Term strings aligned with the columns of ``X``
+        num_clusters: Number of clusters
+        top_n: Terms to keep per cluster
+
+    Returns:
+        tuple: (dict of cluster -> top terms, dict of cluster -> {term: mean
+        weight}, array of cluster sizes)
+    """
+    labels = np.asarray(labels)
+    indicator = sparse.csr_matrix(
+        (np.ones(len(labels)), (labels, np.arange(len(labels)))),
+        shape=(num_clusters, len(labels))
+    )
+    sizes = np.bincount(labels, minlength=num_clusters)
+    weights = np.asarray((indicator @ X).todense()) / np.maximum(sizes, 1)[:, None]
+
+    top_n = min(top_n, weights.shape[1])
+    top = np.argsort(-weights, axis=1, kind='stable')[:, :top_n]
+    cluster_terms = {}
+    term_weights = {}
+    for i in range(num_clusters):
+        ranked = [j for j in top[i] if weights[i, j] > 0]
+        cluster_terms[i] = [str(terms[j]) for j in ranked]
+        term_weights[i] = {str(terms[j]): float(weights[i, j]) for j in ranked}
+    return cluster_terms, term_weights, sizes
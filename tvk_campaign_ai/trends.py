@@ -0,0 +1,284 @@
+# TVKCampaignAI: Open-Source AI Agent for TVK Political Campaigning Analysis
+# MIT License - Free to use, modify, distribute
+
+import logging
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from .dedupe import SeenIds
+
+logger = logging.getLogger(__name__)
+
+
+class SpaceSaving:
+    """Space-Saving heavy-hitter summary with a fixed number of counters
+
+    At most ``capacity`` items are tracked. An item that is not tracked
+    enters with the smallest tracked count as its error, and the smallest
+    counters are dropped when the summary overflows, so every count is an
+    overestimate by at most ``total / capacity`` and any item occurring more
+    often than that is guaranteed to be tracked. Updates take whole batches
+    of counts at once.
+    """
+
+    def __init__(self, capacity=1000):
+        """
+        Args:
+            capacity: Maximum number of tracked items
+        """
+        self.capacity = capacity
+        self.counts = pd.Series(dtype='int64')
+        self.errors = pd.Series(dtype='int64')
+        self.total = 0
+
+    def floor(self):
+        """Count given to an untracked item (0 until the summary is full)"""
+        if len(self.counts) < self.capacity:
+            return 0
+        return int(self.counts.min())
+
+    def update(self, counts):
+        """Add a batch of counts
+
+        Args:
+            counts: Series (or dict) of item -> occurrences in the batch
+        """
+        batch = pd.Series(counts, dtype='int64')
+        batch = batch[batch > 0]
+        if batch.empty:
+            return self
+        batch = batch.groupby(level=0).sum()
+
+        floor = self.floor()
+        fresh = batch.index[~batch.index.isin(self.counts.index)]
+        counts = self.counts.add(batch, fill_value=0).astype('int64')
+        counts[fresh] += floor
+        errors = pd.concat([self.errors, pd.Series(floor, index=fresh, dtype='int64')])
+
+        if len(counts) > self.capacity:
+            counts = counts.nlargest(self.capacity)
+        self.counts = counts
+        self.errors = errors.reindex(counts.index)
+        self.total += int(batch.sum())
+        return self
+
+    def top(self, n=20):
+        """Return the ``n`` items with the highest counts as a dict"""
+        return {item: int(count) for item, count in self.counts.nlargest(n).items()}
+
+    def summary(self, n=20):
+        """Top ``n`` items with their count, error bound and guaranteed count"""
+        counts = self.counts.nlargest(n)
+        errors = self.errors.reindex(counts.index)
+        return pd.DataFrame({'count': counts, 'error': errors, 'guaranteed': counts - errors})
+
+
+class CountMinSketch:
+    """Count-Min sketch for approximate counts of arbitrary items
+
+    ``depth`` rows of ``width`` counters; each row hashes an item to one
+    counter. Estimates never undercount and overcount by at most
+    ``e / width * total`` with probability ``1 - exp(-depth)``. Memory is
+    fixed however many distinct items are added.
+    """
+
+    def __init__(self, width=2 ** 16, depth=4, seed=42):
+        """
+        Args:
+            width: Counters per row (rounded up to a power of two)
+            depth: Number of hash rows
+            seed: Seed for the row hash multipliers
+        """
+        bits = max(1, int(np.ceil(np.log2(width))))
+        self.width = 1 << bits
+        self.depth = depth
+        self.table = np.zeros((depth, self.width), dtype=np.int64)
+        self.total = 0
+        self._shift = np.uint64(64 - bits)
+        # Odd multipliers for multiply-shift hashing
+        rng = np.random.default_rng(seed)
+        self._multipliers = rng.integers(1, 2 ** 63, size=depth, dtype=np.uint64) | np.uint64(1)
+
+    def _buckets(self, items):
+        hashed = pd.util.hash_array(np.asarray(items, dtype=object))
+        return (self._multipliers[:, None] * hashed[None, :]) >> self._shift
+
+    def update(self, counts):
+        """Add a batch of counts (Series or dict of item -> occurrences)"""
+        batch = pd.Series(counts, dtype='int64')
+        if batch.empty:
+            return self
+        buckets = self._buckets(batch.index)
+        weights = batch.to_numpy()
+        for row in range(self.depth):
+            self.table[row] += np.bincount(buckets[row], weights=weights, minlength=self.width).astype(np.int64)
+        self.total += int(weights.sum())
+        return self
+
+    def query(self, items):
+        """Estimated counts for a list of items"""
+        if len(items) == 0:
+            return np.zeros(0, dtype=np.int64)
+        buckets = self._buckets(items)
+        return self.table[np.arange(self.depth)[:, None], buckets].min(axis=0)
+
+
+class TrendTracker:
+    """Streaming hashtag and keyword trends in bounded memory
+
+    Each ingested batch of posts updates Space-Saving summaries of hashtags
+    and 1-2-gram keywords (overall and per time window) and Count-Min
+    sketches for point queries of any term. Only the batch is tokenized, so
+    trends stay live over an unbounded stream without re-running TF-IDF on
+    the whole corpus, and memory is fixed by ``capacity``, ``max_windows``
+    and the sketch size.
+
+    Posts are deduplicated on a bounded set of recently ingested post ids,
+    so feeding the same merged frame again, or older posts from a backfill
+    or another shard, counts each post once.
+    """
+
+    def __init__(self, capacity=1000, window='1h', max_windows=48, ngram_range=(1, 2),
+                 stop_words='english', sketch_width=2 ** 16, sketch_depth=4, max_seen_ids=100000):
+        """
+        Args:
+            capacity: Items tracked per Space-Saving summary
+            window: Window length as a pandas frequency string (e.g. '1h', '1D')
+            max_windows: Most recent windows kept for per-window counts
+            ngram_range: Keyword n-gram orders
+            stop_words: Stop word list for keyword tokenization
+            sketch_width: Counters per Count-Min row
+            sketch_depth: Count-Min rows
+            max_seen_ids: Post ids remembered for deduplication
+        """
+        self.capacity = capacity
+        self.window = window
+        self.max_windows = max_windows
+        self.ngram_range = ngram_range
+        self.stop_words = stop_words
+        self.hashtags = SpaceSaving(capacity)
+        self.terms = SpaceSaving(capacity)
+        self.hashtag_sketch = CountMinSketch(sketch_width, sketch_depth)
+        self.term_sketch = CountMinSketch(sketch_width, sketch_depth)
+        self.windows = {}
+        self.posts = 0
+        self.seen_ids = SeenIds(max_seen_ids)
+
+    def _new_posts(self, df):
+        # A clean index keeps the per-window hashtag alignment below valid
+        return df[self.seen_ids.new_mask(df['id'])].reset_index(drop=True)
+
+    def _term_counts(self, texts):
+        """Sparse posts x terms count matrix of a batch and its terms"""
+        vectorizer = CountVectorizer(stop_words=self.stop_words, ngram_range=self.ngram_range)
+        try:
+            X = vectorizer.fit_transform(texts.fillna(''))
+        except ValueError:
+            # Only stop words (or nothing) in this batch
+            return None, None
+        return X.tocsr(), vectorizer.get_feature_names_out()
+
+    def _window(self, start):
+        if start not in self.windows:
+            self.windows[start] = {
+                'posts': 0,
+                'hashtags': SpaceSaving(self.capacity),
+                'terms': SpaceSaving(self.capacity)
+            }
+        return self.windows[start]
+
+    def update(self, df):
+        """Ingest a batch of posts
+
+        Args:
+            df: Frame with ``id``, ``timestamp``, ``hashtags`` and ``cleaned_text``
+
+        Returns:
+            int: Number of new posts counted
+        """
+        batch = self._new_posts(df)
+        if batch.empty:
+            return 0
+
+        tags = batch['hashtags'].explode().dropna()
+        self.hashtags.update(tags.value_counts())
+        self.hashtag_sketch.update(tags.value_counts())
+
+        X, terms = self._term_counts(batch['cleaned_text'])
+        if X is not None:
+            term_counts = pd.Series(np.asarray(X.sum(axis=0)).ravel(), index=terms)
+            self.terms.update(term_counts)
+            self.term_sketch.update(term_counts)
+
+        # Per-window counts: one group-by for hashtags, one sparse product for terms
+        starts = pd.to_datetime(batch['timestamp']).dt.floor(self.window).to_numpy()
+        codes, uniques = pd.factorize(starts)
+        if len(uniques):
+            tag_windows = pd.Series(codes, index=batch.index).loc[tags.index].to_numpy()
+            tag_counts = tags.groupby([tag_windows, tags.to_numpy()]).size()
+            valid = codes >= 0
+            indicator = sparse.csr_matrix(
+                (np.ones(valid.sum()), (codes[valid], np.flatnonzero(valid))),
+                shape=(len(uniques), len(batch))
+            )
+            window_terms = (indicator @ X).tocsr() if X is not None else None
+            posts = np.bincount(codes[valid], minlength=len(uniques))
+            for i, start in enumerate(pd.DatetimeIndex(uniques)):
+                window = self._window(start)
+                window['posts'] += int(posts[i])
+                if i in tag_counts.index.get_level_values(0):
+                    window['hashtags'].update(tag_counts.loc[i])
+                if window_terms is not None:
+                    row = window_terms.getrow(i)
+                    window['terms'].update(pd.Series(row.data.astype(np.int64), index=terms[row.indices]))
+            for start in sorted(self.windows)[:-self.max_windows]:
+                del self.windows[start]
+
+        self.seen_ids.add(batch['id'])
+        self.posts += len(batch)
+        logger.info(f"Trend tracker: {len(batch)} new posts ({self.posts} total, {len(self.windows)} windows)")
+        return len(batch)
+
+    def top(self, n=20, window=None):
+        """Current top keywords and hashtags
+
+        Args:
+            n: Items to return per kind
+            window: Optional window start (Timestamp or string) for that
+                window's counts instead of the overall counts
+
+        Returns:
+            dict: {'keywords': {term: count}, 'hashtags': {tag: count}}
+        """
+        if window is None:
+            return {'keywords': self.terms.top(n), 'hashtags': self.hashtags.top(n)}
+        summary = self.windows.get(pd.Timestamp(window))
+        if summary is None:
+            return {'keywords': {}, 'hashtags': {}}
+        return {'keywords': summary['terms'].top(n), 'hashtags': summary['hashtags'].top(n)}
+
+    def window_counts(self, kind='hashtags', top_n=10):
+        """Counts per window for the overall top items
+
+        Args:
+            kind: 'hashtags' or 'keywords'
+            top_n: Number of overall top items to include
+
+        Returns:
+            DataFrame indexed by window start with one column per item
+        """
+        key = 'terms' if kind == 'keywords' else 'hashtags'
+        items = list(getattr(self, key).top(top_n))
+        starts = sorted(self.windows)
+        rows = [self.windows[start][key].counts.reindex(items, fill_value=0) for start in starts]
+        if not rows:
+            return pd.DataFrame(columns=items, dtype='int64')
+        return pd.DataFrame(rows, index=pd.DatetimeIndex(starts, name='window'))
+
+    def count(self, items, kind='hashtags'):
+        """Approximate overall counts of any items from the Count-Min sketch"""
+        sketch = self.term_sketch if kind == 'keywords' else self.hashtag_sketch
+        return dict(zip(items, sketch.query(list(items)).tolist()))
@@ -3,20 +3,36 @@
 
 import tweepy
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.cluster import KMeans
 import matplotlib.pyplot as plt
 import seaborn as sns
 import networkx as nx
 from graphviz import Digraph
 import pandas as pd
+import numpy as np
 from wordcloud import WordCloud
 import os
 import re
+import math
+import hashlib
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import requests
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import warnings
+
+from .store import TweetStore, RECORD_COLUMNS
+from .cache import ResponseCache
+from .scheduler import RequestScheduler, RateLimitDeferred
+from .checkpoint import CheckpointStore
+from .features import FeatureStore
+from .topics import StreamingTopicModel, cluster_top_terms
+from .trends import TrendTracker
+from .influence import SparseMentionGraph, IncrementalMentionGraph, approximate_betweenness
+from .sentiment import (SentimentCache, LexiconSentimentEngine, TransformerSentimentBackend,
+                        sentiment_labels, score_vader_parallel)
 warnings.filterwarnings('ignore')
 
 # Optional PyTorch integration for advanced sentiment
@@ -33,6 +49,12 @@ logger = logging.getLogger(__name__)
 class TextPreprocessor:
     """Clean and preprocess text data"""
     
+    URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+', flags=re.MULTILINE)
+    SPECIAL_CHAR_PATTERN = re.compile(r'[^\w\s!?.,]')
+    WHITESPACE_PATTERN = re.compile(r'\s+')
+    HASHTAG_PATTERN = re.compile(r'#\w+')
+    MENTION_PATTERN = re.compile(r'@\w+')
+    
     @staticmethod
     def clean_text(text):
         """Remove URLs, mentions, extra whitespace, and normalize text"""
@@ -40,16 +62,16 @@ class TextPreprocessor:
             return ""
         
         # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+        text = TextPreprocessor.URL_PATTERN.sub('', text)
         
         # Remove user mentions (but keep for later analysis)
         # text = re.sub(r'@\w+', '', text)
         
         # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s!?.,]', '', text)
+        text = TextPreprocessor.SPECIAL_CHAR_PATTERN.sub('', text)
         
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = TextPreprocessor.WHITESPACE_PATTERN.sub(' ', text).strip()
         
         return text
     
@@ -58,7 +80,7 @@ class TextPreprocessor:
         """Extract hashtags from text"""
         if not isinstance(text, str):
             return []
-        hashtags = re.findall(r'#\w+', text)
+        hashtags = TextPreprocessor.HASHTAG_PATTERN.findall(text)
         return [h.lower() for h in hashtags]
     
     @staticmethod
@@ -66,14 +88,81 @@ class TextPreprocessor:
         """Extract user mentions from text"""
         if not isinstance(text, str):
             return []
-        mentions = re.findall(r'@\w+', text)
+        mentions = TextPreprocessor.MENTION_PATTERN.findall(text)
         return [m.lower() for m in mentions]
+    
+    # Single-pass patterns for process_batch: everything clean_text strips
+    # (URLs, then special characters) in one alternation, and hashtags and
+    # mentions in one scan
+    STRIP_PATTERN = re.compile(r'http\S+|www\S+|https\S+|[^\w\s!?.,]')
+    TAG_PATTERN = re.compile(r'[#@]\w+')
+    
+    @staticmethod
+    def _process_texts(texts):
+        """Clean and tokenize a list of texts in one pass each (pool worker)"""
+        strip = TextPreprocessor.STRIP_PATTERN.sub
+        find_tags = TextPreprocessor.TAG_PATTERN.findall
+        cleaned, hashtags, mentions = [], [], []
+        for text in texts:
+            if not isinstance(text, str):
+                cleaned.append("")
+                hashtags.append([])
+                mentions.append([])
+                continue
+            # str.split() collapses whitespace runs and strips the ends
+            cleaned.append(' '.join(strip('', text).split()))
+            # Lowercase each match, not the text: lowercasing can change
+            # lengths (İ) and context-dependent letters (final sigma)
+            tags = find_tags(text)
+            hashtags.append([t.lower() for t in tags if t[0] == '#'])
+            mentions.append([t.lower() for t in tags if t[0] == '@'])
+        return cleaned, hashtags, mentions
+    
+    @staticmethod
+    def process_batch(texts, workers=None, pool_threshold=50000, chunk_size=10000):
+        """Clean texts and extract hashtags and mentions in a single pass
+        
+        Produces the same results as calling clean_text, extract_hashtags and
+        extract_mentions on every text, with one scan per output instead of
+        five regex passes.
+        
+        Args:
+            texts: Iterable of texts (non-strings give empty results)
+            workers: Processes to use above ``pool_threshold`` texts
+                (default: CPU count); 1 disables the process pool
+            pool_threshold: Minimum batch size worth the process start-up cost
+            chunk_size: Texts per task sent to a worker process
+        
+        Returns:
+            tuple: (cleaned texts, hashtag lists, mention lists), aligned with ``texts``
+        """
+        texts = list(texts)
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(texts) < pool_threshold:
+            return TextPreprocessor._process_texts(texts)
+        
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        cleaned, hashtags, mentions = [], [], []
+        # fetch_batch runs this inside thread-pool workers, and forking a
+        # multi-threaded process can deadlock, so never use 'fork'
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                 mp_context=multiprocessing.get_context(method)) as executor:
+            for part in executor.map(TextPreprocessor._process_texts, chunks):
+                cleaned.extend(part[0])
+                hashtags.extend(part[1])
+                mentions.extend(part[2])
+        return cleaned, hashtags, mentions
 
 
 class TVKCampaignAI:
     """Main AI agent for TVK political campaign analysis"""
     
-    def __init__(self, consumer_key, consumer_secret, access_token, access_token_secret, bearer_token=None):
+    def __init__(self, consumer_key=None, consumer_secret=None, access_token=None, access_token_secret=None,
+                 bearer_token=None, store_path=None, cache_path=None, cache_ttl=300, backend=None,
+                 scheduler=None, checkpoint_dir=None, checkpoint_every=5, sentiment_cache_path=None,
+                 sentiment_model=None, topic_model_path=None, trend_tracker=None,
+                 influence_graph_path=None, http_pool_size=8):
         """Initialize the agent with API credentials
         
         Args:
@@ -82,12 +171,111 @@ class TVKCampaignAI:
             access_token: X API Access Token
             access_token_secret: X API Access Token Secret
             bearer_token: Optional Bearer Token for v2 API (helpful for free tier)
+            store_path: Optional SQLite file for persisting fetched posts. When set,
+                fetches are incremental (only posts newer than the stored since_id)
+                and results are merged with previously stored posts.
+            cache_path: Optional SQLite file for caching search responses on disk
+            cache_ttl: Seconds a cached search response stays valid
+            backend: Optional fetch backend providing ``create_clients()`` (e.g.
+                ReplayBackend). When set, credentials are not required and the
+                backend's clients replace the live X API clients.
+            scheduler: Optional RequestScheduler (token buckets per endpoint and
+                monthly quota ledger). Defaults to one with the standard limits.
+            checkpoint_dir: Optional directory for resumable fetch checkpoints
+            checkpoint_every: Pages between checkpoint writes
+            sentiment_cache_path: Optional SQLite file caching sentiment scores
+                by text hash across runs
+            sentiment_model: Optional local model directory (or a
+                TransformerSentimentBackend) for analyze_sentiment(engine='transformer');
+                requires PyTorch and transformers
+            topic_model_path: Optional .npz file persisting the streaming topic
+                model (vocabulary, centroids, topic ids) between runs, so
+                refreshes warm-start it and topic ids stay stable
+            trend_tracker: Optional TrendTracker. When set, every fetch feeds
+                its new posts into it and detect_trends reads the streaming
+                counts instead of running TF-IDF over the whole corpus
+            influence_graph_path: Optional .npz file persisting a rolling,
+                time-decayed mention graph (IncrementalMentionGraph) across
+                fetches; see update_influence_graph
+            http_pool_size: Connections kept open per host on the shared HTTP
+                session; fetch_batch runs at most this many requests at once
+                without opening throwaway connections
         """
+        # Rate limits are handled by the scheduler instead of tweepy sleeping
+        # inside the request thread
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler()
+        
+        if backend is not None:
+            self.api, self.client_v2 = backend.create_clients(wait_on_rate_limit=False)
+            logger.info(f"Using {type(backend).__name__} fetch backend")
+        else:
+            self._authenticate(consumer_key, consumer_secret, access_token, access_token_secret, bearer_token)
+        
+        # Size the shared connection pools once for concurrent fetches
+        self.http_pool_size = http_pool_size
+        self._http_adapter = requests.adapters.HTTPAdapter(pool_connections=http_pool_size,
+                                                           pool_maxsize=http_pool_size)
+        for client in (getattr(self, 'api', None), getattr(self, 'client_v2', None)):
+            if client is not None and hasattr(client, 'session'):
+                client.session.mount('https://', self._http_adapter)
+        
+        self.sia = SentimentIntensityAnalyzer()
+        self.preprocessor = TextPreprocessor()
+        self.df = None
+        self.results = {}
+        self.store = TweetStore(store_path) if store_path else None
+        self.cache = ResponseCache(cache_path, ttl=cache_ttl) if cache_path else None
+        self.checkpoints = CheckpointStore(checkpoint_dir) if checkpoint_dir else None
+        self.checkpoint_every = checkpoint_every
+        self.sentiment_cache = SentimentCache(sentiment_cache_path) if sentiment_cache_path else None
+        self._lexicon_engine = None
+        self.sentiment_model = sentiment_model
+        self.features = FeatureStore()
+        self.topic_model = None
+        self._cluster_features = None
+        self._cluster_projection = None
+        self.topic_model_path = topic_model_path
+        if topic_model_path and os.path.exists(topic_model_path):
+            try:
+                self.topic_model = StreamingTopicModel.load(topic_model_path)
+            except Exception as e:
+                logger.warning(f"Could not load topic model from {topic_model_path}: {e}")
+        self.minibatch_threshold = 10000
+        # Refit the topic model when this much more of the new posts falls
+        # outside its vocabulary than of the posts it was fit on
+        self.topic_drift_threshold = 0.2
+        self.topic_drift_min_posts = 50
+        self.trend_tracker = trend_tracker
+        self.influencer_centralities = ('degree',)
+        self.sparse_graph_threshold = 100000
+        self._influencer_cache = None
+        self.influence_graph = None
+        self.influence_graph_path = influence_graph_path
+        if influence_graph_path:
+            try:
+                if os.path.exists(influence_graph_path):
+                    self.influence_graph = IncrementalMentionGraph.load(influence_graph_path)
+                else:
+                    self.influence_graph = IncrementalMentionGraph()
+            except Exception as e:
+                logger.warning(f"Could not load influence graph from {influence_graph_path}: {e}")
+                self.influence_graph = IncrementalMentionGraph()
+        self.output_dir = "tvk_campaign_output"
+        os.makedirs(self.output_dir, exist_ok=True)
+        
+        # Set style for visualizations
+        plt.style.use('seaborn-v0_8-darkgrid')
+        sns.set_palette("husl")
+        
+        logger.info("TVKCampaignAI initialized successfully")
+    
+    def _authenticate(self, consumer_key, consumer_secret, access_token, access_token_secret, bearer_token):
+        """Build the live X API v1.1 and v2 clients"""
         try:
             # Initialize v1.1 client
             auth = tweepy.OAuthHandler(consumer_key, consumer_secret)
             auth.set_access_token(access_token, access_token_secret)
-            self.api = tweepy.API(auth, wait_on_rate_limit=True)
+            self.api = tweepy.API(auth, wait_on_rate_limit=False)
             
             # Initialize v2 client (can use OAuth or Bearer token)
             self.client_v2 = tweepy.Client(
@@ -96,28 +284,16 @@ class TVKCampaignAI:
                 consumer_secret=consumer_secret,
                 access_token=access_token,
                 access_token_secret=access_token_secret,
-                wait_on_rate_limit=True
+                wait_on_rate_limit=False
             )
             
             logger.info("X API authentication successful (v1.1 + v2)")
         except Exception as e:
             logger.error(f"Authentication failed: {e}")
             raise
-        
-        self.sia = SentimentIntensityAnalyzer()
-        self.preprocessor = TextPreprocessor()
-        self.df = None
-        self.results = {}
-        self.output_dir = "tvk_campaign_output"
-        os.makedirs(self.output_dir, exist_ok=True)
-        
-        # Set style for visualizations
-        plt.style.use('seaborn-v0_8-darkgrid')
-        sns.set_palette("husl")
-        
-        logger.info("TVKCampaignAI initialized successfully")
     
-    def fetch_data(self, query, count=100, since_date=None, until_date=None, use_v2=False):
+    def fetch_data(self, query, count=100, since_date=None, until_date=None, use_v2=False,
+                   shards=None, shard_concurrency=4):
         """Fetch real-time X posts with filters
         
         Args:
@@ -126,6 +302,96 @@ class TVKCampaignAI:
             since_date: Start date (YYYY-MM-DD)
             until_date: End date (YYYY-MM-DD)
             use_v2: If True, use v2 API (for free tier). If False, try v1.1 first.
+            shards: Optional number of time windows to split the date range into
+                for the v2 fetch. Shards are fetched in parallel and ``count``
+                is spread evenly across them.
+            shard_concurrency: Maximum number of shards fetched at the same time
+        """
+        df = self._fetch_frame(query, count, since_date, until_date, use_v2,
+                               shards=shards, shard_concurrency=shard_concurrency)
+        if df is None:
+            return None
+        
+        self.df = df
+        if self.df.empty:
+            logger.warning("No data fetched. Check query or API limits.")
+            return None
+        
+        if self.trend_tracker is not None:
+            self.trend_tracker.update(self.df)
+        
+        return self.df
+    
+    def fetch_batch(self, queries, count=100, since_date=None, until_date=None, use_v2=True,
+                    max_concurrency=8, combine=False):
+        """Fetch several queries concurrently
+        
+        Queries share the agent's clients (one HTTP connection pool), cache,
+        store, rate-limit handling and monthly quota. At most
+        ``max_concurrency`` queries are in flight at once; keep it at or below
+        ``http_pool_size`` so every request reuses a pooled connection.
+        
+        Args:
+            queries: List of search queries
+            count: Number of tweets to fetch per query
+            since_date: Start date (YYYY-MM-DD)
+            until_date: End date (YYYY-MM-DD)
+            use_v2: If True, use v2 API (for free tier). If False, try v1.1 first.
+            max_concurrency: Maximum number of queries fetched at the same time
+            combine: If True, return one DataFrame tagged with a ``query``
+                column and make it the agent's current data
+        
+        Returns:
+            dict of query -> DataFrame (None for failed/empty queries), or the
+            combined DataFrame when ``combine`` is True
+        """
+        return asyncio.run(self.fetch_batch_async(
+            queries, count=count, since_date=since_date, until_date=until_date,
+            use_v2=use_v2, max_concurrency=max_concurrency, combine=combine
+        ))
+    
+    async def fetch_batch_async(self, queries, count=100, since_date=None, until_date=None, use_v2=True,
+                                max_concurrency=8, combine=False):
+        """Coroutine version of ``fetch_batch`` for callers already inside an event loop"""
+        queries = list(dict.fromkeys(queries))
+        logger.info(f"Fetching {len(queries)} queries (max {max_concurrency} concurrent)")
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def fetch_one(query):
+            async with semaphore:
+                df = await asyncio.to_thread(self._fetch_frame, query, count, since_date, until_date, use_v2)
+                return None if df is None or df.empty else df
+        
+        frames = await asyncio.gather(*(fetch_one(query) for query in queries))
+        results = dict(zip(queries, frames))
+        
+        fetched = sum(df is not None for df in frames)
+        logger.info(f"Batch fetch complete: {fetched}/{len(queries)} queries returned data")
+        
+        if not combine:
+            return results
+        
+        tagged = [df.assign(query=query) for query, df in results.items() if df is not None]
+        if not tagged:
+            logger.warning("No data fetched for any query in the batch")
+            return None
+        self.df = pd.concat(tagged, ignore_index=True)
+        
+        if self.trend_tracker is not None:
+            self.trend_tracker.update(self.df)
+        
+        return self.df
+    
+    def _fetch_frame(self, query, count, since_date, until_date, use_v2, shards=None, shard_concurrency=4):
+        """Fetch one query into a new DataFrame without touching ``self.df``
+        
+        If the scheduler defers a request (rate limit or monthly quota), the
+        posts collected so far are kept and ``df.attrs['fetch_status']``
+        records that the fetch is incomplete and when it can be retried.
+        
+        Returns:
+            DataFrame (empty if nothing matched), or None on API errors
         """
         try:
             if since_date is None:
@@ -135,197 +401,790 @@ class TVKCampaignAI:
             logger.info(f"Fetching data for query: '{query}'")
             logger.info(f"Parameters: count={count}, since={since_date}, use_v2={use_v2}")
             
-            tweets = []
-            
-            # Try v1.1 first unless explicitly told to use v2
-            if not use_v2:
-                try:
-                    logger.info("Attempting to fetch with v1.1 API...")
-                    cursor = tweepy.Cursor(
-                        self.api.search_tweets,
-                        q=query,
-                        lang="en",
-                        since=since_date,
-                        until=until_date,
-                        tweet_mode="extended"
-                    ).items(count)
-                    
-                    for tweet in cursor:
-                        try:
-                            tweets.append({
-                                "id": tweet.id,
-                                "text": tweet.full_text,
-                                "author": tweet.user.screen_name,
-                                "author_name": tweet.user.name,
-                                "author_followers": tweet.user.followers_count,
-                                "likes": tweet.favorite_count,
-                                "retweets": tweet.retweet_count,
-                                "replies": tweet.reply_count,
-                                "engagement": tweet.favorite_count + tweet.retweet_count,
-                                "timestamp": tweet.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                                "hashtags": self.preprocessor.extract_hashtags(tweet.full_text),
-                                "mentions": self.preprocessor.extract_mentions(tweet.full_text),
-                                "location": tweet.user.location if hasattr(tweet.user, 'location') else None
-                            })
-                        except Exception as e:
-                            logger.warning(f"Error processing tweet {tweet.id}: {e}")
-                            continue
-                    
-                    logger.info("Successfully fetched with v1.1 API")
-                    
-                except tweepy.Unauthorized as e:
-                    logger.warning("v1.1 API not available, falling back to v2 API")
-                    use_v2 = True  # Fallback to v2
-                except Exception as e:
-                    logger.warning(f"v1.1 API error: {e}, falling back to v2 API")
-                    use_v2 = True  # Fallback to v2
-            
-            # Use v2 API (for free tier or as fallback)
-            if use_v2 or len(tweets) == 0:
-                try:
-                    logger.info("Fetching with v2 API (free tier compatible)...")
-                    
-                    # v2 API has different parameters
-                    max_results = min(count, 100)  # v2 max is 100 per request
-                    
-                    # Convert date format for v2
-                    # v2 uses ISO format or specific date format
-                    start_time = None
-                    if since_date:
-                        try:
-                            start_time = datetime.strptime(since_date, "%Y-%m-%d")
-                            start_time = start_time.isoformat() + "Z"
-                        except:
-                            start_time = None
-                    
-                    # Fetch with v2 API
-                    response = self.client_v2.search_recent_tweets(
-                        query=query,
-                        max_results=max_results,
-                        tweet_fields=['created_at', 'public_metrics', 'author_id', 'text'],
-                        user_fields=['username', 'name', 'public_metrics', 'location'],
-                        expansions=['author_id'],
-                        start_time=start_time
-                    )
-                    
-                    if response and hasattr(response, 'data') and response.data:
-                        # Get users for mapping
-                        users_dict = {}
-                        if hasattr(response, 'includes') and hasattr(response.includes, 'users'):
-                            for user in response.includes.users:
-                                users_dict[user.id] = user
-                        
-                        for tweet in response.data:
-                            try:
-                                # Get user info
-                                user = users_dict.get(tweet.author_id)
-                                author_username = user.username if user else "unknown"
-                                author_name = user.name if user else "unknown"
-                                # v2 API has public_metrics object for user
-                                user_metrics = user.public_metrics if hasattr(user, 'public_metrics') else {}
-                                author_followers = user_metrics.get('followers_count', 0) if isinstance(user_metrics, dict) else 0
-                                location = user.location if user and hasattr(user, 'location') else None
-                                
-                                # Get metrics
-                                metrics = tweet.public_metrics if hasattr(tweet, 'public_metrics') else {}
-                                likes = metrics.get('like_count', 0)
-                                retweets = metrics.get('retweet_count', 0)
-                                replies = metrics.get('reply_count', 0)
-                                
-                                tweets.append({
-                                    "id": tweet.id,
-                                    "text": tweet.text,
-                                    "author": author_username,
-                                    "author_name": author_name,
-                                    "author_followers": author_followers,
-                                    "likes": likes,
-                                    "retweets": retweets,
-                                    "replies": replies,
-                                    "engagement": likes + retweets,
-                                    "timestamp": tweet.created_at.strftime("%Y-%m-%d %H:%M:%S") if hasattr(tweet.created_at, 'strftime') else str(tweet.created_at),
-                                    "hashtags": self.preprocessor.extract_hashtags(tweet.text),
-                                    "mentions": self.preprocessor.extract_mentions(tweet.text),
-                                    "location": location
-                                })
-                            except Exception as e:
-                                logger.warning(f"Error processing tweet {tweet.id}: {e}")
-                                continue
-                        
-                        logger.info("Successfully fetched with v2 API")
-                    else:
-                        logger.warning("No data in v2 API response")
-                        
-                except tweepy.TooManyRequests:
-                    logger.error("Rate limit exceeded. Please wait and try again later.")
+            segments = []
+            deferred = None
+            state = self.store.get_fetch_state(query) if self.store is not None else {}
+            since_id = state.get('since_id')
+            
+            # First fill the gap an earlier fetch left when it stopped at
+            # ``count``, then ask for posts newer than what is already stored
+            if state.get('gap_until_id'):
+                logger.info(f"Filling gap: requesting posts between ids {since_id} and {state['gap_until_id']}")
+                segment, deferred, low_water_id, use_v2 = self._fetch_segment(
+                    query, count, since_date, until_date, use_v2, since_id, until_id=state['gap_until_id']
+                )
+                if segment is None:
                     return None
-                except tweepy.TweepyException as e:
-                    logger.error(f"v2 API error: {e}")
+                segments.append(segment)
+                if self.store is not None:
+                    self.store.upsert(query, segment)
+                    state = self.store.update_fetch_state(
+                        query, segment['id'].tolist(), low_water_id is None and deferred is None,
+                        filling_gap=True, low_water_id=low_water_id
+                    )
+                    since_id = state['since_id']
+            
+            fetched = sum(len(segment) for segment in segments)
+            if not state.get('gap_until_id') and deferred is None and fetched < count:
+                if since_id:
+                    logger.info(f"Incremental fetch: requesting posts newer than id {since_id}")
+                segment, deferred, low_water_id, use_v2 = self._fetch_segment(
+                    query, count - fetched, since_date, until_date, use_v2, since_id,
+                    shards=shards, shard_concurrency=shard_concurrency
+                )
+                if segment is None:
                     return None
+                segments.append(segment)
+                fetched += len(segment)
+                if self.store is not None:
+                    self.store.upsert(query, segment)
+                    # A deferred first fetch keeps no state, so it is retried from the top
+                    if since_id or deferred is None:
+                        self.store.update_fetch_state(
+                            query, segment['id'].tolist(), low_water_id is None and deferred is None,
+                            low_water_id=low_water_id
+                        )
+            
+            if self.store is not None:
+                # Merge with stored posts (deduplicated on tweet id)
+                df = self.store.load(query, since_date=since_date, until_date=until_date)
+            elif len(segments) == 1:
+                df = segments[0]
+            else:
+                df = pd.concat(segments, ignore_index=True)
             
-            self.df = pd.DataFrame(tweets)
+            df.attrs['fetch_status'] = {
+                'complete': deferred is None,
+                'fetched': fetched,
+                'retry_at': deferred.retry_at if deferred else None,
+                'reason': deferred.reason if deferred else None
+            }
             
-            if self.df.empty:
-                logger.warning("No data fetched. Check query or API limits.")
-                return None
+            if df.empty:
+                return df
             
-            # Preprocess text
-            self.df['cleaned_text'] = self.df['text'].apply(self.preprocessor.clean_text)
+            df = self._build_frame(df)
             
-            logger.info(f"Successfully fetched {len(self.df)} posts")
-            return self.df
+            logger.info(f"Successfully fetched {len(df)} posts for '{query}'")
+            if self.cache is not None:
+                logger.info(f"Response cache: {self.cache.stats()}")
+            return df
                 
         except Exception as e:
             logger.error(f"Error fetching data: {e}")
             return None
     
-    def analyze_sentiment(self):
-        """Classify posts as positive/negative/neutral using VADER"""
+    def _fetch_segment(self, query, count, since_date, until_date, use_v2, since_id, until_id=None,
+                       shards=None, shard_concurrency=4):
+        """Fetch up to ``count`` posts between ``since_id`` and ``until_id``
+        
+        Tries v1.1 first unless ``use_v2`` is set, falling back to v2.
+        
+        Returns:
+            tuple: (DataFrame of raw record columns or None on API errors,
+            RateLimitDeferred or None, id below which posts may be missing or
+            None if pagination ran out, use_v2 after any fallback)
+        """
+        pages = []
+        deferred = None
+        low_water_id = None
+        
+        # Try v1.1 first unless explicitly told to use v2
+        if not use_v2:
+            try:
+                logger.info("Attempting to fetch with v1.1 API...")
+                if not self._collect_pages('v1.1', pages, query, count, since_date, until_date, since_id,
+                                           until_id=until_id):
+                    low_water_id = min(min(page['id']) for page in pages if page['id'])
+                logger.info("Successfully fetched with v1.1 API")
+                
+            except RateLimitDeferred as e:
+                deferred = e
+                logger.warning(f"v1.1 fetch stopped after {self._page_count(pages)} posts: {e}")
+            except tweepy.Unauthorized as e:
+                logger.warning("v1.1 API not available, falling back to v2 API")
+                use_v2 = True  # Fallback to v2
+            except Exception as e:
+                logger.warning(f"v1.1 API error: {e}, falling back to v2 API")
+                use_v2 = True  # Fallback to v2
+        
+        # Use v2 API (for free tier or as fallback)
+        if use_v2 or self._page_count(pages) == 0:
+            # A v1.1 deferral that returned nothing is superseded by the v2 fetch
+            deferred = None
+            low_water_id = None
+            try:
+                logger.info("Fetching with v2 API (free tier compatible)...")
+                
+                if shards and shards > 1 and until_id is None:
+                    low_water_id, error = self._collect_sharded(pages, query, count, since_date, until_date,
+                                                                since_id, shards, shard_concurrency)
+                    if error is not None:
+                        raise error
+                elif not self._collect_pages('v2', pages, query, count, since_date, until_date, since_id,
+                                             until_id=until_id):
+                    low_water_id = min(min(page['id']) for page in pages if page['id'])
+                
+                if self._page_count(pages):
+                    logger.info("Successfully fetched with v2 API")
+                elif since_id:
+                    logger.info("No new posts since last fetch")
+                else:
+                    logger.warning("No data in v2 API response")
+                    
+            except RateLimitDeferred as e:
+                deferred = e
+                logger.warning(f"v2 fetch stopped after {self._page_count(pages)} posts: {e}")
+            except tweepy.TweepyException as e:
+                logger.error(f"v2 API error: {e}")
+                return None, None, None, use_v2
+        
+        return self._pages_frame(pages), deferred, low_water_id, use_v2
+    
+    @staticmethod
+    def _page_count(pages):
+        """Number of posts in a list of column-wise pages"""
+        return sum(len(page['id']) for page in pages)
+    
+    @staticmethod
+    def _merge_pages(pages):
+        """Join column-wise pages into one page"""
+        return {column: [value for page in pages for value in page[column]] for column in RECORD_COLUMNS}
+    
+    @staticmethod
+    def _pages_frame(pages):
+        """Build one DataFrame of raw record columns from column-wise pages"""
+        return pd.DataFrame(TVKCampaignAI._merge_pages(pages), columns=RECORD_COLUMNS)
+    
+    @staticmethod
+    def _as_page(records):
+        """Column-wise page for checkpointed records (older checkpoints hold one dict per post)"""
+        if isinstance(records, dict):
+            return {column: list(records.get(column, [])) for column in RECORD_COLUMNS}
+        return {column: [record.get(column) for record in records] for column in RECORD_COLUMNS}
+    
+    @staticmethod
+    def _page_records(page):
+        """One dict per post for a column-wise page"""
+        return [dict(zip(page, values)) for values in zip(*page.values())]
+    
+    def _build_frame(self, df):
+        """Derive the analysis columns for a frame of raw post records
+        
+        Timestamps are parsed to ``datetime64`` (naive UTC) in one call, and
+        hashtags, mentions and cleaned text come from a single
+        ``TextPreprocessor.process_batch`` pass over the whole batch.
+        """
+        cleaned, hashtags, mentions = self.preprocessor.process_batch(df['text'])
+        df['timestamp'] = pd.to_datetime(
+            df['timestamp'], utc=True, format='ISO8601', errors='coerce'
+        ).dt.tz_convert(None)
+        position = df.columns.get_loc('timestamp') + 1
+        df.insert(position, 'hashtags', pd.Series(hashtags, index=df.index, dtype=object))
+        df.insert(position + 1, 'mentions', pd.Series(mentions, index=df.index, dtype=object))
+        df['cleaned_text'] = cleaned
+        return df
+    
+    def _collect_pages(self, api_version, out, query, count, since_date, until_date, since_id, until_id=None):
+        """Append pages from one API version to ``out``, checkpointing as it goes
+        
+        Pages are column-wise: a dict of ``RECORD_COLUMNS`` lists, so the
+        fetched frame is built once from columns rather than per post.
+        
+        With checkpoints enabled, the pagination cursor and the records
+        collected so far are saved every ``checkpoint_every`` pages and when
+        pagination fails, and an earlier checkpoint for the same fetch is
+        resumed. Checkpoints are keyed on the query, API version and the
+        segment's lower bound (``since_id``, else ``since_date``) only: a
+        deferred fetch of posts newer than ``since_id`` leaves a gap whose
+        fill is the same segment continued, so the gap-fill call resumes it,
+        with the upper bounds the saved cursor was issued for. ``out`` keeps
+        every page collected before an exception.
+        
+        Returns:
+            bool: True if pagination ran out before ``count`` posts (nothing
+            is left in the range), False if it stopped at ``count``
+        """
+        key = None
+        cursor = None
+        collected = []
+        if self.checkpoints is not None:
+            lower_bound = {'since_id': since_id} if since_id else {'since': since_date}
+            key = CheckpointStore.make_key(api_version, query, **lower_bound)
+            state = self.checkpoints.load(key)
+            if state:
+                cursor = state['cursor']
+                # A cursor is only valid with the bounds it was issued for
+                bounds = state.get('bounds') or {}
+                until_date = bounds.get('until_date', until_date)
+                until_id = bounds.get('until_id', until_id)
+                page = self._as_page(state['records'])
+                collected.append(page)
+                out.append(page)
+                logger.info(f"Resuming {api_version} fetch from checkpoint ({len(page['id'])} posts collected)")
+                if cursor is None:
+                    # The checkpointed fetch had reached its last page
+                    self.checkpoints.clear(key)
+                    return True
+        
+        if api_version == 'v1.1':
+            if cursor is None and until_id:
+                cursor = int(until_id) - 1
+            pages = self._iter_v1_pages(query, count - self._page_count(collected), since_date, until_date, since_id,
+                                        max_id=cursor)
+        else:
+            pages = self._iter_v2_pages(query, count - self._page_count(collected), since_date, since_id,
+                                        next_token=cursor, until_date=until_date, until_id=until_id)
+        
+        bounds = {'until_date': until_date, 'until_id': until_id}
+        try:
+            for page_num, (page, cursor) in enumerate(pages, 1):
+                collected.append(page)
+                out.append(page)
+                if key is not None and page_num % self.checkpoint_every == 0:
+                    self.checkpoints.save(key, cursor, self._merge_pages(collected), bounds)
+        except Exception:
+            if key is not None and self._page_count(collected):
+                self.checkpoints.save(key, cursor, self._merge_pages(collected), bounds)
+                logger.info(f"Checkpointed {api_version} fetch at {self._page_count(collected)} posts; "
+                            f"a later call will resume")
+            raise
+        
+        if key is not None:
+            self.checkpoints.clear(key)
+        # The page iterators only stop short of ``count`` when results run out
+        return self._page_count(collected) < count
+    
+    def schedule_fetch(self, query, count=100, since_date=None, until_date=None, use_v2=True):
+        """Queue a fetch to start once the search endpoint has rate-limit budget
+        
+        The wait happens in the scheduler's background thread rather than the
+        caller's, so a UI can show the estimated start time and stay responsive.
+        
+        Returns:
+            ScheduledRequest: Future resolving to the fetched DataFrame (or None),
+            with an ``estimated_start`` Unix timestamp
+        """
+        endpoint = 'search_recent_tweets' if use_v2 else 'search_tweets'
+        cost = max(1, math.ceil(count / 100))
+        job = self.scheduler.submit(
+            endpoint, self._fetch_frame, query, count, since_date, until_date, use_v2, cost=cost
+        )
+        start = datetime.fromtimestamp(job.estimated_start).strftime("%Y-%m-%d %H:%M:%S")
+        logger.info(f"Queued fetch for '{query}' ({cost} requests), estimated start {start}")
+        return job
+    
+    def iter_v1_pages(self, query, count=100, since_date=None, until_date=None, since_id=None):
+        """Stream posts from the v1.1 search endpoint one page at a time
+        
+        Pages backwards through results with ``max_id`` until ``count`` posts
+        have been yielded or no results remain.
+        
+        Args:
+            query: Search query
+            count: Maximum number of posts to yield in total
+            since_date: Start date (YYYY-MM-DD)
+            until_date: End date (YYYY-MM-DD)
+            since_id: Only return posts newer than this tweet id
+        
+        Yields:
+            list: Post records (same shape as ``fetch_data`` rows) for one page
+        """
+        for page, _ in self._iter_v1_pages(query, count, since_date, until_date, since_id):
+            yield self._page_records(page)
+    
+    def _iter_v1_pages(self, query, count, since_date=None, until_date=None, since_id=None, max_id=None):
+        """Yield (page, max_id for the next page) pairs, optionally resuming at ``max_id``"""
+        fetched = 0
+        page_num = 0
+        
+        while fetched < count:
+            # v1.1 returns at most 100 results per request
+            page, max_id = self._search_v1_page(
+                q=query,
+                count=min(self._page_budget(count - fetched), 100),
+                lang="en",
+                since=since_date,
+                until=until_date,
+                since_id=since_id,
+                max_id=max_id,
+                tweet_mode="extended"
+            )
+            page_num += 1
+            
+            if not page['id']:
+                break
+            
+            if len(page['id']) > count - fetched:
+                page = {column: values[:count - fetched] for column, values in page.items()}
+            fetched += len(page['id'])
+            logger.info(f"v1.1 page {page_num}: {len(page['id'])} posts ({fetched}/{count})")
+            yield page, max_id
+            
+            if max_id is None:
+                break
+    
+    def iter_v2_pages(self, query, count=100, since_date=None, since_id=None):
+        """Stream posts from the v2 recent search endpoint one page at a time
+        
+        Follows ``next_token`` until ``count`` posts have been yielded or the
+        endpoint runs out of results, so callers can start processing the
+        first page while later pages are still being requested.
+        
+        Args:
+            query: Search query
+            count: Maximum number of posts to yield in total
+            since_date: Start date (YYYY-MM-DD)
+            since_id: Only return posts newer than this tweet id
+        
+        Yields:
+            list: Post records (same shape as ``fetch_data`` rows) for one page
+        
+        Raises:
+            RateLimitDeferred: When the next page cannot be requested yet; pages
+                already yielded remain valid
+        """
+        for page, _ in self._iter_v2_pages(query, count, since_date, since_id):
+            yield self._page_records(page)
+    
+    def _iter_v2_pages(self, query, count, since_date=None, since_id=None, next_token=None, until_date=None,
+                       until_id=None):
+        """Yield (page, next_token) pairs, optionally resuming at ``next_token``
+        
+        ``until_id`` limits results to posts older than that id.
+        """
+        # Convert dates for v2 (ISO 8601, UTC)
+        start_time = None
+        if since_date and not since_id:
+            start_time = self._to_v2_time(since_date)
+        end_time = None
+        if until_date:
+            end_time = self._to_v2_time(until_date)
+            # Recent search rejects end times less than 10 seconds in the past
+            latest = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=30)
+            if end_time is not None and datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%SZ") > latest:
+                end_time = None
+        
+        fetched = 0
+        page_num = 0
+        
+        while fetched < count:
+            # v2 accepts between 10 and 100 results per request
+            max_results = max(10, min(self._page_budget(count - fetched), 100))
+            
+            page, next_token = self._search_v2_page(
+                query=query,
+                max_results=max_results,
+                tweet_fields=['created_at', 'public_metrics', 'author_id', 'text'],
+                user_fields=['username', 'name', 'public_metrics', 'location'],
+                expansions=['author_id'],
+                start_time=start_time,
+                end_time=end_time,
+                since_id=since_id,
+                until_id=until_id,
+                next_token=next_token
+            )
+            page_num += 1
+            
+            if not page['id']:
+                break
+            
+            if len(page['id']) > count - fetched:
+                page = {column: values[:count - fetched] for column, values in page.items()}
+            fetched += len(page['id'])
+            logger.info(f"v2 page {page_num}: {len(page['id'])} posts ({fetched}/{count})")
+            yield page, next_token
+            
+            if not next_token:
+                break
+    
+    @staticmethod
+    def _to_v2_time(value):
+        """Convert a YYYY-MM-DD / ISO 8601 string or datetime to a v2 timestamp (UTC), or None"""
+        if not isinstance(value, datetime):
+            # Datetime bounds come back from checkpoints as ISO 8601 strings
+            try:
+                value = datetime.fromisoformat(str(value))
+            except ValueError:
+                return None
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+    
+    @staticmethod
+    def _snowflake_time(tweet_id):
+        """Creation time (naive UTC) encoded in a tweet id"""
+        return datetime(1970, 1, 1) + timedelta(milliseconds=(int(tweet_id) >> 22) + 1288834974657)
+    
+    def plan_time_shards(self, since_date=None, until_date=None, shards=4, since_id=None, grid_minutes=15):
+        """Split a date range into equal, contiguous time windows for v2 search
+        
+        Open-ended bounds (now, 7 days ago, the since_id time) are snapped
+        to a ``grid_minutes`` grid, so repeated calls plan the same windows
+        and their checkpoints can be resumed. Posts newer than the last grid
+        line are left for the next incremental fetch.
+        
+        Args:
+            since_date: Start date (YYYY-MM-DD or datetime); defaults to 7 days ago
+            until_date: End date (YYYY-MM-DD or datetime); defaults to now
+            shards: Number of windows
+            since_id: If given, the range starts no earlier than this tweet's
+                creation time (everything older is already stored)
+            grid_minutes: Grid the open-ended bounds are snapped to
+        
+        Returns:
+            list of (start, end) naive UTC datetimes, oldest first
+        """
+        grid = timedelta(minutes=grid_minutes)
+        epoch = datetime(1970, 1, 1)
+        
+        def floor(moment):
+            return epoch + (moment - epoch) // grid * grid
+        
+        now = floor(datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=30))
+        start = datetime.strptime(self._to_v2_time(since_date), "%Y-%m-%dT%H:%M:%SZ") if since_date else None
+        end = datetime.strptime(self._to_v2_time(until_date), "%Y-%m-%dT%H:%M:%SZ") if until_date else None
+        if start is None:
+            # Round up so the window stays inside the 7-day search limit
+            start = floor(now - timedelta(days=7)) + grid
+        if end is None or end > now:
+            end = now
+        if since_id:
+            # Rounding down only re-requests posts that are already stored
+            start = max(start, floor(self._snowflake_time(since_id)))
+        if end <= start:
+            return []
+        
+        shards = max(1, int(shards))
+        step = (end - start) / shards
+        bounds = [start + step * i for i in range(shards)] + [end]
+        return [(bounds[i], bounds[i + 1]) for i in range(shards)]
+    
+    def _collect_sharded(self, out, query, count, since_date, until_date, since_id, shards, max_concurrency):
+        """Fetch v2 time shards in parallel and append the merged posts to ``out``
+        
+        Each shard pages through its own window (with its own checkpoint) and
+        draws on the shared scheduler budget. Results are deduplicated on
+        tweet id and merged newest first, keeping at most ``count`` posts
+        (each shard asks for at least 10). Posts from shards that finished
+        are kept even if another shard was deferred or failed.
+        
+        Returns:
+            tuple: (id below which posts may be missing, or None if every
+            shard ran out of results; the first shard error or None)
+        """
+        windows = self.plan_time_shards(since_date, until_date, shards, since_id=since_id)
+        if not windows:
+            return None, None
+        per_shard = max(10, math.ceil(count / len(windows)))
+        logger.info(f"Fetching {len(windows)} time shards of up to {per_shard} posts "
+                    f"({windows[0][0]:%Y-%m-%d %H:%M} to {windows[-1][1]:%Y-%m-%d %H:%M} UTC)")
+        
+        shard_pages = [[] for _ in windows]
+        exhausted = [False] * len(windows)
+        error = None
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(windows))) as executor:
+            futures = [
+                executor.submit(self._collect_pages, 'v2', shard_pages[i], query, per_shard, start, end, None)
+                for i, (start, end) in enumerate(windows)
+            ]
+            for i, future in enumerate(futures):
+                try:
+                    exhausted[i] = future.result()
+                except Exception as e:
+                    error = error or e
+        
+        merged = self._pages_frame([page for pages in shard_pages for page in pages])
+        ordered = merged.drop_duplicates('id', keep='last').sort_values('id', ascending=False, kind='stable')
+        out.append(ordered.head(count).to_dict('list'))
+        logger.info(f"Merged {len(ordered)} posts from {len(windows)} shards, keeping {min(len(ordered), count)}")
+        
+        # Shards stopped early have holes below their oldest post; everything
+        # newer than the newest such shard's oldest post is complete
+        low_water_id = None
+        incomplete = [i for i, done in enumerate(exhausted) if not done]
+        if incomplete:
+            newer = [tweet_id for pages in shard_pages[incomplete[-1]:] for page in pages for tweet_id in page['id']]
+            if newer:
+                low_water_id = int(min(newer))
+            elif len(ordered):
+                low_water_id = int(ordered['id'].max()) + 1
+        if len(ordered) > count:
+            # The dropped posts are older than the oldest one kept
+            low_water_id = max(low_water_id or 0, int(ordered['id'].iloc[count - 1]))
+        return low_water_id, error
+    
+    def _page_budget(self, wanted):
+        """Limit a page request to what is left of the monthly post quota"""
+        remaining = self.scheduler.quota_remaining()
+        if remaining is None:
+            return wanted
+        return max(1, min(wanted, remaining))
+    
+    def _search_v1_page(self, q, **params):
+        """Request one v1.1 search page (cached when enabled)
+        
+        Returns:
+            tuple: (column-wise page, max_id for the next page or None)
+        """
+        key = None
+        if self.cache is not None:
+            key = ResponseCache.make_key('search_tweets', q, **params)
+            cached = self.cache.get(key)
+            # Entries cached before pages were column-wise are refetched
+            if cached is not None and 'page' in cached:
+                return cached['page'], cached['max_id']
+        
+        self.scheduler.acquire('search_tweets')
+        # Concurrent fetches share the monthly quota, so the page is paid
+        # for before it is requested and settled once its size is known
+        requested = params.get('count', 15)
+        reserved = self.scheduler.reserve_posts('search_tweets', requested)
+        if reserved < requested:
+            params['count'] = reserved
+        try:
+            results = self.api.search_tweets(q=q, **params)
+        except tweepy.TooManyRequests as e:
+            self.scheduler.settle_posts(reserved, 0)
+            retry_at = self.scheduler.rate_limited('search_tweets', getattr(e, 'reset_time', None))
+            raise RateLimitDeferred('search_tweets', retry_at) from e
+        except Exception:
+            self.scheduler.settle_posts(reserved, 0)
+            raise
+        
+        page = self._v1_page(results)
+        max_id = min(page['id']) - 1 if page['id'] else None
+        self.scheduler.settle_posts(reserved, len(page['id']))
+        
+        if key is not None:
+            self.cache.set(key, {'page': page, 'max_id': max_id})
+        return page, max_id
+    
+    def _search_v2_page(self, query, **params):
+        """Request one v2 search page (cached when enabled)
+        
+        Returns:
+            tuple: (column-wise page, next_token or None)
+        """
+        key = None
+        if self.cache is not None:
+            key = ResponseCache.make_key('search_recent_tweets', query, **params)
+            cached = self.cache.get(key)
+            if cached is not None and 'page' in cached:
+                return cached['page'], cached['next_token']
+        
+        self.scheduler.acquire('search_recent_tweets')
+        requested = params.get('max_results', 10)
+        reserved = self.scheduler.reserve_posts('search_recent_tweets', requested)
+        if reserved < requested:
+            # v2 pages hold at least 10 posts; any excess is charged on settling
+            params['max_results'] = max(10, reserved)
+        try:
+            response = self.client_v2.search_recent_tweets(query=query, **params)
+        except tweepy.TooManyRequests as e:
+            self.scheduler.settle_posts(reserved, 0)
+            retry_at = self.scheduler.rate_limited('search_recent_tweets', getattr(e, 'reset_time', None))
+            raise RateLimitDeferred('search_recent_tweets', retry_at) from e
+        except Exception:
+            self.scheduler.settle_posts(reserved, 0)
+            raise
+        
+        page = self._v2_page(response.data if response else None, response.includes if response else None)
+        next_token = (response.meta or {}).get('next_token') if response and response.data else None
+        self.scheduler.settle_posts(reserved, len(page['id']))
+        
+        if key is not None:
+            self.cache.set(key, {'page': page, 'next_token': next_token})
+        return page, next_token
+    
+    @staticmethod
+    def _v2_page(tweets, includes=None):
+        """Build the record columns of one v2 search page from its tweets
+        
+        Every column is read in one pass over the tweets' JSON payloads, with
+        authors resolved from the expanded users; no per-post record is built.
+        """
+        tweets = [tweet.data for tweet in tweets or []]
+        users = {str(user.id): user.data for user in (includes or {}).get('users', [])}
+        authors = [users.get(str(tweet.get('author_id'))) or {} for tweet in tweets]
+        metrics = [tweet.get('public_metrics') or {} for tweet in tweets]
+        likes = [m.get('like_count', 0) for m in metrics]
+        retweets = [m.get('retweet_count', 0) for m in metrics]
+        return {
+            'id': [int(tweet['id']) for tweet in tweets],
+            'text': [tweet.get('text') for tweet in tweets],
+            'author': [author.get('username', 'unknown') for author in authors],
+            'author_name': [author.get('name', 'unknown') for author in authors],
+            'author_followers': [(author.get('public_metrics') or {}).get('followers_count', 0) for author in authors],
+            'likes': likes,
+            'retweets': retweets,
+            'replies': [m.get('reply_count', 0) for m in metrics],
+            'engagement': [like + retweet for like, retweet in zip(likes, retweets)],
+            # Raw ISO 8601 strings; parsed for the whole batch in _build_frame
+            'timestamp': [tweet.get('created_at') for tweet in tweets],
+            'location': [author.get('location') for author in authors]
+        }
+    
+    @staticmethod
+    def _v1_page(statuses):
+        """Build the record columns of one v1.1 search page from its Status objects"""
+        users = [status.user for status in statuses]
+        likes = [status.favorite_count for status in statuses]
+        retweets = [status.retweet_count for status in statuses]
+        return {
+            'id': [status.id for status in statuses],
+            'text': [status.full_text for status in statuses],
+            'author': [user.screen_name for user in users],
+            'author_name': [user.name for user in users],
+            'author_followers': [user.followers_count for user in users],
+            'likes': likes,
+            'retweets': retweets,
+            # Standard search statuses carry no reply count
+            'replies': [getattr(status, 'reply_count', 0) for status in statuses],
+            'engagement': [like + retweet for like, retweet in zip(likes, retweets)],
+            'timestamp': [status.created_at.isoformat() for status in statuses],
+            'location': [getattr(user, 'location', None) for user in users]
+        }
+    
+    def analyze_sentiment(self, engine='vader', validate=False, workers=None, pool_threshold=20000):
+        """Classify posts as positive/negative/neutral
+        
+        Each distinct cleaned text is scored once (retweets and copy-pasted
+        posts share a score), and scores are reused from the sentiment cache
+        when one is configured.
+        
+        Args:
+            engine: 'vader' (stock VADER, one post at a time), 'lexicon'
+                (vectorized VADER-lexicon engine for large corpora) or
+                'transformer' (batched CPU model set with ``sentiment_model``)
+            validate: With the 'lexicon' engine, also score a sample with stock
+                VADER and store the agreement in results['sentiment_validation']
+            workers: Processes for the 'vader' engine (default: CPU count);
+                1 keeps scoring in-process
+            pool_threshold: Minimum number of distinct texts to score before a
+                process pool is used; smaller frames are scored in-process
+        """
         if self.df is None or self.df.empty:
             logger.warning("No data available for sentiment analysis")
             return None
         
-        logger.info("Performing sentiment analysis...")
+        if engine == 'transformer' and not PYTORCH_AVAILABLE:
+            logger.error("The transformer sentiment engine requires PyTorch")
+            return None
+        if engine == 'transformer' and self.sentiment_model is None:
+            logger.error("Set sentiment_model to a local model directory to use the transformer engine")
+            return None
         
-        def get_sentiment(text):
-            scores = self.sia.polarity_scores(text)
-            compound = scores['compound']
-            
-            if compound > 0.05:
-                return 'positive'
-            elif compound < -0.05:
-                return 'negative'
-            else:
-                return 'neutral'
+        logger.info(f"Performing sentiment analysis ({engine})...")
         
-        self.df['sentiment'] = self.df['cleaned_text'].apply(get_sentiment)
-        self.df['sentiment_score'] = self.df['cleaned_text'].apply(
-            lambda x: self.sia.polarity_scores(x)['compound']
-        )
+        codes, unique_texts = pd.factorize(self.df['cleaned_text'].fillna(''))
+        unique_texts = list(unique_texts)
+        scores = self._score_texts(unique_texts, engine, workers, pool_threshold)
+        
+        self.df['sentiment_score'] = scores[codes]
+        self.df['sentiment'] = sentiment_labels(self.df['sentiment_score'])
+        
+        if validate and engine == 'lexicon':
+            validation = self._get_lexicon_engine().validate(unique_texts)
+            self.results['sentiment_validation'] = validation
+            logger.info(f"Lexicon engine agreement with VADER: {validation}")
         
         sentiment_counts = self.df['sentiment'].value_counts()
         self.results['sentiment'] = sentiment_counts.to_dict()
         
-        logger.info(f"Sentiment analysis complete: {sentiment_counts.to_dict()}")
+        logger.info(f"Sentiment analysis complete: {sentiment_counts.to_dict()} "
+                    f"({len(unique_texts)} distinct texts scored for {len(self.df)} posts)")
         return sentiment_counts
     
-    def detect_trends(self, top_n=20):
-        """Extract top keywords and hashtags using TF-IDF"""
+    def _get_lexicon_engine(self):
+        """Build the vectorized lexicon engine on first use"""
+        if self._lexicon_engine is None:
+            self._lexicon_engine = LexiconSentimentEngine(self.sia)
+        return self._lexicon_engine
+    
+    def _get_transformer_backend(self):
+        """Load the transformer sentiment backend on first use"""
+        if not isinstance(self.sentiment_model, TransformerSentimentBackend):
+            self.sentiment_model = TransformerSentimentBackend(self.sentiment_model)
+        return self.sentiment_model
+    
+    def _score_texts(self, texts, engine='vader', workers=None, pool_threshold=20000):
+        """Return compound scores for distinct texts, using the sentiment cache"""
+        if engine not in ('vader', 'lexicon', 'transformer'):
+            raise ValueError(f"Unknown sentiment engine: {engine}")
+        # Cache entries are namespaced per engine (and per model)
+        cache_engine = self._get_transformer_backend().name if engine == 'transformer' else engine
+        
+        scores = np.zeros(len(texts))
+        pending = list(range(len(texts)))
+        keys = None
+        
+        if self.sentiment_cache is not None:
+            keys = [SentimentCache.make_key(text, cache_engine) for text in texts]
+            cached = self.sentiment_cache.get_many(keys)
+            pending = []
+            for i, key in enumerate(keys):
+                if key in cached:
+                    scores[i] = cached[key]
+                else:
+                    pending.append(i)
+        
+        if engine == 'lexicon':
+            if pending:
+                scores[pending] = self._get_lexicon_engine().score([texts[i] for i in pending])
+        elif engine == 'transformer':
+            if pending:
+                scores[pending] = self._get_transformer_backend().score([texts[i] for i in pending])
+        else:
+            workers = workers or os.cpu_count() or 1
+            if workers > 1 and len(pending) >= pool_threshold:
+                # VADER is pure Python, so threads would serialize on the GIL
+                logger.info(f"Scoring {len(pending)} texts with {workers} worker processes")
+                scores[pending] = score_vader_parallel([texts[i] for i in pending], workers)
+            else:
+                for i in pending:
+                    scores[i] = self.sia.polarity_scores(texts[i])['compound']
+        
+        if keys is not None:
+            self.sentiment_cache.set_many({keys[i]: scores[i] for i in pending})
+            logger.info(f"Sentiment cache: {self.sentiment_cache.stats()}")
+        return scores
+    
+    def _tfidf_view(self, max_features=None, min_df=1, ngram_range=(1, 1)):
+        """TF-IDF matrix and terms for the current posts from the shared feature store
+        
+        The posts are tokenized once per distinct ``self.df``; trends,
+        clustering and the cluster plot each take the column view they need.
+        """
+        return self.features.fit(self.df['cleaned_text']).tfidf(
+            max_features=max_features, min_df=min_df, ngram_range=ngram_range
+        )
+    
+    def detect_trends(self, top_n=20, streaming=None):
+        """Extract top keywords and hashtags using TF-IDF
+        
+        Args:
+            top_n: Number of keywords and hashtags to keep
+            streaming: Read keyword and hashtag counts from the streaming
+                TrendTracker (``self.trend_tracker``, created if missing)
+                after feeding it any new posts, instead of scoring the
+                whole corpus with TF-IDF. Defaults to True when a tracker
+                is set.
+        """
         if self.df is None or self.df.empty:
             logger.warning("No data available for trend detection")
             return None
         
+        if streaming is None:
+            streaming = self.trend_tracker is not None
+        if streaming:
+            return self._detect_streaming_trends(top_n)
+        
         logger.info("Detecting trends...")
         
         # TF-IDF analysis
         try:
-            vectorizer = TfidfVectorizer(
-                stop_words='english',
-                max_features=top_n,
-                ngram_range=(1, 2),
-                min_df=2
-            )
-            tfidf_matrix = vectorizer.fit_transform(self.df['cleaned_text'])
-            feature_names = vectorizer.get_feature_names_out()
+            tfidf_matrix, feature_names = self._tfidf_view(max_features=top_n, min_df=2, ngram_range=(1, 2))
             
             # Get top keywords
             scores = tfidf_matrix.sum(axis=0).A1
@@ -334,6 +1193,7 @@ class TVKCampaignAI:
             keyword_scores = [scores[i] for i in top_indices]
             
             self.results['top_keywords'] = dict(zip(top_keywords, keyword_scores))
+            self.results['keyword_metric'] = 'tfidf'
             logger.info(f"Top keywords: {top_keywords[:10]}")
             
         except Exception as e:
@@ -341,11 +1201,7 @@ class TVKCampaignAI:
             top_keywords = []
         
         # Hashtag analysis
-        all_hashtags = []
-        for hashtags in self.df['hashtags']:
-            all_hashtags.extend(hashtags)
-        
-        hashtag_counts = pd.Series(all_hashtags).value_counts()
+        hashtag_counts = self.df['hashtags'].explode().dropna().value_counts()
         top_hashtags = hashtag_counts.head(top_n).to_dict()
         self.results['top_hashtags'] = top_hashtags
         
@@ -356,49 +1212,119 @@ class TVKCampaignAI:
             'hashtags': self.results.get('top_hashtags', {})
         }
     
-    def cluster_topics(self, num_clusters=3):
-        """Group posts into topics using K-Means"""
+    def _detect_streaming_trends(self, top_n):
+        """Fill the trend results from the streaming TrendTracker"""
+        logger.info("Detecting trends (streaming)...")
+        
+        try:
+            if self.trend_tracker is None:
+                self.trend_tracker = TrendTracker()
+            self.trend_tracker.update(self.df)
+            
+            top = self.trend_tracker.top(top_n)
+            self.results['top_keywords'] = top['keywords']
+            self.results['keyword_metric'] = 'count'
+            self.results['top_hashtags'] = top['hashtags']
+            self.results['trend_windows'] = self.trend_tracker.window_counts('hashtags', top_n=10)
+            
+            logger.info(f"Top keywords: {list(top['keywords'])[:10]}")
+            logger.info(f"Top hashtags: {list(top['hashtags'])[:10]}")
+        except Exception as e:
+            logger.error(f"Error in streaming trend detection: {e}")
+            return None
+        
+        return {
+            'keywords': self.results.get('top_keywords', {}),
+            'hashtags': self.results.get('top_hashtags', {})
+        }
+    
+    def cluster_topics(self, num_clusters=3, method='auto', max_features=100, batch_size=1024, update=None):
+        """Group posts into topics using K-Means
+        
+        Args:
+            num_clusters: Number of topics (capped at the number of distinct posts)
+            method: 'kmeans' (full K-Means), 'minibatch' (persistent streaming
+                model, see StreamingTopicModel) or 'auto' (minibatch when a
+                topic model exists or from ``self.minibatch_threshold`` posts)
+            max_features: Vocabulary size of the clustering feature space
+            batch_size: Posts per MiniBatchKMeans chunk
+            update: Warm-start the existing topic model (``self.topic_model``)
+                with posts it has not seen yet instead of refitting. Defaults
+                to True when a model with ``num_clusters`` topics exists. A
+                refit keeps the topic ids of matching previous topics.
+                Updates turn into a refit when at least
+                ``self.topic_drift_min_posts`` new posts drift more than
+                ``self.topic_drift_threshold`` from the frozen vocabulary.
+        """
         if self.df is None or self.df.empty:
             logger.warning("No data available for topic clustering")
             return None
         
-        logger.info(f"Clustering topics into {num_clusters} groups...")
+        previous = self.topic_model
+        if update is None:
+            update = previous is not None and previous.num_clusters == num_clusters
+        if method == 'auto':
+            method = 'minibatch' if previous is not None or len(self.df) >= self.minibatch_threshold else 'kmeans'
         
         try:
-            # Adjust clusters based on data size
-            if len(self.df) < num_clusters:
-                num_clusters = max(1, len(self.df) - 1)
+            # More clusters than distinct posts would leave clusters empty
+            distinct = self.df['cleaned_text'].nunique()
+            if distinct < num_clusters:
+                num_clusters = max(1, distinct)
                 logger.warning(f"Adjusting clusters to {num_clusters} based on data size")
             
-            vectorizer = TfidfVectorizer(
-                stop_words='english',
-                max_features=100,
-                min_df=2
-            )
-            X = vectorizer.fit_transform(self.df['cleaned_text'])
-            
-            kmeans = KMeans(n_clusters=num_clusters, random_state=42, n_init=10)
-            self.df['cluster'] = kmeans.fit_predict(X)
-            
-            # Get representative terms for each cluster
-            cluster_terms = {}
-            for i in range(num_clusters):
-                cluster_texts = self.df[self.df['cluster'] == i]['cleaned_text']
-                if len(cluster_texts) > 0:
-                    cluster_vectorizer = TfidfVectorizer(
-                        stop_words='english',
-                        max_features=5
-                    )
-                    try:
-                        cluster_tfidf = cluster_vectorizer.fit_transform(cluster_texts)
-                        terms = cluster_vectorizer.get_feature_names_out()
-                        cluster_terms[i] = terms.tolist()
-                    except:
-                        cluster_terms[i] = []
+            if method == 'minibatch' and update and previous is not None:
+                new_posts = previous.seen_ids.new_mask(self.df['id'])
+                if new_posts.sum() >= self.topic_drift_min_posts:
+                    # A frozen vocabulary misses new terms; refit once it
+                    # covers the new posts much worse than the fitted ones
+                    drift = previous.drift(self.df['cleaned_text'][new_posts])
+                    if any(drift[k] - previous.baseline[k] > self.topic_drift_threshold for k in drift):
+                        logger.info(f"Topic vocabulary drifted ({drift} vs {previous.baseline}), refitting")
+                        update = False
+            
+            if method == 'minibatch' and update and previous is not None:
+                model = previous
+                num_clusters = model.num_clusters
+                logger.info(f"Updating topic model ({num_clusters} clusters) with new posts...")
+                
+                X = model.transform(self.df['cleaned_text'])
+                terms = model.terms
+                model.partial_fit(X[new_posts])
+                model.seen_ids.add(self.df['id'][new_posts])
+            elif method == 'minibatch':
+                logger.info(f"Clustering topics into {num_clusters} groups (minibatch)...")
+                X, terms = self._tfidf_view(max_features=max_features, min_df=2)
+                model = StreamingTopicModel(num_clusters=num_clusters, batch_size=batch_size)
+                model.fit(X, self.features.vectorizer(max_features=max_features, min_df=2), previous=previous,
+                          texts=self.df['cleaned_text'])
+                model.seen_ids.add(self.df['id'])
+                self.topic_model = model
+            else:
+                logger.info(f"Clustering topics into {num_clusters} groups...")
+                X, terms = self._tfidf_view(max_features=max_features, min_df=2)
+                kmeans = KMeans(n_clusters=num_clusters, random_state=42, n_init=10)
+                model = None
+            
+            if model is not None:
+                index = model.predict_index(X)
+                topic_ids = model.topic_ids
+                if self.topic_model_path:
+                    model.save(self.topic_model_path)
+            else:
+                index = kmeans.fit_predict(X)
+                topic_ids = np.arange(num_clusters)
+            self.df['cluster'] = topic_ids[index]
+            self._cluster_features = X
+            
+            # Representative terms for every cluster in one sparse pass
+            cluster_terms, term_weights, sizes = cluster_top_terms(X, index, terms, num_clusters)
             
             self.results['clusters'] = {
                 'cluster_counts': self.df['cluster'].value_counts().to_dict(),
-                'cluster_terms': cluster_terms
+                'cluster_terms': {int(topic_ids[i]): value for i, value in cluster_terms.items()},
+                'cluster_term_weights': {int(topic_ids[i]): value for i, value in term_weights.items()},
+                'cluster_sizes': {int(topic_ids[i]): int(size) for i, size in enumerate(sizes)}
             }
             
             logger.info("Topic clustering complete")
@@ -408,61 +1334,140 @@ class TVKCampaignAI:
             logger.error(f"Error in clustering: {e}")
             return None
     
-    def map_influencers(self):
-        """Build network graphs for users based on mentions/replies"""
+    @staticmethod
+    def _mention_edges(df):
+        """Aggregate mentions into weighted (source, target) edges
+        
+        Returns:
+            DataFrame with ``source``, ``target`` and ``weight`` (number of
+            mentions of ``target`` by ``source``)
+        """
+        mentions = df[['author', 'mentions']].explode('mentions').dropna()
+        edges = pd.DataFrame({
+            'source': mentions['author'].to_numpy(),
+            'target': mentions['mentions'].str.lstrip('@').to_numpy()
+        })
+        return edges.groupby(['source', 'target'], sort=False).size().reset_index(name='weight')
+    
+    @staticmethod
+    def _build_mention_graph(df, backend='networkx'):
+        """Bulk-load the author -> mentioned-user graph of a frame of posts
+        
+        Authors carry the follower, like and retweet counts of their first
+        post; repeated mentions accumulate in the edge ``weight``.
+        
+        Args:
+            df: Frame of posts
+            backend: 'networkx' (DiGraph), 'sparse' (SparseMentionGraph) or
+                'auto' (sparse from ``sparse_threshold`` users)
+        """
+        authors = df.dropna(subset=['author']).drop_duplicates('author')
+        edges = TVKCampaignAI._mention_edges(df)
+        if backend == 'sparse':
+            return SparseMentionGraph.from_edges(edges, authors)
+        
+        G = nx.DiGraph()
+        G.add_nodes_from(
+            (author, {'followers': followers, 'likes': likes, 'retweets': retweets})
+            for author, followers, likes, retweets in zip(
+                authors['author'], authors['author_followers'], authors['likes'], authors['retweets']
+            )
+        )
+        G.add_weighted_edges_from(zip(edges['source'], edges['target'], edges['weight']))
+        return G
+    
+    def _influencer_fingerprint(self):
+        """Hash the columns the influencer graph is built from"""
+        attributes = pd.util.hash_pandas_object(
+            self.df[['author', 'author_followers', 'likes', 'retweets']], index=False
+        ).to_numpy()
+        mentions = pd.util.hash_pandas_object(self.df['mentions'].str.join(' '), index=False).to_numpy()
+        return hashlib.sha1(attributes.tobytes() + mentions.tobytes()).hexdigest()
+    
+    def map_influencers(self, refresh=False, centralities=None, top_n=10, betweenness_k=500,
+                        betweenness_seed=42, betweenness_budget=None, backend='auto'):
+        """Build network graphs for users based on mentions/replies
+        
+        The graph and its centrality scores are cached on the agent, keyed
+        by a fingerprint of the posts, so visualization and reports reuse
+        them; new data invalidates the cache.
+        
+        Every requested centrality is ranked in
+        ``results['influencer_rankings']``; ``results['top_influencers']``
+        holds the degree ranking (or the first requested one).
+        
+        Args:
+            refresh: Rebuild even if the cached graph matches the current data
+            centralities: Centralities to rank by, from 'degree', 'in_degree',
+                'pagerank' (weighted), 'hubs', 'authorities' (HITS) and
+                'betweenness' (default: ``self.influencer_centralities``).
+                Betweenness is O(V*E) when exact, so it is opt-in, and it
+                needs the networkx backend.
+            top_n: Users kept per ranking
+            betweenness_k: Sample sources for approximate betweenness
+                (exact when the graph has at most this many users; None
+                for always exact)
+            betweenness_seed: Seed for choosing the sample sources
+            betweenness_budget: Optional seconds after which betweenness
+                sampling stops early and uses the sources processed so far
+            backend: 'networkx' (DiGraph), 'sparse' (SparseMentionGraph, a
+                CSR adjacency matrix with vectorized centralities) or 'auto'
+                (sparse from ``self.sparse_graph_threshold`` users)
+        
+        Returns:
+            nx.DiGraph or SparseMentionGraph
+        """
         if self.df is None or self.df.empty:
             logger.warning("No data available for influencer mapping")
             return None
         
-        logger.info("Mapping influencer network...")
+        centralities = tuple(centralities or self.influencer_centralities)
         
         try:
-            G = nx.DiGraph()
-            
-            for _, row in self.df.iterrows():
-                author = row['author']
-                
-                # Add author as node with attributes
-                if not G.has_node(author):
-                    G.add_node(
-                        author,
-                        followers=row['author_followers'],
-                        likes=row['likes'],
-                        retweets=row['retweets']
-                    )
-                
-                # Add edges for mentions
-                mentions = row['mentions']
-                for mention in mentions:
-                    mention_clean = mention.replace('@', '')
-                    if not G.has_node(mention_clean):
-                        G.add_node(mention_clean)
-                    G.add_edge(author, mention_clean, weight=1)
+            fingerprint = self._influencer_fingerprint()
+            cached = self._influencer_cache
+            if backend == 'auto':
+                # Mentions carry '@'; graph nodes are bare handles (see _mention_edges)
+                mentioned = self.df['mentions'].explode().dropna().str.lstrip('@')
+                users = pd.unique(pd.concat([self.df['author'], mentioned]))
+                backend = 'sparse' if len(users) >= self.sparse_graph_threshold else 'networkx'
+            if (not refresh and cached is not None and cached['fingerprint'] == fingerprint
+                    and cached['backend'] == backend):
+                logger.info("Reusing cached influencer network")
+            else:
+                logger.info(f"Mapping influencer network ({backend} backend)...")
+                cached = {
+                    'fingerprint': fingerprint,
+                    'backend': backend,
+                    'graph': self._build_mention_graph(self.df, backend),
+                    'scores': {}
+                }
+                self._influencer_cache = cached
+            G = cached['graph']
             
             if len(G.nodes) == 0:
                 logger.warning("No nodes to visualize")
                 return None
             
             # Calculate centrality metrics
-            try:
-                degree_centrality = nx.degree_centrality(G)
-                betweenness_centrality = nx.betweenness_centrality(G)
-                top_influencers = sorted(
-                    degree_centrality.items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                )[:10]
-                
-                self.results['top_influencers'] = [
-                    {'user': user, 'centrality': score}
-                    for user, score in top_influencers
-                ]
-                
-                logger.info(f"Top influencers: {[u[0] for u in top_influencers[:5]]}")
-                
-            except Exception as e:
-                logger.warning(f"Could not calculate centrality: {e}")
-                self.results['top_influencers'] = []
+            rankings = {}
+            for name in centralities:
+                key = (name, betweenness_k, betweenness_seed, betweenness_budget) if name == 'betweenness' else name
+                try:
+                    if key not in cached['scores']:
+                        scores = self._centrality(G, name, betweenness_k, betweenness_seed, betweenness_budget)
+                        if name == 'betweenness':
+                            scores = {key: scores['betweenness']}
+                        cached['scores'].update(scores)
+                    top = cached['scores'][key].nlargest(top_n)
+                    rankings[name] = [{'user': user, 'centrality': float(score)} for user, score in top.items()]
+                except Exception as e:
+                    logger.warning(f"Could not calculate {name} centrality: {e}")
+                    rankings[name] = []
+            
+            self.results['influencer_rankings'] = rankings
+            self.results['top_influencers'] = rankings.get('degree', rankings[centralities[0]] if centralities else [])
+            logger.info(f"Top influencers: {[u['user'] for u in self.results['top_influencers'][:5]]}")
             
             return G
             
@@ -470,6 +1475,85 @@ class TVKCampaignAI:
             logger.error(f"Error in influencer mapping: {e}")
             return None
     
+    @staticmethod
+    def _centrality(G, name, betweenness_k=500, betweenness_seed=42, betweenness_budget=None):
+        """Compute a centrality measure on a DiGraph or SparseMentionGraph
+        
+        Returns:
+            dict of measure name -> Series of user -> score (HITS fills both
+            'hubs' and 'authorities')
+        """
+        if isinstance(G, SparseMentionGraph):
+            if name == 'degree':
+                return {name: G.series(G.degree())}
+            if name == 'in_degree':
+                return {name: G.series(G.in_degree())}
+            if name == 'pagerank':
+                return {name: G.series(G.pagerank())}
+            if name in ('hubs', 'authorities'):
+                hubs, authorities = G.hits()
+                return {'hubs': G.series(hubs), 'authorities': G.series(authorities)}
+            if name == 'betweenness':
+                raise ValueError("Betweenness needs the networkx backend")
+        else:
+            if name == 'degree':
+                return {name: pd.Series(nx.degree_centrality(G))}
+            if name == 'in_degree':
+                return {name: pd.Series(nx.in_degree_centrality(G))}
+            if name == 'pagerank':
+                return {name: pd.Series(nx.pagerank(G, weight='weight'))}
+            if name in ('hubs', 'authorities'):
+                hubs, authorities = nx.hits(G)
+                return {'hubs': pd.Series(hubs), 'authorities': pd.Series(authorities)}
+            if name == 'betweenness':
+                scores, sources = approximate_betweenness(
+                    G, k=betweenness_k, seed=betweenness_seed, time_budget=betweenness_budget
+                )
+                logger.info(f"Betweenness from {sources} of {len(G)} users as sources")
+                return {name: pd.Series(scores)}
+        raise ValueError(f"Unknown centrality: {name}")
+    
+    def update_influence_graph(self, top_n=10):
+        """Apply new posts to the rolling influence graph and re-rank users
+        
+        Only posts the graph has not seen are added, edge weights decay with
+        the graph's half-life, and PageRank is warm-started from the previous
+        scores, so a refresh costs work proportional to the new posts rather
+        than a rebuild. The ranking is stored in ``results['rolling_influencers']``
+        and the graph is saved to ``influence_graph_path`` when set.
+        
+        Args:
+            top_n: Users to keep in the ranking
+        """
+        if self.df is None or self.df.empty:
+            logger.warning("No data available for the influence graph")
+            return None
+        
+        try:
+            if self.influence_graph is None:
+                self.influence_graph = IncrementalMentionGraph()
+            graph = self.influence_graph
+            graph.update(self.df)
+            graph.pagerank()
+            self.results['rolling_influencers'] = graph.top(top_n)
+            
+            if self.influence_graph_path:
+                graph.save(self.influence_graph_path)
+            
+            logger.info(f"Rolling influencers: {[u['user'] for u in self.results['rolling_influencers'][:5]]}")
+            return self.results['rolling_influencers']
+            
+        except Exception as e:
+            logger.error(f"Error updating influence graph: {e}")
+            return None
+    
+    def _influencer_graph(self):
+        """Cached influencer graph for the current data, built if needed"""
+        cached = self._influencer_cache
+        if self.df is not None and cached is not None and cached['fingerprint'] == self._influencer_fingerprint():
+            return cached['graph']
+        return self.map_influencers()
+    
     def visualize_sentiment(self):
         """Generate sentiment distribution bar chart"""
         if 'sentiment' not in self.results:
@@ -504,29 +1588,30 @@ class TVKCampaignAI:
             return None
         
         try:
-            # Combine top keywords and hashtags
-            text_parts = []
+            # Combine top keywords and hashtags into word weights
+            frequencies = {}
             
-            # Add top keywords (weighted)
+            # Add top keywords (TF-IDF scores are scaled up to sit next to
+            # hashtag counts; streaming keyword counts are used as they are)
             if 'top_keywords' in self.results:
+                scale = 1 if self.results.get('keyword_metric') == 'count' else 100
                 for keyword, score in self.results['top_keywords'].items():
-                    # Repeat based on score to make them more prominent
-                    text_parts.extend([keyword] * int(score * 100))
+                    frequencies[keyword] = frequencies.get(keyword, 0) + float(score) * scale
             
             # Add hashtags
             if 'top_hashtags' in self.results:
                 for hashtag, count in self.results['top_hashtags'].items():
-                    text_parts.extend([hashtag] * count)
-            
-            if not text_parts:
-                # Fallback to all text
-                text_parts = self.df['cleaned_text'].str.cat(sep=' ')
+                    frequencies[hashtag] = frequencies.get(hashtag, 0) + float(count)
             
-            text = ' '.join(text_parts if isinstance(text_parts, list) else [text_parts])
+            frequencies = {word: weight for word, weight in frequencies.items() if weight > 0}
             
-            if not text.strip():
-                logger.warning("No text available for wordcloud")
-                return None
+            text = None
+            if not frequencies:
+                # Fallback to all text
+                text = self.df['cleaned_text'].str.cat(sep=' ')
+                if not text.strip():
+                    logger.warning("No text available for wordcloud")
+                    return None
             
             plt.figure(figsize=(12, 8))
             wc = WordCloud(
@@ -535,7 +1620,8 @@ class TVKCampaignAI:
                 background_color='white',
                 max_words=100,
                 collocations=False
-            ).generate(text)
+            )
+            wc = wc.generate_from_frequencies(frequencies) if frequencies else wc.generate(text)
             
             plt.imshow(wc, interpolation='bilinear')
             plt.axis("off")
@@ -553,41 +1639,64 @@ class TVKCampaignAI:
             logger.error(f"Error visualizing trends: {e}")
             return None
     
-    def visualize_clusters(self):
-        """Generate cluster visualization"""
+    def visualize_clusters(self, max_points=20000):
+        """Generate cluster visualization
+        
+        The clustering feature matrix is projected to 2-D with a randomized
+        TruncatedSVD, which works on the sparse matrix directly. Above
+        ``max_points`` posts a random sample is plotted, and the coordinates
+        are cached until the posts or clusters change.
+        
+        Args:
+            max_points: Maximum number of posts to project and plot
+        """
         if self.df is None or 'cluster' not in self.df.columns:
             logger.warning("No cluster data to visualize")
             return None
         
         try:
-            # Use dimensionality reduction for better visualization
-            from sklearn.decomposition import PCA
-            from sklearn.preprocessing import StandardScaler
-            
-            vectorizer = TfidfVectorizer(stop_words='english', max_features=50)
-            X = vectorizer.fit_transform(self.df['cleaned_text'])
-            X_dense = X.toarray()
-            
-            # Standardize and apply PCA
-            scaler = StandardScaler()
-            X_scaled = scaler.fit_transform(X_dense)
-            
-            pca = PCA(n_components=2, random_state=42)
-            X_pca = pca.fit_transform(X_scaled)
-            
+            from sklearn.decomposition import TruncatedSVD
+            
+            X = self._cluster_features
+            if X is None or X.shape[0] != len(self.df):
+                X, _ = self._tfidf_view(max_features=50)
+            
+            # The projection keeps a reference to its feature matrix, so an
+            # identity check cannot match a different matrix at a reused id
+            projection = self._cluster_projection
+            if projection is None or projection['features'] is not X or projection['max_points'] != max_points:
+                rows = np.arange(X.shape[0])
+                if len(rows) > max_points:
+                    rows = np.sort(np.random.default_rng(42).choice(len(rows), max_points, replace=False))
+                    logger.info(f"Plotting a sample of {max_points} of {X.shape[0]} posts")
+                sample = X[rows]
+                if sample.shape[1] > 2:
+                    svd = TruncatedSVD(n_components=2, algorithm='randomized', random_state=42)
+                    coords = svd.fit_transform(sample)
+                    explained = svd.explained_variance_ratio_
+                else:
+                    # Already at most 2-D
+                    coords = np.zeros((sample.shape[0], 2))
+                    coords[:, :sample.shape[1]] = sample.toarray()
+                    explained = np.full(2, np.nan)
+                projection = {'features': X, 'max_points': max_points, 'rows': rows, 'coords': coords,
+                              'explained': explained}
+                self._cluster_projection = projection
+            
+            coords = projection['coords']
             plt.figure(figsize=(12, 8))
             scatter = plt.scatter(
-                X_pca[:, 0],
-                X_pca[:, 1],
-                c=self.df['cluster'],
+                coords[:, 0],
+                coords[:, 1],
+                c=self.df['cluster'].to_numpy()[projection['rows']],
                 cmap='viridis',
                 s=50,
                 alpha=0.6
             )
             plt.colorbar(scatter, label='Cluster')
-            plt.title("Topic Clusters (PCA Visualization)", fontsize=16, fontweight='bold')
-            plt.xlabel(f"First Principal Component ({pca.explained_variance_ratio_[0]:.2%})")
-            plt.ylabel(f"Second Principal Component ({pca.explained_variance_ratio_[1]:.2%})")
+            plt.title("Topic Clusters (SVD Visualization)", fontsize=16, fontweight='bold')
+            plt.xlabel(f"First SVD Component ({projection['explained'][0]:.2%})")
+            plt.ylabel(f"Second SVD Component ({projection['explained'][1]:.2%})")
             plt.tight_layout()
             
             filepath = os.path.join(self.output_dir, "clusters_scatter.png")
@@ -602,21 +1711,24 @@ class TVKCampaignAI:
             return None
     
     def visualize_influencer_network(self, max_nodes=50):
-        """Generate influencer network graph"""
-        G = self.map_influencers()
+        """Generate influencer network graph (reuses the cached graph from map_influencers)"""
+        G = self._influencer_graph()
         
         if G is None or len(G.nodes) == 0:
             logger.warning("No network data to visualize")
             return None
         
         try:
+            if isinstance(G, SparseMentionGraph):
+                G = G.to_networkx(max_nodes)
+            
             # Limit nodes for visibility
             if len(G.nodes) > max_nodes:
                 # Keep top nodes by degree
                 degrees = dict(G.degree())
                 top_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)[:max_nodes]
                 top_node_names = [node for node, _ in top_nodes]
-                G = G.subgraph(top_nodes).copy()
+                G = G.subgraph(top_node_names).copy()
             
             plt.figure(figsize=(16, 12))
             
@@ -733,6 +1845,18 @@ class TVKCampaignAI:
             insights.append(f"👥 Key influencers: {', '.join(inf_names)}")
             insights.append("💡 Consider collaboration opportunities with these influential voices.")
         
+        bridges = self.results.get('influencer_rankings', {}).get('betweenness')
+        if bridges:
+            bridge_names = [inf['user'] for inf in bridges[:5]]
+            insights.append(f"🌉 Bridge accounts (betweenness): {', '.join(bridge_names)}")
+            insights.append("💡 These users connect otherwise separate conversations; they can carry messages across communities.")
+        
+        if self.results.get('rolling_influencers'):
+            rolling_names = [inf['user'] for inf in self.results['rolling_influencers'][:5]]
+            window = self.influence_graph.window_days if self.influence_graph is not None else None
+            span = f"last {window:g} days" if window else "all fetches"
+            insights.append(f"📅 Most influential over the {span}: {', '.join(rolling_names)}")
+        
         # Engagement insights
         if self.df is not None and not self.df.empty:
             avg_engagement = self.df['engagement'].mean()
@@ -857,11 +1981,16 @@ class TVKCampaignAI:
             trends_html = ""
             if 'top_keywords' in self.results:
                 keywords = list(self.results['top_keywords'].items())[:10]
+                # Streaming trends report occurrence counts, not TF-IDF scores
+                if self.results.get('keyword_metric') == 'count':
+                    score_label, score_format = "Occurrences", "{:d}"
+                else:
+                    score_label, score_format = "TF-IDF Score", "{:.4f}"
                 trends_html = f"""
                 <h3>Top Keywords</h3>
                 <table>
-                    <tr><th>Keyword</th><th>TF-IDF Score</th></tr>
-                    {''.join([f'<tr><td>{kw}</td><td>{score:.4f}</td></tr>' for kw, score in keywords])}
+                    <tr><th>Keyword</th><th>{score_label}</th></tr>
+                    {''.join([f'<tr><td>{kw}</td><td>{score_format.format(score)}</td></tr>' for kw, score in keywords])}
                 </table>
                 """
             
@@ -1073,12 +2202,17 @@ class TVKCampaignAI:
             logger.error(f"Error generating PDF report: {e}")
             return None
     
-    def run_parallel_analysis(self):
-        """Run all analyses in parallel for efficiency"""
+    def run_parallel_analysis(self, sentiment_workers=None):
+        """Run all analyses in parallel for efficiency
+        
+        Args:
+            sentiment_workers: Processes for sentiment scoring on large frames
+                (default: CPU count; see analyze_sentiment)
+        """
         logger.info("Running parallel analysis pipeline...")
         
         def run_sentiment():
-            return self.analyze_sentiment()
+            return self.analyze_sentiment(workers=sentiment_workers)
         
         def run_trends():
             return self.detect_trends()
@@ -1087,7 +2221,10 @@ class TVKCampaignAI:
             return self.cluster_topics()
         
         def run_influencers():
-            return self.map_influencers()
+            G = self.map_influencers()
+            if self.influence_graph is not None:
+                self.update_influence_graph()
+            return G
         
         # Run analyses in parallel
         with ThreadPoolExecutor(max_workers=4) as executor: